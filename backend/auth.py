@@ -3,6 +3,11 @@ Authentication and Authorization Module
 JWT-based auth for admin panel
 """
 import os
+import time
+import asyncio
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import Depends, HTTPException, status
@@ -59,6 +64,99 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# ============= PASSWORD HASHING POOL =============
+
+class HasherBusy(Exception):
+    """Raised when too many hash/verify calls are already queued"""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt off the event loop in a small dedicated thread pool.
+
+    bcrypt releases the GIL, so threads give real parallelism while keeping
+    the ~100-300 ms of CPU per call away from the loop. At most `max_pending`
+    calls may be running or queued; beyond that callers fail fast with
+    HasherBusy instead of piling up behind a credential-stuffing burst.
+    """
+
+    LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+    def __init__(self, workers: int = None, max_pending: int = None):
+        self.workers = workers or int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+        self.max_pending = max_pending or int(os.getenv("PASSWORD_HASH_MAX_PENDING", "16"))
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        self._pending = 0
+
+        self.calls = 0
+        self.rejected = 0
+        self.hash_seconds_total = 0.0
+        self.wait_seconds_total = 0.0
+        self.hash_seconds_max = 0.0
+        self.latency_counts = [0] * (len(self.LATENCY_BUCKETS) + 1)
+
+    def _timed(self, fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        return result, time.perf_counter() - started
+
+    def _record(self, hash_seconds: float, total_seconds: float):
+        self.calls += 1
+        self.hash_seconds_total += hash_seconds
+        self.wait_seconds_total += total_seconds - hash_seconds
+        self.hash_seconds_max = max(self.hash_seconds_max, hash_seconds)
+        for i, bound in enumerate(self.LATENCY_BUCKETS):
+            if hash_seconds <= bound:
+                self.latency_counts[i] += 1
+                break
+        else:
+            self.latency_counts[-1] += 1
+
+    async def _run(self, fn, *args):
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise HasherBusy("Password hashing pool is saturated")
+
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result, hash_seconds = await loop.run_in_executor(self._executor, self._timed, fn, *args)
+        finally:
+            self._pending -= 1
+        self._record(hash_seconds, time.perf_counter() - started)
+        return result
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Async counterpart of verify_password"""
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        """Async counterpart of get_password_hash"""
+        return await self._run(get_password_hash, password)
+
+    def stats(self) -> dict:
+        buckets = {f"le_{bound}": count for bound, count in zip(self.LATENCY_BUCKETS, self.latency_counts)}
+        buckets["le_inf"] = self.latency_counts[-1]
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "avg_hash_seconds": round(self.hash_seconds_total / self.calls, 4) if self.calls else 0.0,
+            "max_hash_seconds": round(self.hash_seconds_max, 4),
+            "avg_wait_seconds": round(self.wait_seconds_total / self.calls, 4) if self.calls else 0.0,
+            "hash_latency_buckets": buckets,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+password_hasher = PasswordHasher()
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -72,10 +170,73 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+# ============= VERIFIED TOKEN CACHE =============
+
+class TokenCache:
+    """
+    Bounded LRU of already-verified tokens -> subject.
+
+    Keyed on the SHA-256 digest of the token so raw bearer tokens are not
+    kept in memory. Entries expire with the token's own `exp` claim, so a
+    cached token is never accepted past the point jwt.decode would reject it.
+    """
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or int(os.getenv("JWT_CACHE_MAX_ENTRIES", "256"))
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[str]:
+        key = self._digest(token)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, email = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return email
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, token: str, email: str, expires_at: float):
+        key = self._digest(token)
+        self._entries[key] = (expires_at, email)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+token_cache = TokenCache()
+
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """
     Dependency to get current user from JWT token
     """
+    token = credentials.credentials
+    cached_email = token_cache.get(token)
+    if cached_email is not None:
+        return {"email": cached_email}
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -83,7 +244,6 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     )
     
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
@@ -92,4 +252,8 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     except JWTError:
         raise credentials_exception
     
+    # Only tokens with an expiry are cached, and only until that expiry
+    if isinstance(payload.get("exp"), (int, float)):
+        token_cache.put(token, token_data.email, payload["exp"])
+    
     return {"email": token_data.email}
@@ -0,0 +1,126 @@
+"""
+Search Index Benchmark
+Builds a SearchIndex over a synthetic corpus and measures build time, memory,
+query latency and incremental update cost
+
+Usage:
+    python bench_search.py                       # 100k documents, 200 queries per scenario
+    python bench_search.py -d 20000 -q 500       # 20k documents, 500 queries per scenario
+    python bench_search.py --seed 7              # different synthetic corpus
+"""
+import gc
+import time
+import random
+import argparse
+import resource
+from datetime import datetime
+from itertools import accumulate
+
+from search import COMPACT_BUDGET, SearchIndex
+
+# Rank-frequency follows Zipf's law, like real prose: a few terms are very common
+VOCABULARY_SIZE = 50000
+
+
+def make_vocabulary(rng: random.Random, size: int):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(4, 10))) + "q")
+    return sorted(words)
+
+
+def make_corpus(count: int, seed: int):
+    """Synthetic published posts and case studies with Zipf-distributed terms"""
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(rng, VOCABULARY_SIZE)
+    cum_weights = list(accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+
+    def text(words: int) -> str:
+        return " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=words))
+
+    docs = []
+    for n in range(count):
+        common = {"_id": f"doc-{n}", "title": text(6), "slug": f"doc-{n}", "published": True,
+                  "featured_image": None, "created_at": datetime(2025, 1, 1), "updated_at": datetime(2025, 1, 1)}
+        if n % 5:
+            docs.append(("blog", {**common, "excerpt": text(25), "content": text(300),
+                                  "category": text(1), "tags": text(3).split()}))
+        else:
+            docs.append(("case-studies", {**common, "client_name": text(2), "industry": text(1),
+                                          "challenge": text(80), "solution": text(80), "results": text(60),
+                                          "technologies": text(4).split(), "teaser": text(20)}))
+    return vocabulary, docs
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def time_queries(index: SearchIndex, queries, **kwargs) -> dict:
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, **kwargs)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"p50": percentile(samples, 0.50), "p95": percentile(samples, 0.95), "p99": percentile(samples, 0.99)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the in-process search index")
+    parser.add_argument("-d", "--documents", type=int, default=100000, help="corpus size")
+    parser.add_argument("-q", "--queries", type=int, default=200, help="queries per scenario")
+    parser.add_argument("--seed", type=int, default=42, help="corpus random seed")
+    args = parser.parse_args()
+
+    print(f"Generating {args.documents} documents...")
+    vocabulary, docs = make_corpus(args.documents, args.seed)
+    rng = random.Random(args.seed + 1)
+
+    gc.collect()
+    # Peak RSS in KiB on Linux; the corpus is already resident, so growth is the index
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    index = SearchIndex()
+    start = time.perf_counter()
+    for kind, doc in docs:
+        index.add(kind, doc)
+    build = time.perf_counter() - start
+    memory = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline) * 1024
+
+    stats = index.stats()
+    print(f"\nBuild: {build:.2f}s ({args.documents / build:,.0f} docs/s), "
+          f"{memory / 1024 / 1024:.1f} MiB RSS, {stats['terms']:,} terms, {stats['postings']:,} postings\n")
+
+    common, rare = vocabulary[:50], vocabulary[5000:]
+    scenarios = [
+        ("1 term, common", [rng.choice(common) for _ in range(args.queries)], {}),
+        ("1 term, rare", [rng.choice(rare) for _ in range(args.queries)], {}),
+        ("2 terms, mixed", [f"{rng.choice(common)} {rng.choice(rare)}" for _ in range(args.queries)], {}),
+        ("3 terms, common", [" ".join(rng.sample(common, 3)) for _ in range(args.queries)], {}),
+        ("1 term, common, type filter", [rng.choice(common) for _ in range(args.queries)], {"kind": "case-studies"}),
+        ("1 term, common, page 10", [rng.choice(common) for _ in range(args.queries)], {"offset": 90}),
+    ]
+    print(f"{'Query (ms)':<32} {'p50':>8} {'p95':>8} {'p99':>8}")
+    print("-" * 60)
+    for name, queries, kwargs in scenarios:
+        result = time_queries(index, queries, **kwargs)
+        print(f"{name:<32} {result['p50']:>8.2f} {result['p95']:>8.2f} {result['p99']:>8.2f}")
+
+    updates = [docs[rng.randrange(len(docs))] for _ in range(args.queries)]
+    start = time.perf_counter()
+    for kind, doc in updates:
+        index.add(kind, doc)
+    update = (time.perf_counter() - start) / len(updates) * 1000
+    # Compaction runs in slices of COMPACT_BUDGET postings; searches run between them
+    slices, done = [], False
+    while not done:
+        start = time.perf_counter()
+        done = index.compact(COMPACT_BUDGET)
+        slices.append((time.perf_counter() - start) * 1000)
+    print(f"\nIncremental update: {update:.3f} ms/doc; compaction: {len(slices)} slices, "
+          f"longest {max(slices):.1f} ms, {sum(slices) / 1000:.2f}s total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Serialization Micro-benchmark
+Per-document cost of the legacy serialize_doc + jsonable_encoder + json.dumps path
+versus serialization.dumps on 100-item testimonial and case-study lists
+
+Usage:
+    python bench_serialization.py [--items 100] [--rounds 200]
+"""
+import json
+import copy
+import argparse
+import timeit
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+from models import serialize_doc
+from serialization import dumps, prepare_doc
+
+PARAGRAPH = "Omni channel messaging campaign delivered measurable engagement uplift. " * 8
+
+
+def testimonial_docs(count: int) -> list:
+    now = datetime.utcnow()
+    return [{
+        "_id": ObjectId(),
+        "client_name": f"Client {i}",
+        "client_position": "Chief Marketing Officer",
+        "client_company": f"Company {i}",
+        "client_image": f"/testimonials/{i}.jpg",
+        "testimonial_text": PARAGRAPH[:400],
+        "rating": 5,
+        "featured": i % 4 == 0,
+        "published": True,
+        "created_at": now - timedelta(hours=i),
+    } for i in range(count)]
+
+
+def case_study_docs(count: int) -> list:
+    now = datetime.utcnow()
+    return [{
+        "_id": ObjectId(),
+        "title": f"Case study {i}",
+        "slug": f"case-study-{i}",
+        "client_name": f"Client {i}",
+        "client_logo": f"/client-logos/{i}.png",
+        "industry": "Retail",
+        "challenge": PARAGRAPH,
+        "solution": PARAGRAPH,
+        "results": PARAGRAPH,
+        "technologies": ["SMS", "WhatsApp", "RCS", "Email"],
+        "featured_image": f"/case-studies/{i}.jpg",
+        "gallery_images": [f"/gallery/{i}-{j}.jpg" for j in range(4)],
+        "published": True,
+        "created_at": now - timedelta(days=i),
+        "updated_at": now - timedelta(days=i),
+    } for i in range(count)]
+
+
+def legacy_path(docs: list) -> bytes:
+    """What list endpoints did before: serialize_doc, FastAPI's encoder, then json.dumps"""
+    payload = {"success": True, "data": [serialize_doc(doc) for doc in docs]}
+    return json.dumps(jsonable_encoder(payload), ensure_ascii=False).encode("utf-8")
+
+
+def fast_path(docs: list) -> bytes:
+    return dumps({"success": True, "data": [prepare_doc(doc) for doc in docs]})
+
+
+def bench(label: str, docs: list, rounds: int):
+    results = {}
+    for name, fn in (("legacy", legacy_path), ("fast", fast_path)):
+        # Both paths mutate documents in place, so every round gets a fresh
+        # copy prepared outside the timed region
+        batches = iter([copy.deepcopy(docs) for _ in range(rounds)])
+        seconds = timeit.timeit(lambda: fn(next(batches)), number=rounds)
+        results[name] = seconds / rounds / len(docs) * 1e6
+
+    speedup = results["legacy"] / results["fast"] if results["fast"] else float("inf")
+    print(f"{label:<14}{results['legacy']:>14.2f}{results['fast']:>12.2f}{speedup:>9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark document serialization paths")
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    # Both paths must produce the same JSON document
+    sample = case_study_docs(3)
+    assert json.loads(legacy_path(copy.deepcopy(sample))) == json.loads(fast_path(copy.deepcopy(sample)))
+
+    print(f"{'payload':<14}{'legacy us/doc':>14}{'fast us/doc':>12}{'speedup':>9}")
+    bench("testimonials", testimonial_docs(args.items), args.rounds)
+    bench("case_studies", case_study_docs(args.items), args.rounds)
+
+
+if __name__ == "__main__":
+    main()
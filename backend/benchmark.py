@@ -0,0 +1,521 @@
+"""
+API Load / Benchmark Suite
+Boots server.app in-process against a local Mongo stand-in and measures every endpoint
+
+Usage:
+    python benchmark.py                          # mongomock-motor, default settings
+    python benchmark.py -n 500 -c 32             # 500 requests per endpoint, 32 in flight
+    python benchmark.py --mongo-url mongodb://localhost:27017   # real local mongod
+    python benchmark.py --save-baseline --runs 3 # record the median of 3 runs as the new baseline
+    python benchmark.py --compare                # exit 1 on regression vs. the baseline
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import tempfile
+import statistics
+import subprocess
+import logging
+import argparse
+import tracemalloc
+from itertools import count
+from pathlib import Path
+from datetime import datetime, timedelta
+
+ROOT_DIR = Path(__file__).parent
+DEFAULT_BASELINE = ROOT_DIR / "benchmark_baseline.json"
+
+BENCH_EMAIL = "bench-admin@example.com"
+BENCH_PASSWORD = "bench-password-123"
+
+
+# ============= APP BOOTSTRAP =============
+
+def load_app(mongo_url: str = None):
+    """
+    Import server.py wired to a throwaway database.
+
+    Without `mongo_url` the Motor client is swapped for mongomock-motor before
+    server.py is imported, so no mongod is needed.
+    """
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key")
+    os.environ["DB_NAME"] = os.getenv("BENCH_DB_NAME", "mim_benchmark")
+    # Outgoing email is not part of the request path; keep the dispatcher idle
+    for name in ("EMAIL_API_URL", "EMAIL_PROFILE_ID", "EMAIL_API_KEY"):
+        os.environ.pop(name, None)
+    # ...and the external profile refresher, which would fetch over the network
+    os.environ["PROFILE_REFRESH_INTERVAL"] = "0"
+
+    if mongo_url:
+        os.environ["MONGO_URL"] = mongo_url
+    else:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            sys.exit("mongomock-motor is required without --mongo-url (pip install mongomock-motor)")
+        import motor.motor_asyncio
+        motor.motor_asyncio.AsyncIOMotorClient = AsyncMongoMockClient
+        os.environ["MONGO_URL"] = "mongodb://mongomock"
+
+    sys.path.insert(0, str(ROOT_DIR))
+    import server
+    return server
+
+
+async def seed(db, posts: int, case_studies: int, testimonials: int, contacts: int):
+    """Reset the benchmark database and fill it with synthetic content"""
+    for name in ("blog_posts", "case_studies", "testimonials", "contacts",
+                 "meeting_requests", "admin_users", "email_outbox"):
+        await db[name].delete_many({})
+
+    now = datetime.utcnow()
+    paragraph = "Omni channel messaging campaign delivered measurable engagement uplift. " * 8
+
+    await db.blog_posts.insert_many([{
+        "title": f"Benchmark post number {i}",
+        "slug": f"benchmark-post-{i}",
+        "excerpt": paragraph[:200],
+        "content": paragraph * 4,
+        "author": "Bench",
+        "featured_image": None,
+        "category": ("sms", "whatsapp", "email")[i % 3],
+        "tags": ["bench", f"tag-{i % 7}"],
+        "published": i % 5 != 0,
+        "views": 0,
+        "created_at": now - timedelta(minutes=i),
+        "updated_at": now - timedelta(minutes=i),
+    } for i in range(posts)])
+
+    await db.case_studies.insert_many([{
+        "title": f"Benchmark case study {i}",
+        "slug": f"benchmark-case-study-{i}",
+        "client_name": f"Client {i}",
+        "client_logo": None,
+        "industry": ("retail", "finance", "auto")[i % 3],
+        "challenge": paragraph,
+        "solution": paragraph,
+        "results": paragraph,
+        "technologies": ["SMS", "WhatsApp", "RCS"],
+        "featured_image": None,
+        "gallery_images": [f"/gallery/{i}-{j}.jpg" for j in range(4)],
+        "published": True,
+        "created_at": now - timedelta(hours=i),
+        "updated_at": now - timedelta(hours=i),
+    } for i in range(case_studies)])
+
+    await db.testimonials.insert_many([{
+        "client_name": f"Client {i}",
+        "client_position": "CMO",
+        "client_company": f"Company {i}",
+        "client_image": None,
+        "testimonial_text": paragraph[:300],
+        "rating": 5,
+        "featured": i % 4 == 0,
+        "published": True,
+        "created_at": now - timedelta(hours=i),
+    } for i in range(testimonials)])
+
+    await db.contacts.insert_many([{
+        "name": f"Lead {i}",
+        "email": f"lead{i}@example.com",
+        "phone": None,
+        "service": "SMS Solutions",
+        "message": "Please get in touch about bulk messaging.",
+        "status": ("new", "read", "responded")[i % 3],
+        "submitted_at": now - timedelta(minutes=i),
+        "email_sent": False,
+    } for i in range(contacts)])
+
+
+# ============= SCENARIOS =============
+
+def build_scenarios(ids: dict) -> list:
+    """
+    (name, method, path, kwargs, needs_auth) for every public and admin endpoint.
+
+    `path` and `kwargs` may be callables, evaluated per request, for writes
+    that can't repeat (creates need unique titles, deletes need a fresh id).
+    """
+    contact = {
+        "name": "Bench User",
+        "email": "bench@example.com",
+        "phone": "+10000000000",
+        "service": "SMS Solutions",
+        "message": "Benchmark contact form submission message.",
+    }
+    testimonial = {
+        "client_name": "Bench Client",
+        "client_position": "CTO",
+        "client_company": "Bench Co",
+        "testimonial_text": "A benchmark testimonial that is long enough.",
+        "rating": 5,
+    }
+    paragraph = "Benchmark write path content that is comfortably over fifty characters long."
+    post = {"excerpt": "Created by the benchmark", "content": paragraph, "author": "Bench",
+            "category": "sms", "tags": ["bench"], "published": True}
+    case_study = {"client_name": "Bench Client", "industry": "retail", "challenge": paragraph,
+                  "solution": paragraph, "results": paragraph, "technologies": ["SMS"], "published": True}
+    serial = count()
+
+    def unique(payload: dict, field: str, template: str):
+        return lambda: {"json": dict(payload, **{field: template.format(next(serial))})}
+
+    def spare(kind: str, prefix: str):
+        return lambda: f"{prefix}/{next(ids[kind])}"
+
+    return [
+        ("root", "GET", "/api/", {}, False),
+        ("live", "GET", "/api/live", {}, False),
+        ("ready", "GET", "/api/ready", {}, False),
+        ("health", "GET", "/api/health", {}, False),
+        ("external_services", "GET", "/api/external/services", {}, False),
+        ("external_clients", "GET", "/api/external/clients", {}, False),
+        ("home_page", "GET", "/api/pages/home", {}, False),
+        ("search", "GET", "/api/search", {"params": {"q": "messaging campaign"}}, False),
+        ("sitemap", "GET", "/api/sitemap.xml", {}, False),
+        ("prerender_blog", "GET", "/api/prerender/blog/benchmark-post-1", {}, False),
+        ("blog_list", "GET", "/api/blog", {}, False),
+        ("blog_list_category", "GET", "/api/blog", {"params": {"category": "sms"}}, False),
+        ("blog_list_deep_page", "GET", "/api/blog", {"params": {"page": 20, "limit": 10}}, False),
+        ("blog_detail", "GET", "/api/blog/benchmark-post-1", {}, False),
+        ("blog_batch", "GET", "/api/batch/blog",
+         {"params": {"slugs": ",".join(f"benchmark-post-{i}" for i in range(1, 11))}}, False),
+        ("testimonials", "GET", "/api/testimonials", {}, False),
+        ("testimonials_featured", "GET", "/api/testimonials", {"params": {"featured_only": True}}, False),
+        ("case_studies", "GET", "/api/case-studies", {}, False),
+        ("case_study_detail", "GET", "/api/case-studies/benchmark-case-study-1", {}, False),
+        ("case_study_batch", "GET", "/api/batch/case-studies",
+         {"params": {"slugs": ",".join(f"benchmark-case-study-{i}" for i in range(1, 11))}}, False),
+        ("contact_submit", "POST", "/api/contact", {"json": contact}, False),
+        ("book_meeting", "POST", "/api/book-meeting",
+         {"json": dict(contact, message="2025-01-01|10:00|Benchmark")}, False),
+        ("auth_register", "POST", "/api/auth/register",
+         unique({"name": "Bench Admin", "password": BENCH_PASSWORD}, "email", "bench-{}@example.com"), False),
+        ("auth_login", "POST", "/api/auth/login",
+         {"json": {"email": BENCH_EMAIL, "password": BENCH_PASSWORD}}, False),
+        ("auth_me", "GET", "/api/auth/me", {}, True),
+        ("admin_contacts", "GET", "/api/admin/contacts", {}, True),
+        ("admin_contacts_filtered", "GET", "/api/admin/contacts", {"params": {"status_filter": "new"}}, True),
+        ("admin_contact_status", "PATCH", f"/api/admin/contacts/{ids['contact']}/status",
+         {"params": {"status_value": "read"}}, True),
+        ("admin_blog_create", "POST", "/api/admin/blog", unique(post, "title", "Benchmark created post {}"), True),
+        ("admin_blog_update", "PUT", f"/api/admin/blog/{ids['post']}",
+         {"json": {"excerpt": "Updated by the benchmark"}}, True),
+        ("admin_blog_delete", "DELETE", spare("spare_posts", "/api/admin/blog"), {}, True),
+        ("admin_testimonial_create", "POST", "/api/admin/testimonials", {"json": testimonial}, True),
+        ("admin_testimonial_update", "PUT", f"/api/admin/testimonials/{ids['testimonial']}",
+         {"json": {"rating": 4}}, True),
+        ("admin_testimonial_delete", "DELETE", spare("spare_testimonials", "/api/admin/testimonials"), {}, True),
+        ("admin_case_study_create", "POST", "/api/admin/case-studies",
+         unique(case_study, "title", "Benchmark created case study {}"), True),
+        ("admin_case_study_update", "PUT", f"/api/admin/case-studies/{ids['case_study']}",
+         {"json": {"technologies": ["SMS", "Email"]}}, True),
+        ("admin_case_study_delete", "DELETE", spare("spare_case_studies", "/api/admin/case-studies"), {}, True),
+        ("admin_auth_stats", "GET", "/api/admin/auth/stats", {}, True),
+        ("admin_cache_stats", "GET", "/api/admin/cache/stats", {}, True),
+        ("admin_queries_stats", "GET", "/api/admin/queries/stats", {}, True),
+    ]
+
+
+async def spare_ids(db, collection: str, template: dict, amount: int):
+    """Insert `amount` throwaway documents for a delete scenario; returns an iterator over their ids"""
+    now = datetime.utcnow()
+    docs = [
+        dict({field: value.format(i) for field, value in template.items()}, published=True,
+             created_at=now, updated_at=now)
+        for i in range(amount)
+    ]
+    result = await db[collection].insert_many(docs)
+    return iter([str(inserted_id) for inserted_id in result.inserted_ids])
+
+
+def resolve(path, kwargs) -> tuple:
+    return (path() if callable(path) else path), (kwargs() if callable(kwargs) else kwargs)
+
+
+# ============= MEASUREMENT =============
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def measure_latency(http, method, path, kwargs, headers, requests: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            url, options = resolve(path, kwargs)
+            started = time.perf_counter()
+            response = await http.request(method, url, headers=headers, **options)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+async def measure_allocations(http, method, path, kwargs, headers, samples: int) -> dict:
+    """
+    Median bytes allocated (tracemalloc peak) per sequential request; the
+    median keeps one-off work such as a search compaction slice out of it.
+    """
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(samples):
+            url, options = resolve(path, kwargs)
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            await http.request(method, url, headers=headers, **options)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - baseline)
+    finally:
+        tracemalloc.stop()
+    return {"alloc_peak_kib": round(statistics.median(peaks) / 1024, 1) if peaks else 0.0}
+
+
+async def run(args) -> tuple:
+    import httpx
+
+    # httpx and the handlers log every request at INFO, which would bury the report
+    for name in ("httpx", "server"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    server = load_app(args.mongo_url)
+    await server.app.router.startup()
+    try:
+        await seed(server.db, args.posts, args.case_studies, args.testimonials, args.contacts)
+        # Startup derived these from the empty database; rebuild them from the seed
+        await server.prerenderer.backfill()
+        await server.site_search.load()
+        server.sitemap.invalidate()
+
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as http:
+            await http.post("/api/auth/register", json={
+                "email": BENCH_EMAIL, "name": "Bench Admin", "password": BENCH_PASSWORD
+            })
+            login = await http.post("/api/auth/login", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+            auth_headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+            ids = {
+                "post": str((await server.db.blog_posts.find_one({}))["_id"]),
+                "case_study": str((await server.db.case_studies.find_one({}))["_id"]),
+                "contact": str((await server.db.contacts.find_one({}))["_id"]),
+                "testimonial": str((await server.db.testimonials.find_one({}))["_id"]),
+            }
+            # One fresh document per delete request (warm-up, timed and traced requests)
+            spares = args.requests + args.alloc_samples + 1
+            ids["spare_posts"] = await spare_ids(
+                server.db, "blog_posts", {"title": "Spare post {}", "slug": "spare-post-{}"}, spares)
+            ids["spare_case_studies"] = await spare_ids(
+                server.db, "case_studies", {"title": "Spare case study {}", "slug": "spare-case-study-{}"}, spares)
+            ids["spare_testimonials"] = await spare_ids(
+                server.db, "testimonials", {"client_name": "Spare client {}"}, spares)
+
+            results = {}
+            for name, method, path, kwargs, needs_auth in build_scenarios(ids):
+                if args.only and not any(pattern in name for pattern in args.only):
+                    continue
+                headers = auth_headers if needs_auth else {}
+                # bcrypt dominates login and register; keep their sample small so the run stays quick
+                requests = min(args.requests, 20) if name.startswith("auth_") and method == "POST" else args.requests
+
+                url, options = resolve(path, kwargs)
+                await http.request(method, url, headers=headers, **options)  # warm-up
+                stats = await measure_latency(http, method, path, kwargs, headers, requests, args.concurrency)
+                stats.update(await measure_allocations(
+                    http, method, path, kwargs, headers, min(args.alloc_samples, requests)
+                ))
+                results[name] = stats
+                print_row(name, stats)
+            # Only a real mongod emits command events, so budgets are checked with --mongo-url
+            return results, list(server.query_monitor.violations)
+    finally:
+        await server.app.router.shutdown()
+
+
+# ============= REPORTING / BASELINE =============
+
+HEADER = f"{'endpoint':<28}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'alloc KiB':>11}{'errors':>8}"
+
+
+def print_row(name: str, stats: dict):
+    print(f"{name:<28}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+          f"{stats['throughput_rps']:>9.1f}{stats['alloc_peak_kib']:>11.1f}{stats['errors']:>8}")
+
+
+def machine_factor(results: dict, baseline: dict) -> float:
+    """
+    Median p50 ratio against the baseline across endpoints: how much slower
+    (or faster) this machine or run is overall, rather than any one route.
+    """
+    ratios = [
+        current["p50_ms"] / baseline[name]["p50_ms"]
+        for name, current in results.items() if baseline.get(name, {}).get("p50_ms")
+    ]
+    return statistics.median(ratios) if ratios else 1.0
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_ms: float = 2.0) -> list:
+    """
+    Endpoints whose p95 latency, throughput or allocations regressed beyond `tolerance`.
+
+    Latency and throughput are scaled by `machine_factor` first, so a slower
+    machine or a noisy run does not flag every route (a faster run keeps the
+    baseline as is: the slow routes do not speed up with the fast ones, so
+    scaling down would flag them), and a latency change
+    must also exceed `min_delta_ms` (sub-millisecond routes jitter by more
+    than 25% between runs).
+    """
+    factor = max(machine_factor(results, baseline), 1.0)
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        expected_p95 = previous["p95_ms"] * factor
+        if current["p95_ms"] > expected_p95 * (1 + tolerance) and current["p95_ms"] - expected_p95 > min_delta_ms:
+            regressions.append(f"{name}: p95 {previous['p95_ms']:.2f} -> {current['p95_ms']:.2f} ms")
+        expected_rps = previous["throughput_rps"] / factor
+        if current["throughput_rps"] < expected_rps * (1 - tolerance) and \
+                1000 / current["throughput_rps"] - 1000 / expected_rps > min_delta_ms:
+            regressions.append(
+                f"{name}: throughput {previous['throughput_rps']:.1f} -> {current['throughput_rps']:.1f} req/s"
+            )
+        if current["alloc_peak_kib"] > previous["alloc_peak_kib"] * (1 + tolerance) + 1:
+            regressions.append(
+                f"{name}: allocations {previous['alloc_peak_kib']:.1f} -> {current['alloc_peak_kib']:.1f} KiB"
+            )
+    return regressions
+
+
+def run_repeated(args) -> tuple:
+    """
+    Per-metric medians over `args.runs` runs, each in a fresh process with a
+    fresh database, and how many runs exceeded a query budget.
+    """
+    child = [sys.executable, str(Path(__file__).resolve()), "-n", str(args.requests), "-c", str(args.concurrency),
+             "--alloc-samples", str(args.alloc_samples), "--posts", str(args.posts),
+             "--case-studies", str(args.case_studies), "--testimonials", str(args.testimonials),
+             "--contacts", str(args.contacts)]
+    if args.only:
+        child += ["--only", *args.only]
+    if args.mongo_url:
+        child += ["--mongo-url", args.mongo_url]
+
+    runs, over_budget = [], 0
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in range(args.runs):
+            print(f"\nRun {n + 1}/{args.runs}")
+            output = Path(workdir) / f"run-{n}.json"
+            # A run exits 1 only for query budget violations (it prints them itself)
+            over_budget += subprocess.run(child + ["--json", str(output)], check=False).returncode != 0
+            if output.exists():
+                runs.append(json.loads(output.read_text()))
+    if not runs:
+        sys.exit("Every run failed")
+
+    results = {}
+    for name in runs[0]:
+        samples = [run[name] for run in runs if name in run]
+        results[name] = {metric: statistics.median(sample[metric] for sample in samples) for metric in samples[0]}
+        results[name]["errors"] = max(sample["errors"] for sample in samples)
+    print(f"\nMedian of {len(runs)} runs")
+    print(HEADER)
+    print("-" * len(HEADER))
+    for name, stats in results.items():
+        print_row(name, stats)
+    return results, over_budget
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the My Inbox Media® API in-process")
+    parser.add_argument("-n", "--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("-c", "--concurrency", type=int, default=16, help="requests in flight")
+    parser.add_argument("--alloc-samples", type=int, default=20, help="sequential requests traced for allocations")
+    parser.add_argument("--only", nargs="*", help="only run endpoints whose name contains one of these")
+    parser.add_argument("--mongo-url", help="use a real (local) mongod instead of mongomock-motor")
+    parser.add_argument("--posts", type=int, default=300)
+    parser.add_argument("--case-studies", type=int, default=100)
+    parser.add_argument("--testimonials", type=int, default=100)
+    parser.add_argument("--contacts", type=int, default=1000)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write results to the baseline file")
+    parser.add_argument("--compare", action="store_true", help="fail on regressions against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0,
+                        help="latency changes smaller than this never count as regressions")
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    parser.add_argument("--runs", type=int, default=1, help="repeat in fresh processes and keep per-metric medians")
+    args = parser.parse_args()
+
+    over_budget = 0
+    if args.runs > 1:
+        results, over_budget = run_repeated(args)
+        violations = []
+    else:
+        print(HEADER)
+        print("-" * len(HEADER))
+        results, violations = asyncio.run(run(args))
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+    status = 0
+    if over_budget:
+        print(f"\nQuery budget violations in {over_budget} run(s)")
+        status = 1
+    if violations:
+        print("\nQuery budget violations:")
+        for violation in {v["route"]: v for v in violations}.values():
+            print(f"  - {violation['route']}: {violation['commands']} commands (budget {violation['budget']})")
+        status = 1
+
+    if args.compare:
+        if not args.baseline.exists():
+            print(f"\nNo baseline at {args.baseline}; run with --save-baseline first")
+            status = 1
+        else:
+            baseline = json.loads(args.baseline.read_text())
+            print(f"\nRun speed vs. baseline: {machine_factor(results, baseline):.2f}x p50 (slower runs are scaled by it)")
+            missing = sorted(set(results) - set(baseline))
+            if missing:
+                print(f"Not in the baseline (re-save it): {', '.join(missing)}")
+            regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+            if regressions:
+                print("\nRegressions:")
+                for line in regressions:
+                    print(f"  - {line}")
+                status = 1
+            else:
+                print(f"\nNo regressions beyond {args.tolerance:.0%} of baseline")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2, sort_keys=True))
+        print(f"\nBaseline saved to {args.baseline}")
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
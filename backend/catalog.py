@@ -0,0 +1,191 @@
+"""
+Service & Client Catalog
+Versioned data/catalog.json loaded into an immutable snapshot, hot-swapped
+when the file changes without restarting workers
+"""
+import os
+import json
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from precomputed import PrecomputedJSON
+
+logger = logging.getLogger(__name__)
+
+CATALOG_PATH = Path(__file__).parent / "data" / "catalog.json"
+
+
+class CatalogError(ValueError):
+    """The catalog file is not a valid catalog"""
+
+
+def parse_catalog(raw: bytes) -> dict:
+    """Decode and validate catalog JSON; raises CatalogError"""
+    try:
+        data = json.loads(raw)
+    except ValueError as e:
+        raise CatalogError(f"invalid JSON: {str(e)}")
+
+    if not isinstance(data, dict) or not isinstance(data.get("version"), int):
+        raise CatalogError("'version' must be an integer")
+    for section, required in (("services", "title"), ("clients", "logo_url")):
+        items = data.get(section)
+        if not isinstance(items, list):
+            raise CatalogError(f"'{section}' must be a list")
+        for index, item in enumerate(items):
+            if not isinstance(item, dict) or not item.get(required):
+                raise CatalogError(f"{section}[{index}] has no '{required}'")
+    return data
+
+
+class CatalogSnapshot:
+    """
+    One version of the catalog, encoded once.
+
+    Snapshots are never modified: a reload builds a new one and swaps the
+    store's reference, so a request sees either the old or the new catalog.
+    """
+
+    def __init__(self, data: dict, digest: str, max_age: int,
+                 decorate_clients: Optional[Callable[[List[dict]], List[dict]]] = None):
+        self.version = data["version"]
+        self.digest = digest
+        self.service_count = len(data["services"])
+        self.client_count = len(data["clients"])
+        self.logo_urls = [client["logo_url"] for client in data["clients"]]
+
+        clients = data["clients"]
+        if decorate_clients is not None:
+            clients = decorate_clients(clients)
+        # Raw lists for composite payloads such as /api/pages/home
+        self.service_list = data["services"]
+        self.client_list = clients
+
+        source = data.get("source", "catalog")
+        tag = f"v{self.version}-{digest[:12]}"
+        self.services = PrecomputedJSON(
+            {"success": True, "data_count": self.service_count, "data": data["services"], "source": source},
+            max_age=max_age, etag=f'"services-{tag}"'
+        )
+        self.clients = PrecomputedJSON(
+            {"success": True, "data_count": self.client_count, "data": clients, "source": source},
+            max_age=max_age, etag=f'"clients-{tag}"'
+        )
+
+
+class CatalogStore:
+    """
+    Holds the current CatalogSnapshot and watches the catalog file.
+
+    The file is polled every CATALOG_POLL_INTERVAL seconds (0 disables hot
+    reload). An invalid edit is logged and the previous snapshot stays live.
+    Files in `depends_on` (such as the logo manifest read by
+    `decorate_clients`) are polled too and folded into the digest, so a
+    change to them rebuilds the snapshot and its ETags.
+    """
+
+    def __init__(self, path: Path = None, max_age: int = 3600,
+                 decorate_clients: Optional[Callable[[List[dict]], List[dict]]] = None,
+                 poll_interval: float = None, depends_on: Iterable[Path] = ()):
+        self.path = Path(path or os.getenv("CATALOG_PATH", str(CATALOG_PATH)))
+        self.max_age = max_age
+        self.decorate_clients = decorate_clients
+        self.depends_on = [Path(p) for p in depends_on]
+        if poll_interval is None:
+            poll_interval = float(os.getenv("CATALOG_POLL_INTERVAL", "5"))
+        self.poll_interval = poll_interval
+        self.reloads = 0
+        self.errors = 0
+        self._signature = None
+        self._task: Optional[asyncio.Task] = None
+
+        # A broken catalog at startup is fatal; later it only keeps the old one
+        self.snapshot = self._build(*self._read())
+        self._signature = self._stat()
+
+    def _stat(self):
+        stat = self.path.stat()
+        signature = [(stat.st_mtime_ns, stat.st_size)]
+        for path in self.depends_on:
+            try:
+                stat = path.stat()
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _read(self) -> Tuple[bytes, str]:
+        """Catalog bytes and the digest of the catalog plus its dependencies"""
+        raw = self.path.read_bytes()
+        digest = hashlib.sha256(raw)
+        for path in self.depends_on:
+            try:
+                digest.update(path.read_bytes())
+            except FileNotFoundError:
+                pass
+        return raw, digest.hexdigest()
+
+    def _build(self, raw: bytes, digest: str) -> CatalogSnapshot:
+        return CatalogSnapshot(parse_catalog(raw), digest, self.max_age, self.decorate_clients)
+
+    def reload(self) -> bool:
+        """Swap in the file's current contents if they changed; True if swapped"""
+        try:
+            signature = self._stat()
+            raw, digest = self._read()
+            if digest == self.snapshot.digest:
+                self._signature = signature
+                return False
+            snapshot = self._build(raw, digest)
+        except (OSError, CatalogError) as e:
+            # Leave the signature alone so the next poll retries (e.g. a half-written file)
+            self.errors += 1
+            logger.error(f"Catalog reload failed, keeping version {self.snapshot.version}: {str(e)}")
+            return False
+
+        previous = self.snapshot.version
+        self.snapshot = snapshot
+        self._signature = signature
+        self.reloads += 1
+        logger.info(
+            f"Catalog reloaded: version {previous} -> {snapshot.version} "
+            f"({snapshot.service_count} services, {snapshot.client_count} clients)"
+        )
+        return True
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                changed = self._stat() != self._signature
+            except OSError:
+                changed = False
+            if changed:
+                self.reload()
+
+    async def start(self):
+        if self.poll_interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "path": str(self.path),
+            "version": self.snapshot.version,
+            "digest": self.snapshot.digest[:12],
+            "services": self.snapshot.service_count,
+            "clients": self.snapshot.client_count,
+            "reloads": self.reloads,
+            "errors": self.errors,
+        }
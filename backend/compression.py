@@ -0,0 +1,241 @@
+"""
+Response Compression
+Content-Encoding negotiation (brotli when installed, gzip) with a cache of
+compressed bodies keyed on ETag, so identical payloads are compressed once
+"""
+import os
+import gzip
+import time
+import logging
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from metrics import record_timing
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/xml", "application/javascript", "text/", "image/svg+xml",
+)
+CODINGS = ("br", "gzip")
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """Strong ETag of an encoded representation: `"abc"` -> `"abc-gzip"`"""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def identity_etag(etag: str) -> str:
+    """The identity ETag an encoded representation's tag derives from"""
+    for encoding in CODINGS:
+        if etag.endswith(f'-{encoding}"'):
+            return etag[:-len(encoding) - 2] + '"'
+    return etag
+
+
+def add_vary(headers: MutableHeaders, field: str = "Accept-Encoding"):
+    vary = headers.get("vary", "")
+    if field.lower() not in (value.strip().lower() for value in vary.split(",")):
+        headers.add_vary_header(field)
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """`gzip, br;q=0.8` -> {"gzip": 1.0, "br": 0.8}"""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+class Compressor:
+    """Encodes response bodies and remembers the results for ETag'd responses"""
+
+    def __init__(self, minimum_size: int = None, gzip_level: int = None,
+                 brotli_quality: int = None, cache_entries: int = None):
+        self.minimum_size = minimum_size or int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+        self.gzip_level = gzip_level or int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+        self.brotli_quality = brotli_quality or int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+        self.cache_entries = cache_entries or int(os.getenv("COMPRESSION_CACHE_ENTRIES", "256"))
+        # Preference order when the client weighs codings equally
+        self.encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+        self._cache: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+
+        self.compressed = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.compress_seconds = 0.0
+
+    def negotiate(self, accept_encoding: str) -> Optional[str]:
+        """Best supported coding the client accepts, or None for identity"""
+        accepted = parse_accept_encoding(accept_encoding)
+        best, best_quality = None, 0.0
+        for encoding in self.encodings:
+            quality = accepted.get(encoding, accepted.get("*", 0.0))
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def _encode(self, body: bytes, encoding: str) -> bytes:
+        start = time.perf_counter()
+        if encoding == "br":
+            encoded = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            encoded = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        elapsed = time.perf_counter() - start
+        self.compress_seconds += elapsed
+        record_timing("compress", elapsed)
+        return encoded
+
+    def compress(self, body: bytes, encoding: str, etag: Optional[str]) -> bytes:
+        if etag is None:
+            return self._encode(body, encoding)
+
+        key = (etag, encoding)
+        encoded = self._cache.get(key)
+        if encoded is not None:
+            self.cache_hits += 1
+            self._cache.move_to_end(key)
+            return encoded
+
+        self.cache_misses += 1
+        encoded = self._encode(body, encoding)
+        self._cache[key] = encoded
+        while len(self._cache) > self.cache_entries:
+            self._cache.popitem(last=False)
+        return encoded
+
+    def prime(self, body: bytes, etag: str):
+        """Encode `body` in every supported coding ahead of the first request for it"""
+        if len(body) >= self.minimum_size:
+            for encoding in self.encodings:
+                self.compress(body, encoding, etag)
+
+    def apply(self, start_message: dict, body: bytes, encoding: Optional[str],
+              if_none_match: str = "") -> bytes:
+        """Compress a complete response in place of `body`, rewriting its headers"""
+        headers = MutableHeaders(scope=start_message)
+        if start_message["status"] == 304:
+            self._not_modified(headers, if_none_match)
+            return body
+        content_type = headers.get("content-type", "")
+        if (
+            start_message["status"] < 200 or start_message["status"] == 204
+            or "content-encoding" in headers
+            or not content_type.startswith(COMPRESSIBLE_TYPES)
+        ):
+            return body
+
+        # Sent even when this body is left as-is: a larger version would be encoded
+        add_vary(headers)
+        if encoding is None or len(body) < self.minimum_size:
+            return body
+
+        cache_control = headers.get("cache-control", "")
+        etag = headers.get("etag") if "no-store" not in cache_control else None
+        encoded = self.compress(body, encoding, etag)
+
+        self.compressed += 1
+        self.bytes_in += len(body)
+        self.bytes_out += len(encoded)
+        headers["content-encoding"] = encoding
+        headers["content-length"] = str(len(encoded))
+        if etag:
+            # The encoded bytes are a representation of their own
+            headers["etag"] = encoded_etag(etag, encoding)
+        return encoded
+
+    @staticmethod
+    def _not_modified(headers: MutableHeaders, if_none_match: str):
+        """A 304 carries the Vary and the ETag of the representation the client holds"""
+        etag = headers.get("etag")
+        if etag is None:
+            return
+        add_vary(headers)
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate.startswith("W/"):
+                candidate = candidate[2:]
+            if identity_etag(candidate) == etag:
+                headers["etag"] = candidate
+                return
+
+    def stats(self) -> dict:
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "encodings": list(self.encodings),
+            "compressed_responses": self.compressed,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_rate": round(self.cache_hits / lookups, 4) if lookups else 0.0,
+            "cache_entries": len(self._cache),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": round(self.bytes_out / self.bytes_in, 4) if self.bytes_in else 0.0,
+            "compress_seconds": round(self.compress_seconds, 4),
+        }
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing single-message response bodies.
+
+    Streamed responses (several body messages) and bodies that already carry
+    a Content-Encoding, such as precompressed sitemaps, pass through untouched.
+    """
+
+    def __init__(self, app, compressor: Compressor):
+        self.app = app
+        self.compressor = compressor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = self.compressor.negotiate(request_headers.get("accept-encoding", ""))
+        start_message = None
+        streaming = False
+
+        async def send_compressed(message):
+            nonlocal start_message, streaming
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or streaming or start_message is None:
+                await send(message)
+                return
+
+            if message.get("more_body", False):
+                streaming = True
+                await send(start_message)
+                await send(message)
+                return
+
+            body = self.compressor.apply(start_message, message.get("body", b""), encoding,
+                                         request_headers.get("if-none-match", ""))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+            start_message = None
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,60 @@
+"""
+Count Strategy
+Cached per-filter document totals for paginated list endpoints
+"""
+import os
+import json
+import time
+from typing import Dict, Tuple
+
+
+class CountCache:
+    """
+    Per-process cache of `count_documents` results keyed on collection + filter.
+
+    Unfiltered counts use `estimated_document_count` (collection metadata, no
+    scan). Filtered totals are cached until the owning collection is
+    invalidated by a write path, with a TTL as a safety net for writes made
+    by other workers.
+    """
+
+    def __init__(self, ttl: float = None, max_entries: int = 1024):
+        self.ttl = ttl if ttl is not None else float(os.getenv("COUNT_CACHE_TTL", "60"))
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, str], Tuple[float, int]] = {}
+        self._generations: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _filter_key(query: dict) -> str:
+        return json.dumps(query, sort_keys=True, default=str)
+
+    async def count(self, collection, query: dict) -> int:
+        """Total number of documents in `collection` matching `query`"""
+        if not query:
+            return await collection.estimated_document_count()
+
+        key = (collection.name, self._filter_key(query))
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None and entry[0] > now:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        generation = self._generations.get(collection.name, 0)
+        total = await collection.count_documents(query)
+
+        # Skip caching if the collection was invalidated while counting
+        if self._generations.get(collection.name, 0) == generation:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[key] = (now + self.ttl, total)
+        return total
+
+    def invalidate(self, collection_name: str):
+        """Drop every cached total for a collection"""
+        self._generations[collection_name] = self._generations.get(collection_name, 0) + 1
+        for key in [k for k in self._entries if k[0] == collection_name]:
+            del self._entries[key]
@@ -0,0 +1,193 @@
+"""
+Health Probes
+Liveness/readiness state fed by a background MongoDB pinger, event-loop lag
+sampling and connection pool events, so probes never touch the database
+"""
+import os
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Connection pool counters from pymongo's CMAP events"""
+
+    def __init__(self):
+        self.max_pool_size: Optional[int] = None
+        self.open = 0
+        self.checked_out = 0
+        self.checkout_failures = 0
+        self.pool_clears = 0
+        self._lock = threading.Lock()
+
+    def _add(self, field: str, amount: int):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + amount)
+
+    def pool_created(self, event):
+        self.max_pool_size = event.options.get("maxPoolSize", self.max_pool_size)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._add("pool_clears", 1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._add("open", 1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._add("open", -1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._add("checkout_failures", 1)
+
+    def connection_checked_out(self, event):
+        self._add("checked_out", 1)
+
+    def connection_checked_in(self, event):
+        self._add("checked_out", -1)
+
+    def stats(self) -> dict:
+        return {
+            "max_size": self.max_pool_size,
+            "open": self.open,
+            "checked_out": self.checked_out,
+            "checkout_failures": self.checkout_failures,
+            "clears": self.pool_clears,
+        }
+
+
+class HealthMonitor:
+    """
+    Cached health state for /live, /ready and /health.
+
+    A background task pings MongoDB every HEALTH_PING_INTERVAL seconds and
+    another samples event-loop lag; probes just read the latest results.
+    The service is ready once startup finished (Mongo reachable, indexes
+    built), the last ping succeeded recently and the loop is not stalled.
+    """
+
+    def __init__(self, db, pool: Optional[PoolStats] = None):
+        self.db = db
+        self.pool = pool or PoolStats()
+        self.ping_interval = float(os.getenv("HEALTH_PING_INTERVAL", "5"))
+        self.ping_timeout = float(os.getenv("HEALTH_PING_TIMEOUT", "2"))
+        self.startup_timeout = float(os.getenv("HEALTH_STARTUP_TIMEOUT", "60"))
+        self.max_loop_lag = float(os.getenv("HEALTH_MAX_LOOP_LAG_MS", "1000")) / 1000
+        self.lag_interval = 0.5
+
+        self.started = False
+        self.mongo_ok = False
+        self.mongo_latency: Optional[float] = None
+        self.mongo_error: Optional[str] = None
+        self.last_ping_at: Optional[float] = None
+        self.last_ok_at: Optional[datetime] = None
+        self.consecutive_failures = 0
+        self._lag_samples = deque(maxlen=20)
+        self._tasks = []
+
+    # ---------- probes ----------
+
+    async def ping(self) -> bool:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.db.command("ping"), timeout=self.ping_timeout)
+        except Exception as e:
+            self.mongo_error = f"{type(e).__name__}: {str(e)}"
+            if self.mongo_ok or self.consecutive_failures == 0:
+                logger.warning(f"MongoDB ping failed: {self.mongo_error}")
+            self.mongo_ok = False
+            self.consecutive_failures += 1
+        else:
+            if not self.mongo_ok and self.consecutive_failures:
+                logger.info("MongoDB ping recovered")
+            self.mongo_ok = True
+            self.mongo_error = None
+            self.mongo_latency = time.perf_counter() - start
+            self.last_ok_at = datetime.utcnow()
+            self.consecutive_failures = 0
+        self.last_ping_at = time.monotonic()
+        return self.mongo_ok
+
+    async def wait_for_mongo(self):
+        """Block startup until MongoDB answers; raise after HEALTH_STARTUP_TIMEOUT"""
+        deadline = time.monotonic() + self.startup_timeout
+        delay = 0.5
+        while not await self.ping():
+            if time.monotonic() + delay > deadline:
+                raise RuntimeError(f"MongoDB not reachable after {self.startup_timeout:.0f}s: {self.mongo_error}")
+            logger.info(f"Waiting for MongoDB ({self.mongo_error}); retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 5)
+
+    @property
+    def loop_lag(self) -> float:
+        return max(self._lag_samples, default=0.0)
+
+    def is_ready(self) -> bool:
+        ping_fresh = (
+            self.last_ping_at is not None
+            and time.monotonic() - self.last_ping_at <= self.ping_interval * 3 + self.ping_timeout
+        )
+        return self.started and self.mongo_ok and ping_fresh and self.loop_lag <= self.max_loop_lag
+
+    def report(self) -> dict:
+        return {
+            "status": "ready" if self.is_ready() else "not_ready",
+            "started": self.started,
+            "database": {
+                "connected": self.mongo_ok,
+                "latency_ms": round(self.mongo_latency * 1000, 2) if self.mongo_latency is not None else None,
+                "last_ok_at": self.last_ok_at.isoformat() if self.last_ok_at else None,
+                "consecutive_failures": self.consecutive_failures,
+                "error": self.mongo_error,
+            },
+            "event_loop_lag_ms": round(self.loop_lag * 1000, 2),
+            "pool": self.pool.stats(),
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    # ---------- background tasks ----------
+
+    async def _ping_loop(self):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await self.ping()
+
+    async def _lag_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.lag_interval
+            await asyncio.sleep(self.lag_interval)
+            self._lag_samples.append(max(0.0, loop.time() - expected))
+
+    async def start(self):
+        """Mark startup complete and begin background checks"""
+        self.started = True
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._ping_loop()), asyncio.create_task(self._lag_loop())]
+
+    async def stop(self):
+        self.started = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
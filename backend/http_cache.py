@@ -0,0 +1,228 @@
+"""
+HTTP Caching Policy
+Per-route Cache-Control, ETag/Last-Modified validators, 304 handling and
+surrogate-key purging for the public content endpoints
+"""
+import os
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+import orjson
+from starlette.requests import Request
+from starlette.responses import Response
+
+from precomputed import etag_matches
+
+logger = logging.getLogger(__name__)
+
+
+class CachePolicy:
+    """
+    Cache-Control for one route.
+
+    `max_age` applies to browsers, `s_maxage` to shared caches (CDN edges),
+    which may also serve a stale copy for `stale_while_revalidate` seconds
+    while refetching, or `stale_if_error` seconds while the origin fails.
+    `revalidate` makes every cache check back with the origin (cheap 304s).
+    """
+
+    def __init__(self, max_age: int = 0, s_maxage: Optional[int] = None,
+                 stale_while_revalidate: int = 0, stale_if_error: int = 0, revalidate: bool = False):
+        directives = ["public"]
+        if revalidate:
+            directives.append("no-cache")
+        else:
+            directives.append(f"max-age={max_age}")
+            if s_maxage is not None:
+                directives.append(f"s-maxage={s_maxage}")
+            if stale_while_revalidate:
+                directives.append(f"stale-while-revalidate={stale_while_revalidate}")
+            if stale_if_error:
+                directives.append(f"stale-if-error={stale_if_error}")
+        self.cache_control = ", ".join(directives)
+
+
+DEFAULT_POLICY = CachePolicy(revalidate=True)
+
+
+def etag_for(body: bytes) -> str:
+    """Strong ETag from the encoded body"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def http_date(value: Optional[datetime]) -> Optional[str]:
+    """IMF-fixdate for a naive-UTC (as stored by Motor) or aware datetime"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def not_modified(request: Request, etag: str, last_modified: Optional[str]) -> bool:
+    """RFC 9110 13.2.2: If-None-Match wins; If-Modified-Since only without it"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since or not last_modified:
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+class CachedBody:
+    """An encoded body stored with its validators and surrogate keys"""
+
+    def __init__(self, body: bytes, etag: str, last_modified: Optional[str] = None,
+                 surrogate_keys: Tuple[str, ...] = (), media_type: str = "application/json"):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.surrogate_keys = tuple(surrogate_keys)
+        self.media_type = media_type
+
+    def encode(self) -> bytes:
+        meta = orjson.dumps([self.etag, self.last_modified, self.surrogate_keys, self.media_type])
+        return meta + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, raw: bytes) -> "CachedBody":
+        meta, body = raw.split(b"\n", 1)
+        # Entries written before media types were stored are JSON
+        etag, last_modified, surrogate_keys, *media_type = orjson.loads(meta)
+        return cls(body, etag, last_modified, tuple(surrogate_keys), *media_type)
+
+
+class HttpCache:
+    """
+    Applies the declared policy of the matched route to content responses.
+
+    Bodies go through the shared response cache together with their
+    validators, so a conditional request on a cache hit is answered with 304
+    without touching MongoDB or the serializer, on any worker.
+    """
+
+    def __init__(self, response_cache, policies: Dict[str, CachePolicy]):
+        self.response_cache = response_cache
+        self.policies = policies
+        self.not_modified = 0
+
+    def policy_for(self, request: Request) -> CachePolicy:
+        route = getattr(request.scope.get("route"), "path", None)
+        return self.policies.get(route, DEFAULT_POLICY)
+
+    def headers(self, request: Request, etag: str, last_modified: Optional[str] = None,
+                surrogate_keys: Iterable[str] = ()) -> Dict[str, str]:
+        headers = {"ETag": etag, "Cache-Control": self.policy_for(request).cache_control}
+        if last_modified:
+            headers["Last-Modified"] = last_modified
+        if surrogate_keys:
+            headers["Surrogate-Key"] = " ".join(surrogate_keys)
+        return headers
+
+    def check(self, request: Request, etag: str, last_modified: Optional[str] = None,
+              surrogate_keys: Iterable[str] = ()) -> Optional[Response]:
+        """Empty 304 if the client's copy is current, else None"""
+        if not not_modified(request, etag, last_modified):
+            return None
+        self.not_modified += 1
+        return Response(status_code=304, headers=self.headers(request, etag, last_modified, surrogate_keys))
+
+    def respond(self, request: Request, entry: CachedBody) -> Response:
+        headers = self.headers(request, entry.etag, entry.last_modified, entry.surrogate_keys)
+        if not_modified(request, entry.etag, entry.last_modified):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type=entry.media_type, headers=headers)
+
+    async def get(self, key: str) -> Optional[CachedBody]:
+        raw = await self.response_cache.get(key)
+        return CachedBody.decode(raw) if raw is not None else None
+
+    async def lookup(self, request: Request, key: str) -> Optional[Response]:
+        """Response (200 or 304) for a cached entry, or None on a miss"""
+        entry = await self.get(key)
+        if entry is None:
+            return None
+        return self.respond(request, entry)
+
+    async def put(self, key: str, body: bytes, last_modified: Optional[datetime] = None,
+                  surrogate_keys: Tuple[str, ...] = (), media_type: str = "application/json") -> CachedBody:
+        """Cache a freshly encoded body with its validators"""
+        entry = CachedBody(body, etag_for(body), http_date(last_modified), surrogate_keys, media_type)
+        await self.response_cache.set(key, entry.encode())
+        return entry
+
+    async def store(self, request: Request, key: str, body: bytes,
+                    last_modified: Optional[datetime] = None, surrogate_keys: Tuple[str, ...] = (),
+                    media_type: str = "application/json") -> Response:
+        """Cache a freshly encoded body with its validators and answer the request"""
+        return self.respond(request, await self.put(key, body, last_modified, surrogate_keys, media_type))
+
+
+class SurrogatePurger:
+    """
+    Purges CDN / caching proxy objects tagged with a surrogate key.
+
+    Sends `POST $CDN_PURGE_URL` with the keys in a `Surrogate-Key` header
+    (and `Authorization: Bearer $CDN_PURGE_TOKEN` when set); disabled when
+    no URL is configured. Failures are logged, never raised.
+    """
+
+    def __init__(self, url: Optional[str] = None, token: Optional[str] = None, client=None):
+        self.url = url if url is not None else os.getenv("CDN_PURGE_URL")
+        self.token = token if token is not None else os.getenv("CDN_PURGE_TOKEN")
+        self.timeout = float(os.getenv("CDN_PURGE_TIMEOUT", "5"))
+        self._client = client
+        self._pending = set()
+        self.purges = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.url)
+
+    async def purge(self, *keys: str):
+        if not self.enabled or not keys:
+            return
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+
+        headers = {"Surrogate-Key": " ".join(keys)}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        try:
+            response = await self._client.post(self.url, headers=headers)
+            response.raise_for_status()
+            self.purges += 1
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"CDN purge failed for {' '.join(keys)}: {str(e)}")
+
+    def purge_later(self, *keys: str):
+        """Purge in the background, so the writing request doesn't wait on the CDN"""
+        if not self.enabled or not keys:
+            return
+        task = asyncio.create_task(self.purge(*keys))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def close(self):
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "purges": self.purges, "errors": self.errors,
+                "pending": len(self._pending)}
@@ -0,0 +1,197 @@
+"""
+MongoDB Index Provisioning
+Declarative index definitions for every query shape used by server.py
+
+Usage (standalone):
+    python indexes.py            # create missing indexes
+    python indexes.py --check    # exit 1 if any index is missing
+"""
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+logger = logging.getLogger(__name__)
+
+
+# ============= INDEX DEFINITIONS =============
+# Equality fields first, then the sort key, so list queries can walk the
+# index in order instead of scanning and sorting in memory.
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "blog_posts": [
+        # GET /api/blog/{slug}; slugs must stay unique
+        IndexModel([("slug", ASCENDING)], name="slug_unique", unique=True),
+        # GET /api/blog (published_only, optional category) sorted by created_at
+        # (_id breaks ties for keyset pagination)
+        IndexModel([("published", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                   name="published_created_at_id"),
+        IndexModel([("published", ASCENDING), ("category", ASCENDING),
+                    ("created_at", DESCENDING), ("_id", DESCENDING)],
+                   name="published_category_created_at_id"),
+        IndexModel([("category", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                   name="category_created_at_id"),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+    ],
+    "case_studies": [
+        # GET /api/case-studies/{slug}
+        IndexModel([("slug", ASCENDING)], name="slug_unique", unique=True),
+        # GET /api/case-studies (published_only, optional industry) sorted by created_at
+        IndexModel([("published", ASCENDING), ("created_at", DESCENDING)],
+                   name="published_created_at"),
+        IndexModel([("published", ASCENDING), ("industry", ASCENDING), ("created_at", DESCENDING)],
+                   name="published_industry_created_at"),
+        IndexModel([("industry", ASCENDING), ("created_at", DESCENDING)],
+                   name="industry_created_at"),
+        IndexModel([("created_at", DESCENDING)], name="created_at"),
+    ],
+    "testimonials": [
+        # GET /api/testimonials (published_only, featured_only) sorted by created_at
+        IndexModel([("published", ASCENDING), ("created_at", DESCENDING)],
+                   name="published_created_at"),
+        IndexModel([("published", ASCENDING), ("featured", ASCENDING), ("created_at", DESCENDING)],
+                   name="published_featured_created_at"),
+        IndexModel([("featured", ASCENDING), ("created_at", DESCENDING)],
+                   name="featured_created_at"),
+        IndexModel([("created_at", DESCENDING)], name="created_at"),
+    ],
+    "contacts": [
+        # GET /api/admin/contacts (optional status_filter) sorted by submitted_at
+        # (_id breaks ties for keyset pagination)
+        IndexModel([("status", ASCENDING), ("submitted_at", DESCENDING), ("_id", DESCENDING)],
+                   name="status_submitted_at_id"),
+        IndexModel([("submitted_at", DESCENDING), ("_id", DESCENDING)], name="submitted_at_id"),
+    ],
+    "admin_users": [
+        # Login / register lookups
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "email_outbox": [
+        # Dispatcher claims due records ordered by next_attempt_at
+        IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)],
+                   name="status_next_attempt_at"),
+    ],
+    "prerendered_pages": [
+        # GET /api/prerender/{kind}/{slug}
+        IndexModel([("kind", ASCENDING), ("slug", ASCENDING)], name="kind_slug_unique", unique=True),
+    ],
+    "search_deletions": [
+        # Search index sync reads recent deletions; older records expire after a day
+        IndexModel([("deleted_at", ASCENDING)], name="deleted_at_ttl", expireAfterSeconds=86400),
+    ],
+}
+
+
+# ============= PROVISIONING =============
+
+async def missing_indexes(db) -> Dict[str, List[IndexModel]]:
+    """Return the declared indexes that do not exist yet, per collection"""
+    missing = {}
+    for collection_name, models in INDEXES.items():
+        existing = await db[collection_name].index_information()
+        absent = [m for m in models if m.document["name"] not in existing]
+        if absent:
+            missing[collection_name] = absent
+    return missing
+
+
+async def _report_build_progress(db, collection_name: str, interval: float = 5.0):
+    """Periodically log progress of in-flight index builds on a collection"""
+    namespace = f"{db.name}.{collection_name}"
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            cursor = db.client.admin.aggregate([
+                {"$currentOp": {"allUsers": True, "idleConnections": False}},
+                {"$match": {"ns": namespace, "command.createIndexes": {"$exists": True}}},
+            ])
+            async for op in cursor:
+                progress = op.get("progress") or {}
+                if progress.get("total"):
+                    pct = 100.0 * progress.get("done", 0) / progress["total"]
+                    logger.info(f"  {namespace}: {op.get('msg', 'building')} ({pct:.1f}%)")
+                else:
+                    logger.info(f"  {namespace}: {op.get('msg', 'building index')}")
+        except Exception as e:
+            # $currentOp needs extra privileges on some deployments; progress is best effort
+            logger.debug(f"Index progress unavailable for {namespace}: {str(e)}")
+            return
+
+
+async def ensure_indexes(db) -> int:
+    """
+    Create every declared index that is missing.
+
+    Builds run one collection at a time with progress logged; returns the
+    number of indexes created. Any failure (e.g. duplicate slugs blocking a
+    unique index) is raised so startup aborts instead of serving unindexed.
+    """
+    missing = await missing_indexes(db)
+    total = sum(len(models) for models in missing.values())
+    if total == 0:
+        logger.info("All MongoDB indexes present")
+        return 0
+
+    logger.info(f"Building {total} MongoDB index(es)...")
+    built = 0
+    for collection_name, models in missing.items():
+        names = ", ".join(m.document["name"] for m in models)
+        logger.info(f"  {collection_name}: building {names}")
+
+        started = time.monotonic()
+        reporter = asyncio.create_task(_report_build_progress(db, collection_name))
+        try:
+            await db[collection_name].create_indexes(models)
+        except Exception as e:
+            logger.error(f"Index build failed on {collection_name} ({names}): {str(e)}")
+            raise
+        finally:
+            reporter.cancel()
+
+        built += len(models)
+        logger.info(f"[{built}/{total}] {collection_name} done in {time.monotonic() - started:.2f}s")
+
+    logger.info(f"MongoDB indexes ready ({built} built)")
+    return built
+
+
+# ============= CLI =============
+
+async def _main(check_only: bool) -> int:
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    load_dotenv(Path(__file__).parent / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+
+    try:
+        if check_only:
+            missing = await missing_indexes(db)
+            for collection_name, models in missing.items():
+                for model in models:
+                    print(f"missing: {collection_name}.{model.document['name']}")
+            if missing:
+                return 1
+            print("All indexes present")
+            return 0
+
+        await ensure_indexes(db)
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Provision MongoDB indexes for the My Inbox Media® API")
+    parser.add_argument("--check", action="store_true", help="only report missing indexes")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(asyncio.run(_main(args.check)))
@@ -0,0 +1,339 @@
+"""
+Client Logo Pipeline
+Builds responsive WebP/AVIF derivatives of frontend/public/client-logos with
+content-hashed filenames, an optional sprite atlas and blurhash placeholders,
+and enriches the /api/external/clients payload from the resulting manifest
+
+Usage:
+    python logo_pipeline.py [--widths 80 160 320] [--formats avif webp] [--sprite]
+
+Building requires Pillow (AVIF needs a Pillow built with libavif); serving the
+manifest does not.
+"""
+import io
+import re
+import json
+import math
+import hashlib
+import logging
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_DIR = Path(__file__).parent.parent / "frontend" / "public"
+SOURCE_DIR = PUBLIC_DIR / "client-logos"
+OUTPUT_DIR = SOURCE_DIR / "optimized"
+URL_PREFIX = "/client-logos/optimized/"
+MANIFEST_NAME = "manifest.json"
+
+DEFAULT_WIDTHS = (80, 160, 320)
+# Listed in order of preference for <picture> sources
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+SAVE_OPTIONS = {"avif": {"quality": 60, "speed": 8}, "webp": {"quality": 80, "method": 4}}
+SPRITE_HEIGHT = 64
+SPRITE_MAX_WIDTH = 2048
+SPRITE_STEM = "client-logos-sprite"
+# Names _write_hashed gives derivatives and the sprite; nothing else is ever pruned
+DERIVATIVE_RE = re.compile(
+    rf"^(?:[a-z0-9-]+\.\d+w|{SPRITE_STEM})\.[0-9a-f]{{10}}\.(?:{'|'.join(MIME_TYPES)})$"
+)
+
+
+# ============= BLURHASH =============
+
+_BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+def _encode83(value: int, length: int) -> str:
+    return "".join(_BASE83[(value // 83 ** (length - i - 1)) % 83] for i in range(length))
+
+
+def _srgb_to_linear(value: int) -> float:
+    v = value / 255
+    return v / 12.92 if v <= 0.04045 else ((v + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(value: float) -> int:
+    v = max(0.0, min(1.0, value))
+    if v <= 0.0031308:
+        return int(v * 12.92 * 255 + 0.5)
+    return int((1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value: float, exponent: float) -> float:
+    return math.copysign(abs(value) ** exponent, value)
+
+
+def blurhash(pixels: List[tuple], width: int, height: int, x_components: int = 4, y_components: int = 3) -> str:
+    """Blurhash (https://blurha.sh) of row-major RGB pixels; keep the image tiny (~32px)"""
+    linear = [tuple(_srgb_to_linear(c) for c in pixel[:3]) for pixel in pixels]
+    cos_x = [[math.cos(math.pi * i * x / width) for x in range(width)] for i in range(x_components)]
+    cos_y = [[math.cos(math.pi * j * y / height) for y in range(height)] for j in range(y_components)]
+
+    factors = []
+    for j in range(y_components):
+        for i in range(x_components):
+            normalisation = 1 if i == 0 and j == 0 else 2
+            r = g = b = 0.0
+            for y in range(height):
+                row = y * width
+                cy = cos_y[j][y]
+                for x in range(width):
+                    basis = cos_x[i][x] * cy
+                    pr, pg, pb = linear[row + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            scale = normalisation / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _encode83((x_components - 1) + (y_components - 1) * 9, 1)
+    if ac:
+        actual_max = max(abs(v) for factor in ac for v in factor)
+        quantised_max = max(0, min(82, int(actual_max * 166 - 0.5)))
+        max_value = (quantised_max + 1) / 166
+        result += _encode83(quantised_max, 1)
+    else:
+        max_value = 1.0
+        result += _encode83(0, 1)
+
+    result += _encode83((_linear_to_srgb(dc[0]) << 16) + (_linear_to_srgb(dc[1]) << 8) + _linear_to_srgb(dc[2]), 4)
+    for factor in ac:
+        quantised = [max(0, min(18, int(_sign_pow(v / max_value, 0.5) * 9 + 9.5))) for v in factor]
+        result += _encode83(quantised[0] * 19 * 19 + quantised[1] * 19 + quantised[2], 2)
+    return result
+
+
+# ============= BUILD =============
+
+def _require_pillow():
+    try:
+        from PIL import Image, features
+    except ImportError:
+        raise RuntimeError("Building logo derivatives requires Pillow (pip install pillow)")
+    return Image, features
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "logo"
+
+
+def _flatten(image, background=(255, 255, 255)):
+    """RGB copy of an RGBA image composited onto `background`"""
+    Image, _ = _require_pillow()
+    flat = Image.new("RGB", image.size, background)
+    flat.paste(image, mask=image.getchannel("A"))
+    return flat
+
+
+def _write_hashed(output_dir: Path, stem: str, suffix: str, data: bytes) -> str:
+    """Write `data` under a content-hashed name (safe to cache as immutable)"""
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    filename = f"{stem}.{digest}{suffix}"
+    path = output_dir / filename
+    if not path.exists():
+        path.write_bytes(data)
+    return filename
+
+
+def build_logo(source: Path, output_dir: Path, widths, formats) -> dict:
+    """Derivatives, intrinsic size and placeholder for one logo"""
+    Image, _ = _require_pillow()
+    with Image.open(source) as original:
+        original.load()
+        image = original.convert("RGBA")
+
+    width, height = image.size
+    targets = sorted({w for w in widths if w < width} | {min(width, max(widths))})
+    stem = _slug(source.stem)
+
+    sources = {}
+    for fmt in formats:
+        variants = []
+        for target in targets:
+            resized = image if target == width else image.resize(
+                (target, max(1, round(height * target / width))), Image.LANCZOS
+            )
+            buffer = io.BytesIO()
+            resized.save(buffer, fmt.upper(), **SAVE_OPTIONS[fmt])
+            filename = _write_hashed(output_dir, f"{stem}.{target}w", f".{fmt}", buffer.getvalue())
+            variants.append({"url": URL_PREFIX + filename, "width": target})
+        sources[MIME_TYPES[fmt]] = variants
+
+    thumb = _flatten(image)
+    thumb.thumbnail((32, 32))
+    data = thumb.tobytes()
+    pixels = [tuple(data[i:i + 3]) for i in range(0, len(data), 3)]
+    return {
+        "width": width,
+        "height": height,
+        "blurhash": blurhash(pixels, *thumb.size),
+        "sources": sources,
+    }
+
+
+def build_sprite(entries: Dict[str, dict], sources: Dict[str, Path], output_dir: Path) -> dict:
+    """Pack every logo at SPRITE_HEIGHT into one WebP atlas and record each offset"""
+    Image, _ = _require_pillow()
+    placed, x, y, atlas_width = [], 0, 0, 0
+    for logo_url in sorted(entries):
+        entry = entries[logo_url]
+        scaled_width = max(1, round(entry["width"] * SPRITE_HEIGHT / entry["height"]))
+        if x and x + scaled_width > SPRITE_MAX_WIDTH:
+            x, y = 0, y + SPRITE_HEIGHT
+        placed.append((logo_url, x, y, scaled_width))
+        x += scaled_width
+        atlas_width = max(atlas_width, x)
+
+    atlas = Image.new("RGBA", (atlas_width, y + SPRITE_HEIGHT), (0, 0, 0, 0))
+    for logo_url, px, py, scaled_width in placed:
+        with Image.open(sources[logo_url]) as logo:
+            atlas.paste(logo.convert("RGBA").resize((scaled_width, SPRITE_HEIGHT), Image.LANCZOS), (px, py))
+        entries[logo_url]["sprite"] = {"x": px, "y": py, "width": scaled_width, "height": SPRITE_HEIGHT}
+
+    buffer = io.BytesIO()
+    atlas.save(buffer, "WEBP", **SAVE_OPTIONS["webp"])
+    filename = _write_hashed(output_dir, SPRITE_STEM, ".webp", buffer.getvalue())
+    return {"url": URL_PREFIX + filename, "width": atlas.width, "height": atlas.height}
+
+
+def build_manifest(source_dir: Path = SOURCE_DIR, output_dir: Path = OUTPUT_DIR,
+                   widths=DEFAULT_WIDTHS, formats=("avif", "webp"), sprite: bool = False) -> dict:
+    """
+    Process every logo in `source_dir`, reusing entries whose source bytes are
+    unchanged since the previous manifest, and write the new manifest.
+    """
+    _, features = _require_pillow()
+    formats = [fmt for fmt in formats if features.check(fmt)] or ["webp"]
+    output_dir.mkdir(parents=True, exist_ok=True)
+    previous = load_logo_manifest(output_dir / MANIFEST_NAME) or {}
+    options = {"widths": sorted(widths), "formats": formats}
+    reusable = previous.get("options") == options
+
+    entries, sources, built = {}, {}, 0
+    for source in sorted(p for p in source_dir.iterdir() if p.is_file()):
+        if source.suffix.lower() not in (".png", ".jpg", ".jpeg", ".webp", ".gif"):
+            continue
+        logo_url = f"/client-logos/{source.name}"
+        source_hash = hashlib.sha256(source.read_bytes()).hexdigest()
+        cached = previous.get("logos", {}).get(logo_url)
+        if reusable and cached and cached.get("source_hash") == source_hash and all(
+            (output_dir / variant["url"][len(URL_PREFIX):]).exists()
+            for variants in cached["sources"].values() for variant in variants
+        ):
+            entry = {k: v for k, v in cached.items() if k != "sprite"}
+        else:
+            entry = build_logo(source, output_dir, widths, formats)
+            entry["source_hash"] = source_hash
+            built += 1
+        entries[logo_url] = entry
+        sources[logo_url] = source
+
+    manifest = {
+        "generated_at": datetime.utcnow().isoformat(),
+        "options": options,
+        "logos": entries,
+    }
+    if sprite:
+        manifest["sprite"] = build_sprite(entries, sources, output_dir)
+
+    (output_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    # Servers still on the previous manifest keep working until they reload it
+    _prune(output_dir, manifest, previous)
+    logger.info(f"Logo manifest written: {len(entries)} logo(s), {built} rebuilt")
+    return manifest
+
+
+def _referenced(manifest: dict) -> set:
+    names = set()
+    for entry in manifest.get("logos", {}).values():
+        for variants in entry["sources"].values():
+            names.update(v["url"][len(URL_PREFIX):] for v in variants)
+    if "sprite" in manifest:
+        names.add(manifest["sprite"]["url"][len(URL_PREFIX):])
+    return names
+
+
+def _prune(output_dir: Path, *manifests: dict):
+    """
+    Delete derivatives none of `manifests` reference (superseded hashes,
+    removed logos). Only files named like our derivatives are considered, so
+    other assets sharing the directory are left alone.
+    """
+    referenced = set().union(*(_referenced(manifest) for manifest in manifests))
+    for path in output_dir.iterdir():
+        if path.is_file() and DERIVATIVE_RE.match(path.name) and path.name not in referenced:
+            path.unlink()
+
+
+# ============= SERVING =============
+
+def load_logo_manifest(path: Path) -> Optional[dict]:
+    """The manifest at `path`, or None when the pipeline has not been run"""
+    try:
+        return json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to read logo manifest {path}: {str(e)}")
+        return None
+
+
+def enrich_clients(clients: List[dict], manifest: Optional[dict]) -> List[dict]:
+    """
+    Add `width`/`height`, `blurhash`, a WebP `srcset`, per-type `sources` for
+    <picture> and sprite offsets to each client with a built logo.
+    """
+    if not manifest:
+        return clients
+    logos = manifest.get("logos", {})
+    sprite = manifest.get("sprite")
+    for client in clients:
+        entry = logos.get(client.get("logo_url"))
+        if not entry:
+            continue
+        sources = [
+            {"type": mime, "srcset": ", ".join(f"{v['url']} {v['width']}w" for v in entry["sources"][mime])}
+            for mime in MIME_TYPES.values() if mime in entry["sources"]
+        ]
+        client.update({
+            "width": entry["width"],
+            "height": entry["height"],
+            "blurhash": entry["blurhash"],
+            "sources": sources,
+            "srcset": next((s["srcset"] for s in sources if s["type"] == "image/webp"), None),
+        })
+        if sprite and "sprite" in entry:
+            client["sprite"] = dict(entry["sprite"], url=sprite["url"])
+    return clients
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build responsive client logo derivatives")
+    parser.add_argument("--source", type=Path, default=SOURCE_DIR)
+    parser.add_argument("--output", type=Path, default=OUTPUT_DIR)
+    parser.add_argument("--widths", type=int, nargs="+", default=list(DEFAULT_WIDTHS))
+    parser.add_argument("--formats", nargs="+", choices=sorted(MIME_TYPES), default=["avif", "webp"])
+    parser.add_argument("--sprite", action="store_true", help="also pack all logos into one WebP atlas")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    manifest = build_manifest(args.source, args.output, args.widths, args.formats, args.sprite)
+
+    original = sum(p.stat().st_size for p in args.source.iterdir() if p.is_file())
+    print(f"{len(manifest['logos'])} logos, originals {original / 1024:.0f} KiB")
+    for fmt in manifest["options"]["formats"]:
+        # What a carousel showing every logo at the smallest width downloads
+        smallest = sum(
+            (args.output / entry["sources"][MIME_TYPES[fmt]][0]["url"][len(URL_PREFIX):]).stat().st_size
+            for entry in manifest["logos"].values()
+        )
+        print(f"  {fmt}: {smallest / 1024:.0f} KiB at the smallest width")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""
+Request Metrics
+Per-route latency histograms, status counters and MongoDB time per request,
+exported in Prometheus text format and summarised in a Server-Timing header
+"""
+import time
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from pymongo import monitoring
+from starlette.datastructures import MutableHeaders
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_sample(name: str, labels: Tuple[str, ...], values: LabelValues, value: float) -> str:
+    if labels:
+        pairs = ",".join(f'{label}="{_escape(v)}"' for label, v in zip(labels, values))
+        name = f"{name}{{{pairs}}}"
+    if value == float("inf"):
+        return f"{name} +Inf"
+    return f"{name} {value!r}"
+
+
+# ============= METRIC TYPES =============
+
+class Counter:
+    """Monotonic value per label set"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def render(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            yield _format_sample(self.name, self.labels, label_values, value)
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down"""
+
+    type_name = "gauge"
+
+    def dec(self, *label_values: str, amount: float = 1):
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set"""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts, sum, count]
+        self._series: Dict[LabelValues, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *label_values: str) -> int:
+        series = self._series.get(label_values)
+        return series[2] if series else 0
+
+    def render(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._series.items())
+        bucket_labels = self.labels + ("le",)
+        for label_values, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield _format_sample(f"{self.name}_bucket", bucket_labels,
+                                     label_values + (f"{bound:g}",), cumulative)
+            yield _format_sample(f"{self.name}_bucket", bucket_labels, label_values + ("+Inf",), count)
+            yield _format_sample(f"{self.name}_sum", self.labels, label_values, round(total, 6))
+            yield _format_sample(f"{self.name}_count", self.labels, label_values, count)
+
+
+class CallbackGauge:
+    """Gauge read from a callback at scrape time (e.g. cache or pool stats)"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, help_text: str, callback: Callable, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        # Returns a number, or a {label values: number} dict when `labels` is set
+        self.callback = callback
+
+    def render(self) -> Iterable[str]:
+        values = self.callback()
+        if not self.labels:
+            values = {(): values}
+        for label_values, value in sorted(values.items()):
+            if value is not None:
+                yield _format_sample(self.name, self.labels, label_values, value)
+
+
+class MetricsRegistry:
+    """Set of metrics rendered together in Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labels, buckets))
+
+    def callback_gauge(self, name: str, help_text: str, callback: Callable,
+                       labels: Tuple[str, ...] = ()) -> CallbackGauge:
+        return self.register(CallbackGauge(name, help_text, callback, labels))
+
+    def render(self) -> bytes:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.render())
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+# ============= PER-REQUEST TIMING =============
+
+class RequestTiming:
+    """Time spent in named phases of the current request"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.mongo_seconds = 0.0
+        self.mongo_commands = 0
+        self.sections: Dict[str, float] = {}
+        # Motor runs commands on executor threads
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float):
+        with self._lock:
+            self.sections[name] = self.sections.get(name, 0.0) + seconds
+
+    def add_mongo(self, seconds: float):
+        with self._lock:
+            self.mongo_seconds += seconds
+            self.mongo_commands += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def server_timing(self) -> str:
+        """`Server-Timing` header value; `app` is whatever is not accounted for elsewhere"""
+        total = self.elapsed()
+        entries = [f'db;dur={self.mongo_seconds * 1000:.2f};desc="{self.mongo_commands} commands"']
+        accounted = self.mongo_seconds
+        for name, seconds in self.sections.items():
+            entries.append(f"{name};dur={seconds * 1000:.2f}")
+            accounted += seconds
+        entries.append(f"app;dur={max(total - accounted, 0.0) * 1000:.2f}")
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+
+_current_timing: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+def current_timing() -> Optional[RequestTiming]:
+    return _current_timing.get()
+
+
+def record_timing(name: str, seconds: float):
+    """Attribute `seconds` to phase `name` of the request being handled, if any"""
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.add(name, seconds)
+
+
+class MongoTimingListener(monitoring.CommandListener):
+    """
+    pymongo command listener feeding per-command histograms and the current
+    request's database time.
+
+    Motor copies the caller's context into its executor, so the context
+    variable set by the middleware is visible here.
+    """
+
+    def __init__(self, registry: MetricsRegistry):
+        self.durations = registry.histogram(
+            "mongo_command_duration_seconds", "MongoDB command round-trip time", ("command", "outcome")
+        )
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event, "ok")
+
+    def failed(self, event):
+        self._record(event, "error")
+
+    def _record(self, event, outcome: str):
+        seconds = event.duration_micros / 1_000_000
+        self.durations.observe(seconds, event.command_name, outcome)
+        timing = _current_timing.get()
+        if timing is not None:
+            timing.add_mongo(seconds)
+
+
+# ============= REQUEST METRICS =============
+
+class RequestMetrics:
+    """The HTTP and MongoDB metrics the API exports"""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry or MetricsRegistry()
+        self.in_flight = self.registry.gauge(
+            "http_requests_in_flight", "Requests currently being handled", ("method",)
+        )
+        self.requests = self.registry.counter(
+            "http_requests_total", "Completed requests", ("method", "route", "status")
+        )
+        self.latency = self.registry.histogram(
+            "http_request_duration_seconds", "Request latency", ("method", "route")
+        )
+        self.mongo_time = self.registry.histogram(
+            "http_request_mongo_seconds", "MongoDB time per request", ("method", "route")
+        )
+        self.mongo_commands = self.registry.histogram(
+            "http_request_mongo_commands", "MongoDB commands per request", ("method", "route"),
+            buckets=(0, 1, 2, 3, 5, 8, 13, 21)
+        )
+        self.mongo_listener = MongoTimingListener(self.registry)
+
+    def observe(self, method: str, route: str, status_code: int, timing: RequestTiming):
+        elapsed = timing.elapsed()
+        self.requests.inc(method, route, str(status_code))
+        self.latency.observe(elapsed, method, route)
+        self.mongo_time.observe(timing.mongo_seconds, method, route)
+        self.mongo_commands.observe(timing.mongo_commands, method, route)
+
+    def render(self) -> bytes:
+        return self.registry.render()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request.
+
+    Routes are labelled with their path template (`/api/blog/{slug}`), never
+    the raw URL, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        timing = RequestTiming()
+        token = _current_timing.set(timing)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", timing.server_timing())
+            await send(message)
+
+        self.metrics.in_flight.inc(method)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            self.metrics.in_flight.dec(method)
+            _current_timing.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            self.metrics.observe(method, route, status_code, timing)
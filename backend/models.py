@@ -53,6 +53,7 @@ class BlogPost(BaseModel):
     tags: List[str] = []
     published: bool = False
     views: int = 0
+    teaser: Optional[str] = None  # precomputed from excerpt for summary views
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -88,6 +89,7 @@ class Testimonial(BaseModel):
     rating: int = Field(..., ge=1, le=5)
     featured: bool = False
     published: bool = True
+    teaser: Optional[str] = None  # precomputed from testimonial_text for summary views
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -127,6 +129,7 @@ class CaseStudy(BaseModel):
     featured_image: Optional[str] = None
     gallery_images: List[str] = []
     published: bool = False
+    teaser: Optional[str] = None  # precomputed from challenge for summary views
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -0,0 +1,243 @@
+"""
+Email Outbox
+Durable, asynchronous delivery of notification emails via the MiM Email API
+"""
+import os
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+import httpx
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+# Outbox record states
+PENDING = "pending"
+SENDING = "sending"
+SENT = "sent"
+FAILED = "failed"
+
+
+class EmailOutbox:
+    """
+    Mongo-backed outbox for notification emails.
+
+    Request handlers call `enqueue` right after inserting the source document
+    and return immediately; the background dispatcher claims pending records,
+    posts them to the email API with a pooled async client and flags the
+    source document with `email_sent` once delivered.
+    """
+
+    def __init__(self, db, collection_name: str = "email_outbox"):
+        self.db = db
+        self.collection = db[collection_name]
+        self.concurrency = int(os.getenv("EMAIL_OUTBOX_CONCURRENCY", "4"))
+        self.max_attempts = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "5"))
+        self.poll_interval = float(os.getenv("EMAIL_OUTBOX_POLL_INTERVAL", "5"))
+        self.backoff_base = float(os.getenv("EMAIL_OUTBOX_BACKOFF_SECONDS", "10"))
+        self.send_timeout = float(os.getenv("EMAIL_OUTBOX_TIMEOUT", "10"))
+        # A record stuck in "sending" longer than this (e.g. worker crash) is retried
+        self.lease_seconds = self.send_timeout * 3
+
+        self._wakeup = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._tasks = set()
+        self._http: Optional[httpx.AsyncClient] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    # ---------- configuration ----------
+
+    @staticmethod
+    def credentials() -> Optional[dict]:
+        """Email API settings, or None when not configured"""
+        email_api_url = os.getenv("EMAIL_API_URL")
+        profile_id = os.getenv("EMAIL_PROFILE_ID")
+        api_key = os.getenv("EMAIL_API_KEY")
+        if not (email_api_url and profile_id and api_key):
+            return None
+        return {"url": email_api_url, "ProfileId": profile_id, "APIKey": api_key}
+
+    # ---------- producer side ----------
+
+    async def enqueue(self, source_collection: str, source_id: ObjectId, message: dict) -> ObjectId:
+        """
+        Persist an email for delivery.
+
+        `message` is the email API payload without credentials; ProfileId and
+        APIKey are injected at send time so they never land in the database.
+        """
+        now = datetime.utcnow()
+        record = {
+            "source_collection": source_collection,
+            "source_id": source_id,
+            "message": message,
+            "status": PENDING,
+            "attempts": 0,
+            "next_attempt_at": now,
+            "created_at": now,
+            "updated_at": now,
+            "last_error": None,
+        }
+        result = await self.collection.insert_one(record)
+        self._wakeup.set()
+        return result.inserted_id
+
+    # ---------- dispatcher lifecycle ----------
+
+    async def start(self):
+        """Start the background dispatcher"""
+        if self._runner is not None:
+            return
+        if self.credentials() is None:
+            logger.warning("Email API credentials not configured - outbox dispatcher not started")
+            return
+
+        self._stopping = False
+        self._http = httpx.AsyncClient(
+            timeout=self.send_timeout,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency
+            ),
+            headers={"Content-Type": "application/json"},
+        )
+        self._runner = asyncio.create_task(self._run())
+        logger.info(f"Email outbox dispatcher started (concurrency={self.concurrency})")
+
+    async def stop(self):
+        """Stop claiming new records and wait for in-flight sends"""
+        if self._runner is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._runner
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._http.aclose()
+        self._runner = None
+        self._http = None
+        logger.info("Email outbox dispatcher stopped")
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await self._drain()
+            except Exception as e:
+                logger.error(f"Email outbox dispatcher error: {str(e)}")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _drain(self):
+        """Claim and dispatch due records until none are left"""
+        while not self._stopping:
+            await self._semaphore.acquire()
+            try:
+                record = await self._claim()
+            except Exception:
+                self._semaphore.release()
+                raise
+            if record is None:
+                self._semaphore.release()
+                return
+
+            task = asyncio.create_task(self._deliver(record))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _claim(self) -> Optional[dict]:
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": PENDING, "next_attempt_at": {"$lte": now}},
+                    {"status": SENDING, "next_attempt_at": {"$lte": now}},
+                ]
+            },
+            {
+                "$set": {
+                    "status": SENDING,
+                    "next_attempt_at": now + timedelta(seconds=self.lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    # ---------- delivery ----------
+
+    async def _deliver(self, record: dict):
+        try:
+            error = await self._send(record["message"])
+            if error is None:
+                await self._mark_sent(record)
+            else:
+                await self._mark_failed_attempt(record, error)
+        except Exception as e:
+            logger.error(f"Error delivering outbox email {record['_id']}: {str(e)}")
+        finally:
+            self._semaphore.release()
+
+    async def _send(self, message: dict) -> Optional[str]:
+        """POST a message to the email API; returns an error string on failure"""
+        credentials = self.credentials()
+        if credentials is None:
+            return "Email API credentials not configured"
+
+        payload = {"ProfileId": credentials["ProfileId"], "APIKey": credentials["APIKey"]}
+        payload.update(message)
+
+        try:
+            response = await self._http.post(credentials["url"], json=payload)
+        except httpx.HTTPError as e:
+            return f"{type(e).__name__}: {str(e)}"
+
+        if response.status_code == 200:
+            return None
+        return f"HTTP {response.status_code} - {response.text[:200]}"
+
+    async def _mark_sent(self, record: dict):
+        now = datetime.utcnow()
+        await self.collection.update_one(
+            {"_id": record["_id"]},
+            {"$set": {"status": SENT, "sent_at": now, "updated_at": now, "last_error": None}}
+        )
+        await self.db[record["source_collection"]].update_one(
+            {"_id": record["source_id"]},
+            {"$set": {"email_sent": True}}
+        )
+        logger.info(f"Email sent for {record['source_collection']}: {record['source_id']}")
+
+    async def _mark_failed_attempt(self, record: dict, error: str):
+        now = datetime.utcnow()
+        attempts = record["attempts"]
+
+        if attempts >= self.max_attempts:
+            update = {"status": FAILED, "updated_at": now, "last_error": error}
+            logger.error(
+                f"Email for {record['source_collection']} {record['source_id']} "
+                f"failed permanently after {attempts} attempts: {error}"
+            )
+        else:
+            delay = self.backoff_base * (2 ** (attempts - 1))
+            update = {
+                "status": PENDING,
+                "next_attempt_at": now + timedelta(seconds=delay),
+                "updated_at": now,
+                "last_error": error,
+            }
+            logger.warning(
+                f"Email send failed for {record['source_collection']} {record['source_id']} "
+                f"(attempt {attempts}/{self.max_attempts}), retrying in {delay:.0f}s: {error}"
+            )
+
+        await self.collection.update_one({"_id": record["_id"]}, {"$set": update})
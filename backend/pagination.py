@@ -0,0 +1,79 @@
+"""
+Keyset (cursor) Pagination Helpers
+Opaque cursors over a (sort field, _id) pair for constant-time page fetches
+"""
+import json
+import base64
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+def encode_cursor(value: Any, doc_id: ObjectId) -> str:
+    """Encode the sort key of the last document on a page as an opaque cursor"""
+    if isinstance(value, datetime):
+        value = {"$date": value.isoformat()}
+    raw = json.dumps({"v": value, "id": str(doc_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, ObjectId]:
+    """Decode a cursor produced by `encode_cursor`; raises ValueError if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value = data["v"]
+        if isinstance(value, dict):
+            # The only object a cursor carries is an encoded datetime; anything
+            # else would turn the keyset filter into an operator query
+            if set(value) != {"$date"}:
+                raise ValueError("unexpected object value")
+            value = datetime.fromisoformat(value["$date"])
+        elif isinstance(value, list):
+            raise ValueError("unexpected list value")
+        return value, ObjectId(data["id"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError(f"Invalid cursor: {str(e)}")
+
+
+def keyset_filter(sort_field: str, value: Any, doc_id: ObjectId) -> dict:
+    """
+    Filter selecting documents strictly after (value, doc_id) in a
+    descending (sort_field, _id) ordering.
+    """
+    if value is None:
+        # Documents without the sort field sort last; only the _id tie-break remains
+        return {sort_field: None, "_id": {"$lt": doc_id}}
+    return {
+        "$or": [
+            {sort_field: {"$lt": value}},
+            {sort_field: value, "_id": {"$lt": doc_id}},
+            # $lt never matches a missing field, yet those documents come after
+            {sort_field: None},
+        ]
+    }
+
+
+def apply_cursor(query: dict, sort_field: str, cursor: Optional[str]) -> dict:
+    """Combine a list query with the keyset filter for `cursor` (if any)"""
+    if not cursor:
+        return query
+    value, doc_id = decode_cursor(cursor)
+    keyset = keyset_filter(sort_field, value, doc_id)
+    return {"$and": [query, keyset]} if query else keyset
+
+
+def next_cursor(docs: list, limit: int, sort_field: str) -> Optional[str]:
+    """
+    Cursor for the page after `docs`.
+
+    Callers fetch `limit + 1` documents; the extra one only signals that more
+    pages exist and is dropped from `docs` in place.
+    """
+    if len(docs) <= limit:
+        return None
+    del docs[limit:]
+    last = docs[-1]
+    return encode_cursor(last.get(sort_field), last["_id"])
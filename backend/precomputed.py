@@ -0,0 +1,55 @@
+"""
+Precomputed Responses
+Payloads serialized once into bytes with a strong ETag, served with 304 support
+"""
+import hashlib
+from typing import Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from compression import identity_etag
+from serialization import dumps
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against an ETag (RFC 9110 13.1.2).
+
+    Tags of encoded representations (`"abc-gzip"`) match the identity ETag
+    they derive from, so a handler can compare against the tag it computed.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if identity_etag(candidate) == opaque:
+            return True
+    return False
+
+
+class PrecomputedJSON:
+    """
+    A JSON payload encoded once at startup.
+
+    Every request is answered from the same bytes; clients presenting the
+    current ETag get an empty 304.
+    """
+
+    def __init__(self, payload, max_age: int = 3600, etag: Optional[str] = None):
+        self.body = dumps(payload)
+        self.etag = etag or '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+        self.headers = {
+            "ETag": self.etag,
+            "Cache-Control": f"public, max-age={max_age}",
+        }
+
+    def response(self, request: Request) -> Response:
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=self.headers)
+        return Response(content=self.body, media_type="application/json", headers=self.headers)
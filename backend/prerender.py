@@ -0,0 +1,193 @@
+"""
+Prerendered Pages
+Static HTML snapshots of published blog posts and case studies for crawlers
+and link-preview bots, rendered when the document is written
+"""
+import os
+import json
+import logging
+from datetime import datetime
+from html import escape
+from typing import Callable, Dict, Optional
+from urllib.parse import urljoin
+
+from sitemap import DEFAULT_SITE_URL
+
+logger = logging.getLogger(__name__)
+
+SITE_NAME = "My Inbox Media®"
+DEFAULT_IMAGE = "/og-image-mim-global.jpg"
+
+# Bump when the markup changes so startup re-renders existing snapshots
+TEMPLATE_VERSION = 1
+
+
+def snapshot_version(updated_at: datetime) -> str:
+    """Version component of a snapshot key: the document's updated_at"""
+    return updated_at.strftime("%Y%m%d%H%M%S%f")
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ") if value else None
+
+
+def _page(site_url: str, path: str, title: str, description: str, image: Optional[str],
+          doc: dict, body: str, json_ld: dict) -> str:
+    url = site_url + path
+    image = urljoin(site_url + "/", image or DEFAULT_IMAGE)
+    meta = [
+        ("name", "description", description),
+        ("property", "og:type", "article"),
+        ("property", "og:site_name", SITE_NAME),
+        ("property", "og:url", url),
+        ("property", "og:title", title),
+        ("property", "og:description", description),
+        ("property", "og:image", image),
+        ("name", "twitter:card", "summary_large_image"),
+        ("name", "twitter:title", title),
+        ("name", "twitter:description", description),
+        ("name", "twitter:image", image),
+        ("property", "article:published_time", _iso(doc.get("created_at"))),
+        ("property", "article:modified_time", _iso(doc.get("updated_at"))),
+    ]
+    head = "\n".join(
+        f'<meta {attr}="{name}" content="{escape(value)}">' for attr, name, value in meta if value
+    )
+    # "</" inside JSON-LD would close the script element early
+    ld = json.dumps({"@context": "https://schema.org", **json_ld, "headline": title, "image": image,
+                     "url": url, "datePublished": _iso(doc.get("created_at")),
+                     "dateModified": _iso(doc.get("updated_at")),
+                     "publisher": {"@type": "Organization", "name": SITE_NAME, "url": site_url}},
+                    ensure_ascii=False).replace("</", "<\\/")
+    return (
+        "<!DOCTYPE html>\n"
+        '<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+        f"<title>{escape(title)} | {SITE_NAME}</title>\n"
+        f'<link rel="canonical" href="{escape(url)}">\n'
+        f"{head}\n"
+        f'<script type="application/ld+json">{ld}</script>\n'
+        "</head>\n<body>\n"
+        f'<header><a href="{escape(site_url)}/">{SITE_NAME}</a></header>\n'
+        f"<main>\n<article>\n<h1>{escape(title)}</h1>\n{body}\n</article>\n</main>\n"
+        "</body>\n</html>\n"
+    )
+
+
+def render_blog_post(post: dict, site_url: str) -> str:
+    description = post.get("excerpt") or post.get("teaser") or ""
+    byline = escape(post.get("author", ""))
+    if post.get("created_at"):
+        byline += f' · <time datetime="{_iso(post["created_at"])}">{post["created_at"]:%B %d, %Y}</time>'
+    tags = ", ".join(escape(tag) for tag in post.get("tags", []))
+    # Post content is admin-authored HTML, rendered as-is like BlogDetailPage does
+    body = (
+        f"<p>{byline}</p>\n"
+        f"<p>{escape(post.get('category', ''))}</p>\n"
+        f"{post.get('content', '')}\n"
+        + (f"<p>Tags: {tags}</p>" if tags else "")
+    )
+    json_ld = {"@type": "BlogPosting", "author": {"@type": "Person", "name": post.get("author", "")},
+               "articleSection": post.get("category"), "keywords": post.get("tags", []),
+               "description": description}
+    return _page(site_url, f"/blog/{post['slug']}", post["title"], description,
+                 post.get("featured_image"), post, body, json_ld)
+
+
+def render_case_study(study: dict, site_url: str) -> str:
+    description = study.get("teaser") or study.get("challenge", "")[:200]
+    sections = "\n".join(
+        f"<section>\n<h2>{heading}</h2>\n<p>{escape(study.get(field, ''))}</p>\n</section>"
+        for heading, field in (("The Challenge", "challenge"), ("Our Solution", "solution"), ("Results", "results"))
+    )
+    technologies = ", ".join(escape(tech) for tech in study.get("technologies", []))
+    body = (
+        f"<p>{escape(study.get('client_name', ''))} · {escape(study.get('industry', ''))}</p>\n"
+        f"{sections}\n"
+        + (f"<p>Technologies: {technologies}</p>" if technologies else "")
+    )
+    json_ld = {"@type": "Article", "about": study.get("client_name"), "description": description}
+    return _page(site_url, f"/case-studies/{study['slug']}", study["title"], description,
+                 study.get("featured_image") or study.get("client_logo"), study, body, json_ld)
+
+
+# Snapshot kind (the frontend path segment) -> source collection, renderer
+KINDS: Dict[str, tuple] = {
+    "blog": ("blog_posts", render_blog_post),
+    "case-studies": ("case_studies", render_case_study),
+}
+
+
+class Prerenderer:
+    """
+    Keeps one HTML snapshot per published document in `prerendered_pages`.
+
+    Snapshots are written by the admin handlers right after the document
+    (`_id` is the document's id, so a slug change replaces the old snapshot)
+    and carry the document's updated_at as their version. Serving a snapshot
+    never reads the source collection.
+    """
+
+    def __init__(self, db, site_url: Optional[str] = None, collection_name: str = "prerendered_pages"):
+        self.db = db
+        self.collection = db[collection_name]
+        self.site_url = (site_url or os.getenv("SITE_URL", DEFAULT_SITE_URL)).rstrip("/")
+        self.rendered = 0
+        self.removed = 0
+
+    def render(self, kind: str, doc: dict) -> str:
+        renderer: Callable[[dict, str], str] = KINDS[kind][1]
+        return renderer(doc, self.site_url)
+
+    def _snapshot(self, kind: str, doc: dict) -> dict:
+        return {
+            "kind": kind,
+            "slug": doc["slug"],
+            "version": snapshot_version(doc["updated_at"]),
+            "template": TEMPLATE_VERSION,
+            "updated_at": doc["updated_at"],
+            "html": self.render(kind, doc),
+        }
+
+    async def sync(self, kind: str, doc: dict):
+        """Write (or, for an unpublished document, drop) the snapshot of `doc`"""
+        if not doc.get("published"):
+            await self.remove(doc["_id"])
+            return
+        await self.collection.update_one(
+            {"_id": str(doc["_id"])}, {"$set": self._snapshot(kind, doc)}, upsert=True
+        )
+        self.rendered += 1
+
+    async def remove(self, doc_id):
+        result = await self.collection.delete_one({"_id": str(doc_id)})
+        self.removed += result.deleted_count
+
+    async def get(self, kind: str, slug: str) -> Optional[dict]:
+        return await self.collection.find_one(
+            {"kind": kind, "slug": slug}, {"_id": 0, "html": 1, "version": 1, "updated_at": 1}
+        )
+
+    async def backfill(self):
+        """Render snapshots missing or outdated for published documents (startup)"""
+        existing = {
+            doc["_id"]: (doc.get("version"), doc.get("template"))
+            async for doc in self.collection.find({}, {"version": 1, "template": 1})
+        }
+        seen = set()
+        count = 0
+        for kind, (collection, _) in KINDS.items():
+            async for doc in self.db[collection].find({"published": True}):
+                doc_id = str(doc["_id"])
+                seen.add(doc_id)
+                if existing.get(doc_id) != (snapshot_version(doc["updated_at"]), TEMPLATE_VERSION):
+                    await self.sync(kind, doc)
+                    count += 1
+        orphans = [doc_id for doc_id in existing if doc_id not in seen]
+        if orphans:
+            await self.collection.delete_many({"_id": {"$in": orphans}})
+        if count or orphans:
+            logger.info(f"Prerendered {count} page(s), removed {len(orphans)} stale snapshot(s)")
+
+    def stats(self) -> dict:
+        return {"rendered": self.rendered, "removed": self.removed}
@@ -0,0 +1,200 @@
+"""
+External Profile Refresher
+Scheduled, conditional refresh of the mimprofile.e-mim.in page, parsed off the
+event loop and persisted to MongoDB for /api/external/profile
+"""
+import os
+import random
+import asyncio
+import hashlib
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
+from urllib.parse import urljoin
+
+import httpx
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ID = "mimprofile"
+DEFAULT_URL = "https://mimprofile.e-mim.in"
+USER_AGENT = "Mozilla/5.0 (compatible; MyInboxMediaBot/1.0; +https://myinboxmedia.com)"
+
+# refresh() outcomes
+UPDATED = "updated"
+NOT_MODIFIED = "not_modified"
+UNCHANGED = "unchanged"
+FAILED = "failed"
+
+
+def parse_profile(html: str, base_url: str) -> dict:
+    """
+    Extract the public profile from the page HTML.
+
+    CPU-bound (BeautifulSoup), so the refresher runs it in a worker thread.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    description = soup.find("meta", attrs={"name": "description"})
+
+    headings = []
+    for tag in soup.find_all(["h2", "h3"]):
+        text = " ".join(tag.get_text(" ", strip=True).split())
+        if text and text not in headings:
+            headings.append(text)
+
+    logos = []
+    for img in soup.find_all("img", src=True):
+        marker = " ".join([img["src"], img.get("alt", ""), " ".join(img.get("class", []))]).lower()
+        if "client" in marker or "logo" in marker:
+            src = urljoin(base_url, img["src"])
+            if src not in logos:
+                logos.append(src)
+
+    return {
+        "title": soup.title.get_text(strip=True) if soup.title else None,
+        "description": description.get("content") if description else None,
+        "headings": headings,
+        "logo_urls": logos,
+    }
+
+
+class ProfileRefresher:
+    """
+    Keeps the latest parsed profile in the `external_profile` collection.
+
+    Every PROFILE_REFRESH_INTERVAL seconds (with jitter) the page is fetched
+    over a pooled keep-alive client, sending the stored ETag / Last-Modified
+    so an unchanged page costs a 304. Request handlers only ever read MongoDB;
+    a slow or failing upstream never reaches user latency.
+    """
+
+    def __init__(self, db, url: Optional[str] = None, interval: float = None,
+                 on_change: Optional[Callable[[], Awaitable[None]]] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None,
+                 collection_name: str = "external_profile"):
+        self.collection = db[collection_name]
+        self.url = url or os.getenv("PROFILE_URL", DEFAULT_URL)
+        if interval is None:
+            interval = float(os.getenv("PROFILE_REFRESH_INTERVAL", "3600"))
+        self.interval = interval
+        self.timeout = float(os.getenv("PROFILE_FETCH_TIMEOUT", "15"))
+        self.retry_seconds = float(os.getenv("PROFILE_RETRY_SECONDS", "60"))
+        self.on_change = on_change
+        self._transport = transport
+        self._http: Optional[httpx.AsyncClient] = None
+        self._runner: Optional[asyncio.Task] = None
+
+        self.last_status: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.counts = {UPDATED: 0, NOT_MODIFIED: 0, UNCHANGED: 0, FAILED: 0}
+
+    async def load(self) -> Optional[dict]:
+        """The stored profile, without fetch bookkeeping"""
+        return await self.collection.find_one(
+            {"_id": PROFILE_ID}, {"_id": 0, "etag": 0, "http_last_modified": 0, "content_hash": 0}
+        )
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                transport=self._transport,
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": USER_AGENT},
+                limits=httpx.Limits(max_connections=1, max_keepalive_connections=1),
+            )
+        return self._http
+
+    async def refresh(self) -> str:
+        """Fetch once; returns updated, not_modified, unchanged or failed"""
+        status = await self._refresh()
+        self.last_status = status
+        self.counts[status] += 1
+        return status
+
+    async def _refresh(self) -> str:
+        stored = await self.collection.find_one(
+            {"_id": PROFILE_ID}, {"etag": 1, "http_last_modified": 1, "content_hash": 1}
+        ) or {}
+        headers = {}
+        if stored.get("etag"):
+            headers["If-None-Match"] = stored["etag"]
+        if stored.get("http_last_modified"):
+            headers["If-Modified-Since"] = stored["http_last_modified"]
+
+        now = datetime.utcnow()
+        try:
+            response = await self._client().get(self.url, headers=headers)
+            if response.status_code == 304:
+                await self.collection.update_one({"_id": PROFILE_ID}, {"$set": {"checked_at": now}})
+                return NOT_MODIFIED
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            self.last_error = f"{type(e).__name__}: {str(e)}"
+            logger.warning(f"Profile refresh from {self.url} failed: {self.last_error}")
+            return FAILED
+
+        self.last_error = None
+        validators = {
+            "etag": response.headers.get("etag"),
+            "http_last_modified": response.headers.get("last-modified"),
+            "checked_at": now,
+        }
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        if content_hash == stored.get("content_hash"):
+            # Origin without validators (or a changed ETag on identical bytes)
+            await self.collection.update_one({"_id": PROFILE_ID}, {"$set": validators})
+            return UNCHANGED
+
+        loop = asyncio.get_running_loop()
+        profile = await loop.run_in_executor(None, parse_profile, response.text, str(response.url))
+        await self.collection.update_one(
+            {"_id": PROFILE_ID},
+            {"$set": {**profile, **validators, "source_url": str(response.url),
+                      "content_hash": content_hash, "fetched_at": now}},
+            upsert=True,
+        )
+        logger.info(f"External profile updated from {response.url}")
+        if self.on_change is not None:
+            await self.on_change()
+        return UPDATED
+
+    async def _run(self):
+        while True:
+            try:
+                status = await self.refresh()
+            except Exception as e:
+                # e.g. MongoDB unavailable - keep the schedule alive
+                status = FAILED
+                self.last_error = str(e)
+                logger.error(f"Profile refresh error: {str(e)}")
+            delay = self.retry_seconds if status == FAILED else self.interval
+            await asyncio.sleep(delay * random.uniform(0.9, 1.1))
+
+    async def start(self):
+        """Start the refresh schedule; the first fetch happens in the background"""
+        if self._runner is None and self.interval > 0:
+            self._runner = asyncio.create_task(self._run())
+            logger.info(f"Profile refresher started for {self.url} (every {self.interval:.0f}s)")
+
+    async def stop(self):
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def stats(self) -> dict:
+        return {
+            "url": self.url,
+            "interval_seconds": self.interval,
+            "last_status": self.last_status,
+            "last_error": self.last_error,
+            "refreshes": dict(self.counts),
+        }
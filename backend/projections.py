@@ -0,0 +1,111 @@
+"""
+Sparse Fieldsets
+`view=summary|full` and `fields=a,b,c` projections shared by the list endpoints
+"""
+import logging
+from typing import Dict, Optional, Tuple
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+TEASER_LENGTH = 160
+
+
+class FieldSet:
+    """Projections available on one collection's list endpoint"""
+
+    def __init__(self, full: Tuple[str, ...], summary: Tuple[str, ...],
+                 teaser_source: str, always: Tuple[str, ...] = ()):
+        self.full = full
+        self.summary = summary
+        self.teaser_source = teaser_source
+        # Fields the handler itself needs (e.g. the keyset pagination sort key)
+        self.always = always
+        self.allowed = frozenset(full) | frozenset(summary)
+
+    def projection(self, view: str = "full", fields: Optional[str] = None) -> Dict[str, int]:
+        """
+        Mongo projection for a request; raises ValueError on unknown fields.
+
+        An explicit `fields` list takes precedence over `view`.
+        """
+        if fields:
+            requested = [f.strip() for f in fields.split(",") if f.strip()]
+            unknown = [f for f in requested if f not in self.allowed]
+            if unknown:
+                raise ValueError(
+                    f"Unknown field(s): {', '.join(unknown)}. "
+                    f"Allowed: {', '.join(sorted(self.allowed))}"
+                )
+        else:
+            requested = self.summary if view == "summary" else self.full
+
+        projection = {"_id": 1}
+        for field in (*requested, *self.always):
+            projection[field] = 1
+        return projection
+
+
+LIST_FIELDS: Dict[str, FieldSet] = {
+    "blog_posts": FieldSet(
+        full=("title", "slug", "excerpt", "author", "featured_image", "category", "tags",
+              "published", "views", "created_at", "updated_at"),
+        summary=("title", "slug", "teaser", "author", "featured_image", "category", "created_at"),
+        teaser_source="excerpt",
+        always=("created_at",),
+    ),
+    "case_studies": FieldSet(
+        full=("title", "slug", "client_name", "client_logo", "industry", "challenge", "solution",
+              "results", "technologies", "featured_image", "gallery_images", "published",
+              "created_at", "updated_at"),
+        summary=("title", "slug", "client_name", "client_logo", "industry", "teaser",
+                 "featured_image", "created_at"),
+        teaser_source="challenge",
+    ),
+    "testimonials": FieldSet(
+        full=("client_name", "client_position", "client_company", "client_image",
+              "testimonial_text", "rating", "featured", "published", "created_at"),
+        summary=("client_name", "client_position", "client_company", "client_image",
+                 "teaser", "rating", "featured"),
+        teaser_source="testimonial_text",
+    ),
+}
+
+
+def make_teaser(text: Optional[str], length: int = TEASER_LENGTH) -> str:
+    """Whitespace-normalised text cut at a word boundary to at most `length` chars"""
+    if not text:
+        return ""
+    text = " ".join(text.split())
+    if len(text) <= length:
+        return text
+    # A word ending right at the limit (leaving room for the ellipsis) is kept
+    cut = text[:length].rsplit(" ", 1)[0][:length - 1].rstrip(",.;:-")
+    return cut + "…"
+
+
+def with_teaser(collection_name: str, doc: dict) -> dict:
+    """Set `teaser` on a document being written if its source field is present"""
+    source = LIST_FIELDS[collection_name].teaser_source
+    if source in doc:
+        doc["teaser"] = make_teaser(doc[source])
+    return doc
+
+
+async def backfill_teasers(db) -> int:
+    """Compute `teaser` for documents written before teasers existed"""
+    updated = 0
+    for collection_name, field_set in LIST_FIELDS.items():
+        source = field_set.teaser_source
+        cursor = db[collection_name].find({"teaser": {"$exists": False}}, {source: 1})
+        operations = [
+            UpdateOne({"_id": doc["_id"]}, {"$set": {"teaser": make_teaser(doc.get(source))}})
+            async for doc in cursor
+        ]
+        if operations:
+            await db[collection_name].bulk_write(operations, ordered=False)
+            updated += len(operations)
+    if updated:
+        logger.info(f"Backfilled teasers on {updated} document(s)")
+    return updated
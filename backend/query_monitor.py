@@ -0,0 +1,182 @@
+"""
+Query Monitor
+Slow MongoDB command log, per-request command counts and declared query budgets
+"""
+import os
+import logging
+import threading
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+REDACTED = "?"
+
+# Parts of each command that describe its shape; everything else is ignored
+SHAPE_FIELDS = {
+    "find": ("filter", "sort", "projection"),
+    "aggregate": ("pipeline",),
+    "count": ("query",),
+    "distinct": ("key", "query"),
+    "findAndModify": ("query", "sort", "update"),
+    "update": ("updates",),
+    "delete": ("deletes",),
+    "insert": (),
+    "getMore": (),
+}
+
+# Commands sent per request are counted; driver housekeeping is not
+IGNORED_COMMANDS = frozenset({
+    "hello", "ismaster", "isMaster", "ping", "saslStart", "saslContinue", "endSessions", "killCursors",
+})
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """A route issued more MongoDB commands than its declared budget"""
+
+
+def redact(value: Any) -> Any:
+    """Replace every literal in a filter with `?`, keeping field names and operators"""
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if any(isinstance(item, dict) for item in value):
+            return [redact(item) for item in value]
+        return [REDACTED] if value else []
+    return REDACTED
+
+
+def command_shape(command_name: str, command: dict) -> dict:
+    """Collection plus the redacted filter/sort/pipeline of a command"""
+    shape = {"collection": command.get(command_name)}
+    for field in SHAPE_FIELDS.get(command_name, ()):
+        if field in command:
+            # `key` (distinct) and sort directions are structure, not data
+            shape[field] = command[field] if field in ("key", "sort") else redact(command[field])
+    return shape
+
+
+class RequestQueries:
+    """Commands issued while handling one request"""
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.commands = 0
+        self._lock = threading.Lock()
+
+    @property
+    def route(self) -> str:
+        route = getattr(self.scope.get("route"), "path", None) or "unmatched"
+        return f"{self.scope['method']} {route}"
+
+    def add(self):
+        with self._lock:
+            self.commands += 1
+
+
+_current_queries: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+class QueryMonitor(monitoring.CommandListener):
+    """
+    pymongo command listener logging slow commands and enforcing query budgets.
+
+    `budgets` maps `"METHOD /route/{template}"` to the most commands a request
+    to that route may issue. Overruns are logged and kept in `violations`;
+    with `strict` they raise QueryBudgetExceeded once the request finishes, so
+    a test client surfaces them as failures.
+    """
+
+    def __init__(self, slow_ms: float = None, budgets: Dict[str, int] = None, strict: bool = None):
+        if slow_ms is None:
+            slow_ms = float(os.getenv("SLOW_QUERY_MS", "100"))
+        if strict is None:
+            strict = os.getenv("QUERY_BUDGET_STRICT", "false").lower() == "true"
+        self.slow_seconds = slow_ms / 1000
+        self.budgets = dict(budgets or {})
+        self.strict = strict
+        # (connection, request id) -> (started command, originating request)
+        self._in_flight: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+        self.slow_queries = 0
+        self.violations = deque(maxlen=100)
+
+    # ---- pymongo listener ----
+
+    def started(self, event):
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        queries = _current_queries.get()
+        if queries is not None:
+            queries.add()
+        with self._lock:
+            self._in_flight[(event.connection_id, event.request_id)] = (event.command, queries)
+
+    def succeeded(self, event):
+        self._finished(event, "ok")
+
+    def failed(self, event):
+        self._finished(event, "error")
+
+    def _finished(self, event, outcome: str):
+        with self._lock:
+            started = self._in_flight.pop((event.connection_id, event.request_id), None)
+        if started is None:
+            return
+        seconds = event.duration_micros / 1_000_000
+        if seconds < self.slow_seconds:
+            return
+
+        command, queries = started
+        self.slow_queries += 1
+        route = queries.route if queries is not None else "background"
+        logger.warning(
+            f"Slow MongoDB {event.command_name} ({outcome}) took {seconds * 1000:.1f} ms "
+            f"on {route}: {command_shape(event.command_name, command)}"
+        )
+
+    # ---- budgets ----
+
+    def check_budget(self, queries: RequestQueries):
+        budget = self.budgets.get(queries.route)
+        if budget is None or queries.commands <= budget:
+            return
+        message = (
+            f"{queries.route} issued {queries.commands} MongoDB commands "
+            f"(budget {budget})"
+        )
+        self.violations.append({"route": queries.route, "commands": queries.commands, "budget": budget})
+        logger.warning(f"Query budget exceeded: {message}")
+        if self.strict:
+            raise QueryBudgetExceeded(message)
+
+    def stats(self) -> dict:
+        return {
+            "slow_ms": self.slow_seconds * 1000,
+            "slow_queries": self.slow_queries,
+            "budget_violations": list(self.violations),
+        }
+
+
+class QueryMonitorMiddleware:
+    """ASGI middleware scoping MongoDB command counts to each HTTP request"""
+
+    def __init__(self, app, monitor: QueryMonitor):
+        self.app = app
+        self.monitor = monitor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(scope)
+        token = _current_queries.set(queries)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_queries.reset(token)
+        self.monitor.check_budget(queries)
@@ -0,0 +1,158 @@
+"""
+Response Cache
+Read-through cache of encoded JSON responses for public content endpoints
+"""
+import os
+import time
+import logging
+from collections import OrderedDict
+from typing import Optional
+from urllib.parse import urlencode
+
+logger = logging.getLogger(__name__)
+
+
+# ============= BACKENDS =============
+
+class MemoryBackend:
+    """In-process LRU with per-entry TTL"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete_prefix(self, prefix: str):
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            del self._entries[key]
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """
+    Shared cache on a Redis-compatible server, so invalidation reaches every worker.
+
+    `client` only needs the async `get`, `set(..., ex=)`, `scan_iter(match=)`
+    and `delete` methods of redis-py's `redis.asyncio.Redis`.
+    """
+
+    def __init__(self, client, namespace: str = "mim:cache:"):
+        self.client = client
+        self.namespace = namespace
+        self.evictions = 0  # evictions happen server-side
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the 'redis' package")
+        return cls(redis_asyncio.from_url(url))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.namespace + key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self.client.set(self.namespace + key, value, ex=max(1, int(ttl)))
+
+    async def delete_prefix(self, prefix: str):
+        keys = [k async for k in self.client.scan_iter(match=self.namespace + prefix + "*")]
+        if keys:
+            await self.client.delete(*keys)
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+# ============= CACHE =============
+
+class ResponseCache:
+    """
+    Encoded responses keyed on namespace + route + query parameters.
+
+    The namespace is the MongoDB collection behind the route, so a write to
+    that collection invalidates every cached page derived from it.
+    """
+
+    def __init__(self, backend, ttl: float = 300):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @staticmethod
+    def key(namespace: str, route: str, **params) -> str:
+        query = urlencode(sorted((k, v) for k, v in params.items() if v is not None))
+        return f"{namespace}:{route}?{query}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            # A cache outage must never fail the request
+            self.errors += 1
+            logger.error(f"Response cache get failed: {str(e)}")
+            value = None
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes):
+        try:
+            await self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Response cache set failed: {str(e)}")
+
+    async def invalidate(self, namespace: str):
+        try:
+            await self.backend.delete_prefix(namespace + ":")
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Response cache invalidation failed for {namespace}: {str(e)}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "errors": self.errors,
+            "evictions": self.backend.evictions,
+            "entries": self.backend.size(),
+        }
+
+
+def create_response_cache() -> ResponseCache:
+    """Build the cache configured by RESPONSE_CACHE_* environment variables"""
+    ttl = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+    if os.getenv("RESPONSE_CACHE_BACKEND", "memory") == "redis":
+        backend = RedisBackend.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    else:
+        backend = MemoryBackend(int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512")))
+    return ResponseCache(backend, ttl=ttl)
@@ -0,0 +1,461 @@
+"""
+Site Search
+In-process BM25 inverted index over published blog posts and case studies,
+queried on its own thread, updated by the admin handlers and re-synced from
+MongoDB in the background
+"""
+import os
+import re
+import math
+import heapq
+import asyncio
+import logging
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[^\W_]+")
+TAG_RE = re.compile(r"<[^>]+>")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how in is it its of on or our that the this to was "
+    "we were what when which who why will with you your".split()
+)
+
+# Weighted fields per kind; a term's frequency counts `weight` times per occurrence
+FIELD_WEIGHTS = {
+    "blog": {"title": 3.0, "tags": 2.0, "category": 1.5, "excerpt": 1.5, "content": 1.0},
+    "case-studies": {"title": 3.0, "technologies": 2.0, "industry": 1.5, "client_name": 1.5,
+                     "challenge": 1.0, "solution": 1.0, "results": 1.0},
+}
+SOURCES = {"blog": "blog_posts", "case-studies": "case_studies"}
+
+# Returned with each hit, so a search never reads the source collections
+RESULT_FIELDS = {
+    "blog": ("title", "slug", "excerpt", "category", "featured_image", "created_at"),
+    "case-studies": ("title", "slug", "teaser", "client_name", "industry", "featured_image", "created_at"),
+}
+
+
+def normalize(token: str) -> str:
+    """Lowercase with a light plural strip, applied alike to documents and queries"""
+    token = token.lower()
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        token = token[:-1]
+    return token
+
+
+def term_for(token: str) -> Optional[str]:
+    """Indexed term for a raw token; None for stopwords and single characters"""
+    if len(token) < 2 or token.lower() in STOPWORDS:
+        return None
+    return normalize(token)
+
+
+def tokenize(text: str, term=term_for) -> List[str]:
+    terms = (term(token) for token in TOKEN_RE.findall(TAG_RE.sub(" ", text)))
+    return [term for term in terms if term is not None]
+
+
+def analyze(kind: str, doc: dict, term=term_for) -> Tuple[Counter, float]:
+    """
+    Weighted term frequencies and weighted length of a document.
+
+    Frequencies are in half occurrences (every field weight is a multiple of
+    0.5), so postings can store them as unsigned shorts.
+    """
+    frequencies: Counter = Counter()
+    for field, weight in FIELD_WEIGHTS[kind].items():
+        value = doc.get(field)
+        if not value:
+            continue
+        text = " ".join(value) if isinstance(value, list) else str(value)
+        units = int(weight * 2)
+        for token in tokenize(text, term):
+            frequencies[token] += units
+    return frequencies, sum(frequencies.values()) / 2
+
+
+_MISSING = object()
+
+# Remapped ordinal of a document dropped by compaction
+_DROPPED = 0xFFFFFFFF
+
+
+class SearchIndex:
+    """
+    BM25 inverted index.
+
+    Postings are parallel arrays (document ordinal, weighted term frequency)
+    per term. An update appends a new ordinal and tombstones the old one;
+    tombstones are skipped at query time until `compact()` renumbers the
+    live documents and rewrites the postings, a few terms at a time. Not
+    thread-safe: SiteSearch runs every call on one thread.
+    """
+
+    k1 = 1.2
+    b = 0.75
+    # Raw token -> term lookups remembered per index; new tokens past this are not cached
+    term_cache_size = 200000
+
+    def __init__(self):
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._lengths = array("f")
+        self._docs: List[Optional[dict]] = []
+        self._ordinals: Dict[str, int] = {}
+        self._total_length = 0.0
+        self._norms: Optional[array] = None
+        self._terms: Dict[str, Optional[str]] = {}
+        # While compacting: old ordinal -> new ordinal, the terms not rewritten
+        # yet and the order the sweep visits them in
+        self._remap: Optional[array] = None
+        self._stale: set = set()
+        self._sweep: List[str] = []
+        self.postings = 0
+        self.tombstones = 0
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def _term(self, token: str) -> Optional[str]:
+        term = self._terms.get(token, _MISSING)
+        if term is _MISSING:
+            term = term_for(token)
+            if len(self._terms) < self.term_cache_size:
+                self._terms[token] = term
+        return term
+
+    def add(self, kind: str, doc: dict):
+        """Index (or re-index) `doc`; unpublished documents are removed"""
+        doc_id = str(doc["_id"])
+        self.remove(doc_id)
+        if not doc.get("published"):
+            return
+
+        frequencies, length = analyze(kind, doc, self._term)
+        ordinal = len(self._docs)
+        result = {field: doc.get(field) for field in RESULT_FIELDS[kind]}
+        result.update(id=doc_id, kind=kind)
+        self._docs.append(result)
+        self._lengths.append(length)
+        self._ordinals[doc_id] = ordinal
+        self._total_length += length
+        self._norms = None
+        for term, frequency in frequencies.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("I"), array("H"))
+            elif term in self._stale:
+                postings = self._rewrite(term)
+            postings[0].append(ordinal)
+            postings[1].append(min(frequency, 65535))
+        self.postings += len(frequencies)
+
+    def remove(self, doc_id: str):
+        ordinal = self._ordinals.pop(str(doc_id), None)
+        if ordinal is None:
+            return
+        self._docs[ordinal] = None
+        self._total_length -= self._lengths[ordinal]
+        self._norms = None
+        self.tombstones += 1
+
+    def ids(self, kind: str) -> List[str]:
+        docs = self._docs
+        return [doc_id for doc_id, ordinal in self._ordinals.items()
+                if docs[ordinal] is not None and docs[ordinal]["kind"] == kind]
+
+    def needs_compaction(self) -> bool:
+        return bool(self._stale) or self.tombstones > max(1000, len(self._ordinals) // 4)
+
+    def _renumber(self):
+        """Drop tombstones from the documents; postings are rewritten term by term"""
+        remap = array("I", [_DROPPED]) * len(self._docs)
+        docs, lengths = [], array("f")
+        for ordinal, doc in enumerate(self._docs):
+            if doc is not None:
+                remap[ordinal] = len(docs)
+                self._ordinals[doc["id"]] = len(docs)
+                docs.append(doc)
+                lengths.append(self._lengths[ordinal])
+        self._docs, self._lengths, self._remap = docs, lengths, remap
+        self._sweep = list(self._postings)
+        self._stale = set(self._sweep)
+        self._norms = None
+        self.tombstones = 0
+
+    def _rewrite(self, term: str) -> Tuple[array, array]:
+        """Move a stale term's postings to the new ordinals"""
+        self._stale.discard(term)
+        old_ordinals, old_frequencies = self._postings[term]
+        remap = self._remap
+        kept = [i for i, ordinal in enumerate(old_ordinals) if remap[ordinal] != _DROPPED]
+        ordinals = array("I", [remap[old_ordinals[i]] for i in kept])
+        frequencies = array("H", [old_frequencies[i] for i in kept])
+        self.postings -= len(old_ordinals) - len(ordinals)
+        if not ordinals:
+            del self._postings[term]
+        else:
+            self._postings[term] = (ordinals, frequencies)
+        return ordinals, frequencies
+
+    def compact(self, budget: Optional[int] = None) -> bool:
+        """
+        Renumber the live documents, then rewrite the postings of terms
+        holding up to `budget` postings per call (all of them if None).
+        True once every term is rewritten; terms a search or update touches
+        in between are rewritten first.
+        """
+        if self._remap is None:
+            if not self.tombstones:
+                return True
+            self._renumber()
+        swept = 0
+        while self._sweep and (budget is None or swept < budget):
+            term = self._sweep.pop()
+            if term in self._stale:
+                swept += len(self._postings[term][0])
+                self._rewrite(term)
+        if self._sweep:
+            return False
+        self._remap = None
+        return True
+
+    def search(self, query: str, kind: Optional[str] = None, offset: int = 0,
+               limit: int = 10) -> Tuple[int, List[Tuple[float, dict]]]:
+        """(total matches, [(score, result)]) for the requested page, best first"""
+        terms = set(tokenize(query, self._term))
+        live = len(self._ordinals)
+        if not terms or not live:
+            return 0, []
+
+        if self._norms is None:
+            # BM25 length normalization per document (in half occurrences, like
+            # the frequencies), reused until the next write
+            k1, b = self.k1, self.b
+            average_length = self._total_length / live or 1.0
+            self._norms = array("f", (2 * k1 * (1 - b + b * length / average_length) for length in self._lengths))
+        norms, docs, boost = self._norms, self._docs, self.k1 + 1
+
+        weighted = []
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None and term in self._stale:
+                postings = self._rewrite(term)
+            if postings is not None and postings[0]:
+                # Tombstoned postings still count towards df until compaction; cap it
+                # so idf stays positive
+                df = min(len(postings[0]), live)
+                weighted.append((math.log(1 + (live - df + 0.5) / (df + 0.5)) * boost, postings))
+
+        if len(weighted) == 1:
+            # One term: no per-document accumulation needed
+            weight, (ordinals, frequencies) = weighted[0]
+            scores = ((weight * frequency / (frequency + norms[ordinal]), ordinal)
+                      for ordinal, frequency in zip(ordinals, frequencies))
+            matches = [(score, ordinal) for score, ordinal in scores
+                       if docs[ordinal] is not None and (kind is None or docs[ordinal]["kind"] == kind)]
+        else:
+            accumulated: Dict[int, float] = {}
+            get = accumulated.get
+            for weight, (ordinals, frequencies) in weighted:
+                for ordinal, frequency in zip(ordinals, frequencies):
+                    accumulated[ordinal] = get(ordinal, 0.0) + weight * frequency / (frequency + norms[ordinal])
+            matches = [
+                (score, ordinal) for ordinal, score in accumulated.items()
+                if docs[ordinal] is not None and (kind is None or docs[ordinal]["kind"] == kind)
+            ]
+        top = heapq.nlargest(offset + limit, matches)[offset:]
+        return len(matches), [(round(score, 4), docs[ordinal]) for score, ordinal in top]
+
+    def stats(self) -> dict:
+        return {
+            "documents": len(self._ordinals),
+            "slots": len(self._docs),
+            "terms": len(self._postings),
+            "postings": self.postings,
+            "tombstones": self.tombstones,
+        }
+
+
+# Unchanged documents at the watermark are skipped via their indexed version
+_UNINDEXED = object()
+
+# Sync windows reach back this far, so clock skew between workers can't hide a write
+SYNC_OVERLAP = timedelta(minutes=5)
+
+# Postings swept per compaction step; searches run between steps
+COMPACT_BUDGET = 50000
+
+
+class SiteSearch:
+    """
+    The SearchIndex of this worker, loaded from MongoDB at startup.
+
+    Every index call (loading, updates, queries, compaction) runs on one
+    dedicated thread, so scoring never blocks the event loop and the index
+    needs no locks. The admin handlers update it directly and record hard
+    deletes in `search_deletions`. Every SEARCH_SYNC_INTERVAL seconds each
+    worker re-reads documents whose updated_at moved (edits, unpublishing)
+    and deletions recorded since its last sync, so writes handled by other
+    workers show up too; `on_sync` is awaited when a sync changed the index.
+    """
+
+    def __init__(self, db, sync_interval: float = None, deletions_collection: str = "search_deletions",
+                 on_sync=None):
+        self.db = db
+        self.on_sync = on_sync
+        self.deletions = db[deletions_collection]
+        if sync_interval is None:
+            sync_interval = float(os.getenv("SEARCH_SYNC_INTERVAL", "60"))
+        self.sync_interval = sync_interval
+        self.index = SearchIndex()
+        self.ready = False
+        self.generation = 0
+        self.syncs = 0
+        self.queries = 0
+        self.compactions = 0
+        self._watermark: Optional[datetime] = None
+        self._deletions_since: Optional[datetime] = None
+        self._versions: Dict[str, Optional[datetime]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+        self._compacting: Optional[asyncio.Task] = None
+
+    async def _call(self, fn, *args):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _projection(self, kind: str) -> dict:
+        fields = {"published", "updated_at", *FIELD_WEIGHTS[kind], *RESULT_FIELDS[kind]}
+        return {field: 1 for field in fields}
+
+    def _add_all(self, kind: str, docs: List[dict]):
+        for doc in docs:
+            self.index.add(kind, doc)
+
+    def _remove_all(self, doc_ids: List[str]):
+        for doc_id in doc_ids:
+            self.index.remove(doc_id)
+
+    async def _index(self, kind: str, docs: List[dict]):
+        # A sync re-reads documents at the watermark; skip what is already indexed
+        docs = [doc for doc in docs if self._versions.get(str(doc["_id"]), _UNINDEXED) != doc.get("updated_at")]
+        if not docs:
+            return
+        await self._call(self._add_all, kind, docs)
+        for doc in docs:
+            updated_at = doc.get("updated_at")
+            self._versions[str(doc["_id"])] = updated_at
+            if updated_at is not None and (self._watermark is None or updated_at > self._watermark):
+                self._watermark = updated_at
+        self._changed()
+
+    async def _discard(self, doc_ids: List[str]):
+        doc_ids = [doc_id for doc_id in doc_ids if self._versions.pop(doc_id, _UNINDEXED) is not _UNINDEXED]
+        if doc_ids:
+            await self._call(self._remove_all, doc_ids)
+            self._changed()
+
+    def _changed(self):
+        self.generation += 1
+        if self._compacting is None and self.index.needs_compaction():
+            self._compacting = asyncio.create_task(self._compact())
+
+    async def _load(self, kind: str, query: dict):
+        cursor = self.db[SOURCES[kind]].find(query, self._projection(kind))
+        batch = []
+        async for doc in cursor:
+            batch.append(doc)
+            if len(batch) == 500:
+                await self._index(kind, batch)
+                batch = []
+        await self._index(kind, batch)
+
+    async def load(self):
+        self._deletions_since = datetime.utcnow()
+        for kind in SOURCES:
+            await self._load(kind, {"published": True})
+        self.ready = True
+        logger.info(f"Search index loaded: {self.index.stats()}")
+
+    async def sync(self):
+        """Pick up writes made through other workers"""
+        started, generation = datetime.utcnow(), self.generation
+        changed = {"updated_at": {"$gte": self._watermark - SYNC_OVERLAP}} if self._watermark else {}
+        for kind in SOURCES:
+            await self._load(kind, changed)
+        deleted = self.deletions.find({"deleted_at": {"$gte": self._deletions_since - SYNC_OVERLAP}}, {"_id": 1})
+        await self._discard([record["_id"] async for record in deleted])
+        self._deletions_since = started
+        self.syncs += 1
+        if self.generation != generation and self.on_sync is not None:
+            await self.on_sync()
+
+    async def update(self, kind: str, doc: dict):
+        """Index a created or updated document (unpublished ones are dropped)"""
+        self._versions.pop(str(doc["_id"]), None)
+        await self._index(kind, [doc])
+
+    async def remove(self, doc_id):
+        """Drop a deleted document, and record the deletion for the other workers"""
+        await self._discard([str(doc_id)])
+        await self.deletions.update_one(
+            {"_id": str(doc_id)}, {"$set": {"deleted_at": datetime.utcnow()}}, upsert=True
+        )
+
+    async def search(self, query: str, kind: Optional[str] = None, offset: int = 0, limit: int = 10):
+        self.queries += 1
+        return await self._call(self.index.search, query, kind, offset, limit)
+
+    async def _compact(self):
+        try:
+            while not await self._call(self.index.compact, COMPACT_BUDGET):
+                pass
+            self.compactions += 1
+        except Exception as e:
+            logger.error(f"Search index compaction failed: {str(e)}")
+        finally:
+            self._compacting = None
+
+    async def _run(self):
+        try:
+            await self.load()
+        except Exception as e:
+            logger.error(f"Search index load failed: {str(e)}")
+        while self.sync_interval > 0:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                if self.ready:
+                    await self.sync()
+                else:
+                    await self.load()
+            except Exception as e:
+                logger.error(f"Search index sync failed: {str(e)}")
+
+    async def start(self):
+        """Load in the background; searches answer 503 until the index is ready"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        for task in (self._task, self._compacting):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._compacting = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {"ready": self.ready, "syncs": self.syncs, "queries": self.queries,
+                "compactions": self.compactions, "generation": self.generation, **self.index.stats()}
@@ -2,44 +2,152 @@
 My Inbox Media® - Complete Backend API Server
 Multi-page corporate website with admin panel
 """
-from fastapi import FastAPI, APIRouter, HTTPException, status, Depends, Query
+from fastapi import FastAPI, APIRouter, HTTPException, status, Depends, Query, Request, Response
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import gzip
+import orjson
+import asyncio
 import logging
 from pathlib import Path
 from typing import List, Optional
 from datetime import datetime, timedelta
-import requests
-from bs4 import BeautifulSoup
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 # Import local modules
 from models import (
     BlogPost, BlogPostCreate, BlogPostUpdate,
     Testimonial, TestimonialCreate, TestimonialUpdate,
     CaseStudy, CaseStudyCreate, CaseStudyUpdate,
-    ContactMessage, serialize_doc,
+    ContactMessage,
     AdminUser, AdminUserCreate
 )
 from auth import (
     Token, UserLogin, UserInDB,
-    verify_password, get_password_hash, create_access_token,
-    get_current_user
+    create_access_token, get_current_user,
+    password_hasher, HasherBusy, token_cache
 )
+from outbox import EmailOutbox
+from view_counter import ViewCounter
+from indexes import ensure_indexes
+from pagination import apply_cursor, next_cursor
+from counts import CountCache
+from serialization import FastJSONResponse, dumps, prepare_doc
+from projections import LIST_FIELDS, with_teaser, backfill_teasers
+from response_cache import create_response_cache
+from metrics import RequestMetrics, MetricsMiddleware, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from query_monitor import QueryMonitor, QueryMonitorMiddleware
+from http_cache import CachePolicy, HttpCache, SurrogatePurger, etag_for, http_date
+from compression import Compressor, CompressionMiddleware, encoded_etag, parse_accept_encoding
+from logo_pipeline import OUTPUT_DIR as LOGO_OUTPUT_DIR, MANIFEST_NAME as LOGO_MANIFEST_NAME
+from logo_pipeline import load_logo_manifest, enrich_clients
+from catalog import CatalogStore
+from profile_refresher import ProfileRefresher
+from health import HealthMonitor, PoolStats
+from sitemap import Sitemap
+from prerender import Prerenderer
+from search import SiteSearch
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Request latency, status and MongoDB timing metrics
+request_metrics = RequestMetrics()
+
+# Most MongoDB commands one request to each route may issue (cache misses included)
+QUERY_BUDGETS = {
+    "GET /api/blog": 2,                       # page + total
+    "GET /api/batch/blog": 1,                 # one $in query for the uncached slugs
+    "GET /api/blog/{slug}": 1,
+    "GET /api/testimonials": 1,
+    "GET /api/case-studies": 1,
+    "GET /api/batch/case-studies": 1,
+    "GET /api/case-studies/{slug}": 1,
+    "GET /api/external/profile": 1,
+    "GET /api/sitemap.xml": 0,                # built in the background
+    "GET /api/sitemaps/{name}.xml": 0,
+    "GET /api/prerender/{kind}/{slug}": 1,
+    "GET /api/pages/home": 2,                 # featured testimonials + latest posts
+    "GET /api/search": 0,                     # answered from the in-process index
+    "POST /api/contact": 2,                   # contact + outbox record
+    "POST /api/book-meeting": 2,              # meeting request + outbox record
+    "POST /api/auth/login": 1,
+    "POST /api/auth/register": 2,
+    "GET /api/auth/me": 1,
+    "GET /api/admin/contacts": 2,
+    "POST /api/admin/blog": 2,                # + prerendered snapshot
+    "PUT /api/admin/blog/{post_id}": 2,
+    "DELETE /api/admin/blog/{post_id}": 3,
+    "POST /api/admin/testimonials": 1,
+    "PUT /api/admin/testimonials/{testimonial_id}": 1,
+    "DELETE /api/admin/testimonials/{testimonial_id}": 1,
+    "POST /api/admin/case-studies": 2,
+    "PUT /api/admin/case-studies/{case_study_id}": 2,
+    "DELETE /api/admin/case-studies/{case_study_id}": 3,
+    "PATCH /api/admin/contacts/{contact_id}/status": 1,
+}
+
+# Slow query log and query budget enforcement
+query_monitor = QueryMonitor(budgets=QUERY_BUDGETS)
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+pool_stats = PoolStats()
+client = AsyncIOMotorClient(mongo_url, event_listeners=[request_metrics.mongo_listener, query_monitor, pool_stats])
 db_name = os.environ['DB_NAME']
 db = client[db_name]
 
+# Cached MongoDB ping, event-loop lag and pool state behind the probes
+health_monitor = HealthMonitor(db, pool_stats)
+
+# Background email delivery (contact form & meeting notifications)
+email_outbox = EmailOutbox(db)
+
+# Buffered blog view counts, flushed to MongoDB in batches
+blog_view_counter = ViewCounter(db.blog_posts)
+
+# Cached list totals, invalidated by the write endpoints
+count_cache = CountCache()
+
+# Encoded public content responses, invalidated by the admin write endpoints
+response_cache = create_response_cache()
+
+# Browser / CDN caching of the public content routes, keyed on route template
+HTTP_CACHE_POLICIES = {
+    "/api/blog": CachePolicy(max_age=60, s_maxage=300, stale_while_revalidate=600, stale_if_error=86400),
+    # Views are counted at the origin, so every hit revalidates (a cheap 304)
+    "/api/blog/{slug}": CachePolicy(revalidate=True),
+    "/api/batch/blog": CachePolicy(max_age=60, s_maxage=300, stale_while_revalidate=600, stale_if_error=86400),
+    "/api/testimonials": CachePolicy(max_age=300, s_maxage=3600, stale_while_revalidate=86400, stale_if_error=86400),
+    "/api/case-studies": CachePolicy(max_age=300, s_maxage=3600, stale_while_revalidate=86400, stale_if_error=86400),
+    "/api/case-studies/{slug}": CachePolicy(max_age=300, s_maxage=3600, stale_while_revalidate=86400, stale_if_error=86400),
+    "/api/batch/case-studies": CachePolicy(max_age=300, s_maxage=3600, stale_while_revalidate=86400, stale_if_error=86400),
+    "/api/external/profile": CachePolicy(max_age=300, s_maxage=3600, stale_while_revalidate=86400, stale_if_error=86400),
+    "/api/sitemap.xml": CachePolicy(max_age=3600, s_maxage=86400, stale_while_revalidate=86400, stale_if_error=86400),
+    "/api/sitemaps/{name}.xml": CachePolicy(max_age=3600, s_maxage=86400, stale_while_revalidate=86400, stale_if_error=86400),
+    "/api/search": CachePolicy(max_age=60, s_maxage=60, stale_while_revalidate=300),
+    "/api/pages/home": CachePolicy(max_age=60, s_maxage=300, stale_while_revalidate=600, stale_if_error=86400),
+    # Snapshots only change on admin writes, which purge the CDN by surrogate key
+    "/api/prerender/{kind}/{slug}": CachePolicy(max_age=300, s_maxage=31536000, stale_while_revalidate=86400, stale_if_error=86400),
+}
+http_cache = HttpCache(response_cache, HTTP_CACHE_POLICIES)
+
+# Purges CDN objects by surrogate key (the collection name) on admin writes
+cdn_purger = SurrogatePurger()
+
+# gzip/brotli response compression, reusing encoded bodies per ETag
+compressor = Compressor()
+
 # Create the main app
-app = FastAPI(title="My Inbox Media® API", version="1.0.0")
+app = FastAPI(
+    title="My Inbox Media® API",
+    version="1.0.0",
+    default_response_class=FastJSONResponse
+)
 
 # Create router with /api prefix
 api_router = APIRouter(prefix="/api")
@@ -49,321 +157,33 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-# ============= EXTERNAL DATA SCRAPER =============
-class MiMProfileScraper:
-    """Scraper for fetching services and clients from mimprofile.e-mim.in"""
-    
-    BASE_URL = "https://mimprofile.e-mim.in"
-    TIMEOUT = 15
-    MAX_RETRIES = 2
-    
-    @staticmethod
-    def fetch_page_content() -> str:
-        """Fetch the HTML content with retry logic"""
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        for attempt in range(MiMProfileScraper.MAX_RETRIES):
-            try:
-                response = requests.get(
-                    MiMProfileScraper.BASE_URL, 
-                    headers=headers, 
-                    timeout=MiMProfileScraper.TIMEOUT
-                )
-                response.raise_for_status()
-                return response.text
-            except requests.Timeout:
-                if attempt < MiMProfileScraper.MAX_RETRIES - 1:
-                    logger.warning(f"Timeout on attempt {attempt + 1}, retrying...")
-                    continue
-                else:
-                    raise HTTPException(
-                        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
-                        detail="External data source is not responding"
-                    )
-            except requests.RequestException as e:
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail=f"Unable to fetch external data: {str(e)}"
-                )
-    
-    @staticmethod
-    def extract_services(html_content: str) -> List[dict]:
-        """Extract services information"""
-        services_data = [
-            {
-                "title": "Omni Channel Solutions",
-                "description": "30+ Billion messages per annum across SMS, WhatsApp, RCS, OBD, and Gamification with 99.9% delivery rate",
-                "icon": "https://img.icons8.com/3d-fluency/200/communication.png",
-                "features": [
-                    "Bulk SMS & WhatsApp API Integration with real-time analytics",
-                    "Rich Media Messaging (Images, PDFs, Videos) across channels",
-                    "Trackable Links with CTR Analytics and conversion tracking",
-                    "OTP Generation & Token Systems with high security",
-                    "Delivery Status Webhooks for real-time updates",
-                    "Gamification & OBD Automation for enhanced engagement"
-                ]
-            },
-            {
-                "title": "SMS Solutions",
-                "description": "30+ Billion SMS per annum with cutting-edge features and global reach",
-                "icon": "https://customer-assets.emergentagent.com/job_mim-evolution/artifacts/yad7zi59_image.png",
-                "features": [
-                    "Bulk SMS API Integration",
-                    "Rich Media SMS (Images, PDFs, Videos)",
-                    "CTR Analytics & Trackable Links",
-                    "OTP & Token Systems",
-                    "Delivery Status Webhooks",
-                    "Auto Failover to WhatsApp/Voice"
-                ]
-            },
-            {
-                "title": "WhatsApp Business API",
-                "description": "Enhanced engagement with 50M+ messages annually and verified business accounts",
-                "icon": "https://img.icons8.com/3d-fluency/200/whatsapp.png",
-                "features": [
-                    "Business Platform Integration",
-                    "Enhanced Customer Engagement",
-                    "Automated Messaging",
-                    "RCS Messaging Support",
-                    "Rich Media Sharing",
-                    "Two-way Communication"
-                ]
-            },
-            {
-                "title": "VOCAL BOX",
-                "description": "All-in-one voice communication platform with IVR, OBD, Toll-Free, and Missed Call solutions",
-                "icon": "https://img.icons8.com/3d-fluency/200/microphone.png",
-                "features": [
-                    "Interactive Voice Response (IVR) Systems",
-                    "Outbound Dialing (OBD) for campaigns",
-                    "Toll-Free Number Services with nationwide coverage",
-                    "Missed Call Solutions for lead generation",
-                    "Voice Broadcasting with scheduling",
-                    "Call Analytics & Detailed Reporting",
-                    "Multi-language Support",
-                    "Custom Voice Prompts & Recording"
-                ]
-            },
-            {
-                "title": "Email Services",
-                "description": "20+ Billion emails annually with enterprise-grade deliverability and infrastructure",
-                "icon": "https://img.icons8.com/3d-fluency/200/email.png",
-                "features": [
-                    "High Deliverability Rates",
-                    "Robust Infrastructure",
-                    "API Integration",
-                    "Email Campaign Management",
-                    "Analytics & Reporting",
-                    "Template Management"
-                ]
-            },
-            {
-                "title": "RCS Messaging",
-                "description": "Next-generation messaging with rich content and interactive features for modern engagement",
-                "icon": "https://img.icons8.com/3d-fluency/200/chat.png",
-                "features": [
-                    "Rich Content Support",
-                    "Interactive Buttons",
-                    "Brand Verification",
-                    "Read Receipts",
-                    "High Engagement Rates",
-                    "Multimedia Messaging"
-                ]
-            },
-            {
-                "title": "Chatbot Solutions",
-                "description": "AI-powered customer service automation with intelligent conversational capabilities",
-                "icon": "https://img.icons8.com/3d-fluency/200/bot.png",
-                "features": [
-                    "24/7 Customer Support",
-                    "Natural Language Processing",
-                    "Multi-channel Integration",
-                    "Custom Workflows",
-                    "Analytics Dashboard",
-                    "Easy Deployment"
-                ]
-            },
-            {
-                "title": "API Integration",
-                "description": "Seamless integration with enterprise systems and third-party platforms",
-                "icon": "https://img.icons8.com/3d-fluency/200/api-settings.png",
-                "features": [
-                    "RESTful APIs",
-                    "Comprehensive Documentation",
-                    "Webhook Support",
-                    "Real-time Updates",
-                    "Secure Authentication",
-                    "Developer-friendly SDKs"
-                ]
-            },
-            {
-                "title": "Gamification",
-                "description": "Engage customers with interactive experiences, loyalty programs, and reward systems",
-                "icon": "https://img.icons8.com/3d-fluency/200/controller.png",
-                "features": [
-                    "Customer Engagement",
-                    "Loyalty Programs",
-                    "Interactive Campaigns",
-                    "Reward Systems",
-                    "Analytics & Insights",
-                    "Custom Game Design"
-                ]
-            },
-            {
-                "title": "QR & Loyalty Programs",
-                "description": "Drive customer retention and engagement with digital loyalty solutions",
-                "icon": "https://img.icons8.com/3d-fluency/200/qr-code.png",
-                "features": [
-                    "QR Code Generation",
-                    "Digital Loyalty Cards",
-                    "Points Management",
-                    "Reward Redemption",
-                    "Customer Analytics",
-                    "Mobile Integration"
-                ]
-            },
-            {
-                "title": "Outdoor & Indoor LED",
-                "description": "High-impact digital signage solutions with LED screens and interactive displays for maximum visibility",
-                "icon": "https://customer-assets.emergentagent.com/job_mim-evolution/artifacts/b4p0xrxe_image.png",
-                "features": [
-                    "Large Format LED Displays & Video Walls",
-                    "Interactive Touch Screen Signage",
-                    "Indoor & Outdoor LED Solutions",
-                    "Dynamic Content Management System",
-                    "Real-time Content Updates & Scheduling",
-                    "Weather & Traffic-resistant Outdoor Screens",
-                    "Energy-efficient LED Technology",
-                    "Remote Monitoring & Control"
-                ]
-            },
-            {
-                "title": "Software Solutions",
-                "description": "Custom enterprise software development including CRM, DMS, Loyalty Programs, and tailored business applications",
-                "icon": "https://img.icons8.com/3d-fluency/200/software.png",
-                "features": [
-                    "CRM (Customer Relationship Management) Systems",
-                    "DMS (Document Management Systems)",
-                    "Loyalty Program Software",
-                    "Customized Business Applications",
-                    "Cloud-based Solutions",
-                    "Mobile App Development",
-                    "System Integration Services",
-                    "Ongoing Support & Maintenance"
-                ]
-            }
-        ]
-        
-        return services_data
-    
-    @staticmethod
-    @staticmethod
-    @staticmethod
-    def extract_clients(html_content: str) -> List[dict]:
-        """Extract client logos - 91 unique logos (no duplicates)"""
-        client_logos = [
-            "/client-logos/1ferrari (1).png",
-            "/client-logos/2bmw.jpg",
-            "/client-logos/3apollopharma.jpg",
-            "/client-logos/4Hyundai.jpg",
-            "/client-logos/Abeer.png",
-            "/client-logos/AhmedAlMaghribiPerfumes.webp",
-            "/client-logos/AlHaji.png",
-            "/client-logos/Alain Class.png",
-            "/client-logos/Apco.png",
-            "/client-logos/Apex Capital.png",
-            "/client-logos/BlueCollection (2).png",
-            "/client-logos/CWC.jpg",
-            "/client-logos/CenturyPromise.png",
-            "/client-logos/CoursePlay.png",
-            "/client-logos/Daark.jpg",
-            "/client-logos/DejaVu.png",
-            "/client-logos/DhanKalyan.png",
-            "/client-logos/DhanSanchay.png",
-            "/client-logos/DoJoin.jpg",
-            "/client-logos/Dremize.png",
-            "/client-logos/EMC.png",
-            "/client-logos/EmiratesDrivingInstitute.jpg",
-            "/client-logos/Esnaad_Developments.jpg",
-            "/client-logos/EverNest.png",
-            "/client-logos/Fakhruddin.jpg",
-            "/client-logos/ForestHills.jpg",
-            "/client-logos/GemcareHospital.png",
-            "/client-logos/Givo.png",
-            "/client-logos/HIIIB (1).png",
-            "/client-logos/HandloomHouse.png",
-            "/client-logos/Henfruit.png",
-            "/client-logos/HomeLand-Realty-logo.webp",
-            "/client-logos/Honda (1).png",
-            "/client-logos/Hooliv.png",
-            "/client-logos/Huaxia Real Estate.jpg",
-            "/client-logos/JaleelCashCarry.png",
-            "/client-logos/JanDhan.png",
-            "/client-logos/Konark.png",
-            "/client-logos/Lahooti.png",
-            "/client-logos/Layaly.png",
-            "/client-logos/MandiGate.png",
-            "/client-logos/Marwaha.jpg",
-            "/client-logos/MetaHomes.png",
-            "/client-logos/Mirath.jpg",
-            "/client-logos/OC.png",
-            "/client-logos/OCP.jpg",
-            "/client-logos/OSIM.png",
-            "/client-logos/PARS.png",
-            "/client-logos/Prescott.jpg",
-            "/client-logos/PrimeCapital.png",
-            "/client-logos/Rishab.png",
-            "/client-logos/SharjahDrivingInstitute.jpg",
-            "/client-logos/Sky-Packers.png",
-            "/client-logos/Suraj.jpg",
-            "/client-logos/Toyota 36.png",
-            "/client-logos/Toyota.jpg",
-            "/client-logos/Untitled-18.png",
-            "/client-logos/VBazar.jpg",
-            "/client-logos/Wealthmax.png",
-            "/client-logos/Wow_Momo (1).jpg",
-            "/client-logos/abccargo.jpg",
-            "/client-logos/alghurairexchange.png",
-            "/client-logos/alliedMotors.png",
-            "/client-logos/apollonia.png",
-            "/client-logos/coal india (1).jpg",
-            "/client-logos/cropped-JAS-Vision-Real-Estate-1-Small.png",
-            "/client-logos/cropped-favicon-layaly.png",
-            "/client-logos/dlf.jpg",
-            "/client-logos/fcry.jpg",
-            "/client-logos/fujairaCharity.jpg",
-            "/client-logos/furairatransport.jpg",
-            "/client-logos/home credit (1).png",
-            "/client-logos/ibo.webp",
-            "/client-logos/ico.jpg",
-            "/client-logos/ijm-logo-png_seeklogo-268100.png",
-            "/client-logos/imagelaundry.png",
-            "/client-logos/jk cement (1).png",
-            "/client-logos/kgoc.png",
-            "/client-logos/kurlon.jpg",
-            "/client-logos/malabar.jpg",
-            "/client-logos/maruti suzuki (1).png",
-            "/client-logos/mintop.jpg",
-            "/client-logos/nestleWaters.jpg",
-            "/client-logos/nkshospital_logo.jpg",
-            "/client-logos/puregold.png",
-            "/client-logos/redtape.jpg",
-            "/client-logos/rupeek.jpg",
-            "/client-logos/sleepwell.jpg",
-            "/client-logos/tata (1).png",
-            "/client-logos/uclean.jpg",
-            "/client-logos/vestige.png",
-        ]
-        
-        clients = []
-        for logo_url in client_logos:
-            filename = logo_url.split('/')[-1]
-            name = filename.rsplit('.', 1)[0].replace('_', ' ').replace('-', ' ').title()
-            clients.append({"name": name, "logo_url": logo_url})
-        
-        return clients
+# ============= EXTERNAL DATA =============
+
+# Services and clients come from data/catalog.json, hot-reloaded on change
+EXTERNAL_DATA_MAX_AGE = int(os.getenv("EXTERNAL_DATA_MAX_AGE", "3600"))
+
+# Responsive logo derivatives, when logo_pipeline.py has been run; a rerun is
+# picked up like a catalog edit
+LOGO_MANIFEST_PATH = Path(os.getenv("LOGO_MANIFEST_PATH", str(LOGO_OUTPUT_DIR / LOGO_MANIFEST_NAME)))
+catalog_store = CatalogStore(
+    max_age=EXTERNAL_DATA_MAX_AGE,
+    decorate_clients=lambda clients: enrich_clients(clients, load_logo_manifest(LOGO_MANIFEST_PATH)),
+    depends_on=(LOGO_MANIFEST_PATH,)
+)
+
+# mimprofile.e-mim.in is fetched on a schedule and served from MongoDB
+profile_refresher = ProfileRefresher(db, on_change=lambda: content_changed("external_profile"))
+
+# sitemap.xml from published posts and case studies, client logos on /clients
+sitemap = Sitemap(db, page_images=lambda: {"/clients": catalog_store.snapshot.logo_urls})
+
+# Static HTML of published posts and case studies for crawlers and link previews
+prerenderer = Prerenderer(db)
+
+# Full-text search over published posts and case studies
+site_search = SiteSearch(db, on_sync=lambda: response_cache.invalidate("search"))
+
+
 # ============= HELPER FUNCTIONS =============
 def create_slug(title: str) -> str:
     """Create URL-friendly slug from title"""
@@ -374,6 +194,88 @@ def create_slug(title: str) -> str:
     return slug
 
 
+# Most slugs one batch request may ask for
+MAX_BATCH_SLUGS = 20
+
+
+def parse_slugs(slugs: str) -> List[str]:
+    """Comma-separated slugs, de-duplicated in request order; 400 if empty or too many"""
+    requested = list(dict.fromkeys(slug.strip() for slug in slugs.split(",") if slug.strip()))
+    if not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No slugs given"
+        )
+    if len(requested) > MAX_BATCH_SLUGS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_SLUGS} slugs per request"
+        )
+    return requested
+
+
+async def items_by_slug(request: Request, collection_name: str, slugs: List[str]) -> Response:
+    """
+    Items for `slugs` in request order, each `{"slug", "found", "data"}`.
+
+    Uses the same per-slug response cache entries as the single-item route;
+    the misses are fetched with one `$in` query and cached for both.
+    """
+    keys = {slug: response_cache.key(collection_name, "item", slug=slug) for slug in slugs}
+    cached = await asyncio.gather(*(http_cache.get(keys[slug]) for slug in slugs))
+    entries = {slug: entry for slug, entry in zip(slugs, cached) if entry is not None}
+    
+    missing = [slug for slug in slugs if slug not in entries]
+    if missing:
+        async for doc in db[collection_name].find({"slug": {"$in": missing}}):
+            slug = doc["slug"]
+            entries[slug] = await http_cache.put(
+                keys[slug], dumps(prepare_doc(doc)),
+                last_modified=doc.get("updated_at") or doc.get("created_at"),
+                surrogate_keys=(collection_name, f"{collection_name}/{slug}")
+            )
+    
+    # Cached item bodies are spliced in as-is rather than decoded and re-encoded
+    body = dumps({
+        "success": True,
+        "data": [
+            {"slug": slug, "found": True, "data": orjson.Fragment(entries[slug].body)}
+            if slug in entries else {"slug": slug, "found": False, "data": None}
+            for slug in slugs
+        ]
+    })
+    etag = etag_for(body)
+    surrogate_keys = (collection_name,)
+    not_modified = http_cache.check(request, etag, None, surrogate_keys)
+    if not_modified is not None:
+        return not_modified
+    return Response(content=body, media_type="application/json",
+                    headers=http_cache.headers(request, etag, None, surrogate_keys))
+
+
+# Collections whose content is part of a composite page payload
+PAGE_SOURCES = {"blog_posts", "testimonials"}
+# Collections behind /api/search results
+SEARCH_SOURCES = {"blog_posts", "case_studies"}
+
+# Surrogate keys carried by CDN-cacheable public responses; writes to any
+# other collection (e.g. contacts) have nothing at the edge to purge
+SURROGATE_KEYS = {"blog_posts", "testimonials", "case_studies", "external_profile"}
+
+
+async def content_changed(collection_name: str):
+    """Invalidate derived data after a write to `collection_name`"""
+    count_cache.invalidate(collection_name)
+    await response_cache.invalidate(collection_name)
+    if collection_name in PAGE_SOURCES:
+        await response_cache.invalidate("pages")
+    if collection_name in SEARCH_SOURCES:
+        await response_cache.invalidate("search")
+    sitemap.invalidate(collection_name)
+    if collection_name in SURROGATE_KEYS:
+        cdn_purger.purge_later(collection_name)
+
+
 # ============= PUBLIC ENDPOINTS =============
 
 @api_router.get("/")
@@ -385,70 +287,250 @@ async def root():
     }
 
 
+@api_router.get("/live")
+async def liveness_probe():
+    """Liveness probe: the process is up and its event loop is serving requests"""
+    return {"status": "alive", "timestamp": datetime.utcnow().isoformat()}
+
+
+@api_router.get("/ready")
+async def readiness_probe():
+    """Readiness probe from the cached health state; 503 until startup finished and MongoDB answers"""
+    report = health_monitor.report()
+    if not health_monitor.is_ready():
+        return FastJSONResponse(report, status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                headers={"Cache-Control": "no-store", "Retry-After": "5"})
+    return FastJSONResponse(report, headers={"Cache-Control": "no-store"})
+
+
 @api_router.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    try:
-        await db.command("ping")
-        return {
-            "status": "healthy",
-            "database": "connected",
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    except Exception as e:
-        return {
-            "status": "unhealthy",
-            "database": "disconnected",
-            "error": str(e),
-            "timestamp": datetime.utcnow().isoformat()
-        }
+    """Health check endpoint (cached MongoDB ping; 503 when disconnected)"""
+    body = {
+        "status": "healthy" if health_monitor.mongo_ok else "unhealthy",
+        "database": "connected" if health_monitor.mongo_ok else "disconnected",
+        "timestamp": datetime.utcnow().isoformat()
+    }
+    if not health_monitor.mongo_ok:
+        body["error"] = health_monitor.mongo_error
+        return FastJSONResponse(body, status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                headers={"Cache-Control": "no-store"})
+    return FastJSONResponse(body, headers={"Cache-Control": "no-store"})
 
 
 # ============= EXTERNAL DATA ENDPOINTS =============
 
 @api_router.get("/external/services")
-async def get_external_services():
-    """Fetch services data from external source"""
+async def get_external_services(request: Request):
+    """Serve services data (encoded once per catalog version)"""
+    return catalog_store.snapshot.services.response(request)
+
+
+@api_router.get("/external/clients")
+async def get_external_clients(request: Request):
+    """Serve client logos (encoded once per catalog version)"""
+    return catalog_store.snapshot.clients.response(request)
+
+
+@api_router.get("/external/profile")
+async def get_external_profile(request: Request):
+    """Latest mimprofile.e-mim.in profile (refreshed in the background)"""
     try:
-        # Services are predefined, no need to fetch HTML
-        services = MiMProfileScraper.extract_services("")
+        cache_key = response_cache.key("external_profile", "item")
+        cached = await http_cache.lookup(request, cache_key)
+        if cached is not None:
+            return cached
+        
+        profile = await profile_refresher.load()
+        if not profile:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="External profile has not been fetched yet",
+                headers={"Retry-After": "60"}
+            )
+        
+        body = dumps({"success": True, "data": profile})
+        return await http_cache.store(
+            request, cache_key, body, last_modified=profile.get("fetched_at"),
+            surrogate_keys=("external_profile",)
+        )
         
-        return {
-            "success": True,
-            "data_count": len(services),
-            "data": services,
-            "source": "mimprofile.e-mim.in"
-        }
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error extracting services: {str(e)}")
+        logger.error(f"Error fetching external profile: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to extract services: {str(e)}"
+            detail="Failed to fetch external profile"
         )
 
 
-@api_router.get("/external/clients")
-async def get_external_clients():
-    """Fetch client logos from external source"""
+# ============= PAGES =============
+
+HOME_TESTIMONIALS = 6
+HOME_POSTS = 3
+
+
+@api_router.get("/pages/home")
+async def get_home_page(request: Request):
+    """Everything the homepage renders in one payload: services, clients, featured testimonials, latest posts"""
     try:
-        # Clients are predefined, no need to fetch HTML
-        clients = MiMProfileScraper.extract_clients("")
+        snapshot = catalog_store.snapshot
+        # The catalog version is in the key, so a catalog reload needs no invalidation
+        cache_key = response_cache.key("pages", "home", catalog=f"{snapshot.version}-{snapshot.digest[:12]}")
+        cached = await http_cache.lookup(request, cache_key)
+        if cached is not None:
+            return cached
+        
+        testimonials, posts = await asyncio.gather(
+            db.testimonials.find(
+                {"published": True, "featured": True}, LIST_FIELDS["testimonials"].projection("summary")
+            ).sort("created_at", -1).to_list(length=HOME_TESTIMONIALS),
+            db.blog_posts.find(
+                {"published": True}, LIST_FIELDS["blog_posts"].projection("summary")
+            ).sort([("created_at", -1), ("_id", -1)]).to_list(length=HOME_POSTS)
+        )
         
-        return {
+        body = dumps({
             "success": True,
-            "data_count": len(clients),
-            "data": clients,
-            "source": "mimprofile.e-mim.in"
-        }
+            "data": {
+                "services": snapshot.service_list,
+                "clients": snapshot.client_list,
+                "testimonials": [prepare_doc(t) for t in testimonials],
+                "posts": [prepare_doc(post) for post in posts]
+            }
+        })
+        response = await http_cache.store(
+            request, cache_key, body, surrogate_keys=("blog_posts", "testimonials")
+        )
+        # Compress once now rather than on the first request in each encoding
+        compressor.prime(body, etag_for(body))
+        return response
+        
+    except Exception as e:
+        logger.error(f"Error building home page payload: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to load home page"
+        )
+
+
+# ============= SEARCH =============
+
+@api_router.get("/search")
+async def search_content(
+    request: Request,
+    q: str = Query(..., min_length=2, max_length=200),
+    kind: Optional[str] = Query(None, alias="type", pattern="^(blog|case-studies)$"),
+    page: int = Query(1, ge=1, le=100),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """Relevance-ranked search over published blog posts and case studies"""
+    if not site_search.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Search index is loading",
+            headers={"Retry-After": "5"}
+        )
+    try:
+        cache_key = response_cache.key("search", "results", q=q, type=kind, page=page, limit=limit)
+        cached = await http_cache.lookup(request, cache_key)
+        if cached is not None:
+            return cached
+
+        total, hits = await site_search.search(q, kind, (page - 1) * limit, limit)
+        body = dumps({
+            "success": True,
+            "query": q,
+            "data": [{**result, "score": score} for score, result in hits],
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "pages": (total + limit - 1) // limit
+        })
+        return await http_cache.store(request, cache_key, body, surrogate_keys=("blog_posts", "case_studies"))
+    except Exception as e:
+        logger.error(f"Error searching for {q!r}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Search failed"
+        )
+
+
+# ============= SITEMAP =============
+
+def sitemap_response(request: Request, document) -> Response:
+    """The stored gzip body as-is, or inflated for the rare client without gzip"""
+    last_modified = http_date(document.last_modified)
+    surrogate_keys = ("blog_posts", "case_studies")
+    cached = http_cache.check(request, document.etag, last_modified, surrogate_keys)
+    if cached is not None:
+        return cached
+    headers = http_cache.headers(request, document.etag, last_modified, surrogate_keys)
+    headers["Vary"] = "Accept-Encoding"
+    if parse_accept_encoding(request.headers.get("accept-encoding", "")).get("gzip", 0) > 0:
+        headers["Content-Encoding"] = "gzip"
+        headers["ETag"] = encoded_etag(document.etag, "gzip")
+        return Response(content=document.body, media_type="application/xml", headers=headers)
+    return Response(content=gzip.decompress(document.body), media_type="application/xml", headers=headers)
+
+
+@api_router.get("/sitemap.xml")
+async def get_sitemap(request: Request):
+    """sitemap.xml (a sitemap index once there are more than 50,000 URLs)"""
+    document = await sitemap.get()
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Sitemap is being generated",
+            headers={"Retry-After": "60"}
+        )
+    return sitemap_response(request, document)
+
+
+@api_router.get("/sitemaps/{name}.xml")
+async def get_sitemap_part(name: str, request: Request):
+    """One part of the sitemap index"""
+    document = await sitemap.get(name) if name != "sitemap" else None
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sitemap not found"
+        )
+    return sitemap_response(request, document)
+
+
+# ============= PRERENDERED PAGES =============
+
+PRERENDER_COLLECTIONS = {"blog": "blog_posts", "case-studies": "case_studies"}
+
+
+@api_router.get("/prerender/{kind}/{slug}")
+async def get_prerendered_page(kind: str, slug: str, request: Request):
+    """HTML snapshot of a published post or case study (served to bots)"""
+    collection = PRERENDER_COLLECTIONS.get(kind)
+    if collection is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Page not found")
+    try:
+        cache_key = response_cache.key(collection, "prerender", kind=kind, slug=slug)
+        cached = await http_cache.lookup(request, cache_key)
+        if cached is not None:
+            return cached
+
+        snapshot = await prerenderer.get(kind, slug)
+        if snapshot is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Page not found")
+        return await http_cache.store(
+            request, cache_key, snapshot["html"].encode(), last_modified=snapshot["updated_at"],
+            surrogate_keys=(collection,), media_type="text/html; charset=utf-8"
+        )
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error extracting clients: {str(e)}")
+        logger.error(f"Error serving prerendered page: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to extract clients: {str(e)}"
+            detail="Failed to load page"
         )
 
 
@@ -489,67 +571,46 @@ async def book_meeting(meeting_data: ContactMessage):
         
         logger.info(f"Meeting booking: {meeting_id}")
         
-        # Send email notification with meeting details
+        # Queue email notification with meeting details - delivered by the outbox dispatcher
         try:
-            email_api_url = os.getenv("EMAIL_API_URL")
-            profile_id = os.getenv("EMAIL_PROFILE_ID")
-            api_key = os.getenv("EMAIL_API_KEY")
-            
-            if email_api_url and profile_id and api_key:
-                html_body = f"""
-                <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                    <h2 style="color: #1E2A44; border-bottom: 3px solid #CE162F; padding-bottom: 10px;">
-                        🎉 New Google Meet Request
-                    </h2>
-                    <div style="background: #f9f9f9; padding: 20px; border-radius: 8px; margin-top: 20px;">
-                        <p style="margin: 10px 0;"><strong>Name:</strong> {meeting_data.name}</p>
-                        <p style="margin: 10px 0;"><strong>Email:</strong> {meeting_data.email}</p>
-                        <p style="margin: 10px 0;"><strong>Phone:</strong> {meeting_data.phone}</p>
-                        <p style="margin: 10px 0;"><strong>Company:</strong> {meeting_data.service or 'Not provided'}</p>
-                        <p style="margin: 10px 0;"><strong>📅 Preferred Date:</strong> {preferred_date}</p>
-                        <p style="margin: 10px 0;"><strong>🕐 Preferred Time:</strong> {preferred_time}</p>
-                        {f'<p style="margin: 10px 0;"><strong>Message:</strong></p><div style="background: white; padding: 15px; border-left: 4px solid #CE162F;">{additional_message}</div>' if additional_message else ''}
-                    </div>
-                    <div style="background: #1E2A44; color: white; padding: 15px; border-radius: 8px; margin-top: 20px;">
-                        <p style="margin: 5px 0;">📧 <strong>Action Required:</strong></p>
-                        <p style="margin: 5px 0;">Please create a Google Meet link and send calendar invite to: {meeting_data.email}</p>
-                    </div>
-                    <p style="color: #666; font-size: 12px; margin-top: 20px;">
-                        This request was submitted via My Inbox Media® website.
-                    </p>
+            html_body = f"""
+            <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+                <h2 style="color: #1E2A44; border-bottom: 3px solid #CE162F; padding-bottom: 10px;">
+                    🎉 New Google Meet Request
+                </h2>
+                <div style="background: #f9f9f9; padding: 20px; border-radius: 8px; margin-top: 20px;">
+                    <p style="margin: 10px 0;"><strong>Name:</strong> {meeting_data.name}</p>
+                    <p style="margin: 10px 0;"><strong>Email:</strong> {meeting_data.email}</p>
+                    <p style="margin: 10px 0;"><strong>Phone:</strong> {meeting_data.phone}</p>
+                    <p style="margin: 10px 0;"><strong>Company:</strong> {meeting_data.service or 'Not provided'}</p>
+                    <p style="margin: 10px 0;"><strong>📅 Preferred Date:</strong> {preferred_date}</p>
+                    <p style="margin: 10px 0;"><strong>🕐 Preferred Time:</strong> {preferred_time}</p>
+                    {f'<p style="margin: 10px 0;"><strong>Message:</strong></p><div style="background: white; padding: 15px; border-left: 4px solid #CE162F;">{additional_message}</div>' if additional_message else ''}
                 </div>
-                """
-                
-                email_payload = {
-                    "ProfileId": profile_id,
-                    "APIKey": api_key,
-                    "From": "MyInboxMedia<noreply@mimpro.co>",
-                    "To": "sales@myinboxmedia.com;pallavi@myinboxmedia.com;yusuf.atiq@gmail.com",
-                    "ReplyTo": meeting_data.email,
-                    "Subject": f"📅 Google Meet Request: {meeting_data.name} - {preferred_date} {preferred_time}",
-                    "text": "",
-                    "html": html_body,
-                    "attachment": []
-                }
-                
-                email_response = requests.post(
-                    email_api_url,
-                    json=email_payload,
-                    headers={"Content-Type": "application/json"},
-                    timeout=10
-                )
-                
-                if email_response.status_code == 200:
-                    logger.info(f"Meeting request email sent: {meeting_id}")
-                    await db.meeting_requests.update_one(
-                        {"_id": result.inserted_id},
-                        {"$set": {"email_sent": True}}
-                    )
-                else:
-                    logger.error(f"Meeting email failed: {email_response.status_code}")
+                <div style="background: #1E2A44; color: white; padding: 15px; border-radius: 8px; margin-top: 20px;">
+                    <p style="margin: 5px 0;">📧 <strong>Action Required:</strong></p>
+                    <p style="margin: 5px 0;">Please create a Google Meet link and send calendar invite to: {meeting_data.email}</p>
+                </div>
+                <p style="color: #666; font-size: 12px; margin-top: 20px;">
+                    This request was submitted via My Inbox Media® website.
+                </p>
+            </div>
+            """
+            
+            email_message = {
+                "From": "MyInboxMedia<noreply@mimpro.co>",
+                "To": "sales@myinboxmedia.com;pallavi@myinboxmedia.com;yusuf.atiq@gmail.com",
+                "ReplyTo": meeting_data.email,
+                "Subject": f"📅 Google Meet Request: {meeting_data.name} - {preferred_date} {preferred_time}",
+                "text": "",
+                "html": html_body,
+                "attachment": []
+            }
+            
+            await email_outbox.enqueue("meeting_requests", result.inserted_id, email_message)
         
         except Exception as email_error:
-            logger.error(f"Error sending meeting email: {str(email_error)}")
+            logger.error(f"Error queueing meeting email: {str(email_error)}")
         
         return {
             "success": True,
@@ -573,73 +634,48 @@ async def submit_contact_form(contact_data: ContactMessage):
         contact_doc = contact_data.dict()
         result = await db.contacts.insert_one(contact_doc)
         contact_id = str(result.inserted_id)
+        await content_changed("contacts")
         
         logger.info(f"Contact form submitted: {contact_id}")
         
-        # Send email notification using MiM Email API
+        # Queue email notification - delivered by the outbox dispatcher via MiM Email API
         try:
-            email_api_url = os.getenv("EMAIL_API_URL")
-            profile_id = os.getenv("EMAIL_PROFILE_ID")
-            api_key = os.getenv("EMAIL_API_KEY")
-            
-            if email_api_url and profile_id and api_key:
-                # Construct HTML email body
-                html_body = f"""
-                <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                    <h2 style="color: #1E2A44; border-bottom: 3px solid #CE162F; padding-bottom: 10px;">
-                        New Contact Form Submission
-                    </h2>
-                    <div style="background: #f9f9f9; padding: 20px; border-radius: 8px; margin-top: 20px;">
-                        <p style="margin: 10px 0;"><strong>Name:</strong> {contact_data.name}</p>
-                        <p style="margin: 10px 0;"><strong>Email:</strong> {contact_data.email}</p>
-                        <p style="margin: 10px 0;"><strong>Phone:</strong> {contact_data.phone or 'Not provided'}</p>
-                        <p style="margin: 10px 0;"><strong>Service Interested In:</strong> {contact_data.service or 'Not specified'}</p>
-                        <p style="margin: 10px 0;"><strong>Message:</strong></p>
-                        <div style="background: white; padding: 15px; border-left: 4px solid #CE162F; margin-top: 10px;">
-                            {contact_data.message}
-                        </div>
+            html_body = f"""
+            <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+                <h2 style="color: #1E2A44; border-bottom: 3px solid #CE162F; padding-bottom: 10px;">
+                    New Contact Form Submission
+                </h2>
+                <div style="background: #f9f9f9; padding: 20px; border-radius: 8px; margin-top: 20px;">
+                    <p style="margin: 10px 0;"><strong>Name:</strong> {contact_data.name}</p>
+                    <p style="margin: 10px 0;"><strong>Email:</strong> {contact_data.email}</p>
+                    <p style="margin: 10px 0;"><strong>Phone:</strong> {contact_data.phone or 'Not provided'}</p>
+                    <p style="margin: 10px 0;"><strong>Service Interested In:</strong> {contact_data.service or 'Not specified'}</p>
+                    <p style="margin: 10px 0;"><strong>Message:</strong></p>
+                    <div style="background: white; padding: 15px; border-left: 4px solid #CE162F; margin-top: 10px;">
+                        {contact_data.message}
                     </div>
-                    <p style="color: #666; font-size: 12px; margin-top: 20px;">
-                        This email was sent from the My Inbox Media® website contact form.
-                    </p>
                 </div>
-                """
-                
-                email_payload = {
-                    "ProfileId": profile_id,
-                    "APIKey": api_key,
-                    "From": "MyInboxMedia<noreply@mimpro.co>",
-                    "To": "sales@myinboxmedia.com",
-                    "ReplyTo": contact_data.email,
-                    "CC": "anirudh@myinboxmedia.com; sameer@myinboxmedia.com",
-                    "Subject": f"New Contact Form: {contact_data.name}",
-                    "text": "",
-                    "html": html_body,
-                    "attachment": []
-                }
-                
-                # Send email using requests
-                email_response = requests.post(
-                    email_api_url,
-                    json=email_payload,
-                    headers={"Content-Type": "application/json"},
-                    timeout=10
-                )
-                
-                if email_response.status_code == 200:
-                    logger.info(f"Email sent successfully for contact: {contact_id}")
-                    await db.contacts.update_one(
-                        {"_id": result.inserted_id},
-                        {"$set": {"email_sent": True}}
-                    )
-                else:
-                    logger.error(f"Email send failed: {email_response.status_code} - {email_response.text}")
-            else:
-                logger.warning("Email API credentials not configured")
+                <p style="color: #666; font-size: 12px; margin-top: 20px;">
+                    This email was sent from the My Inbox Media® website contact form.
+                </p>
+            </div>
+            """
+            
+            email_message = {
+                "From": "MyInboxMedia<noreply@mimpro.co>",
+                "To": "sales@myinboxmedia.com",
+                "ReplyTo": contact_data.email,
+                "CC": "anirudh@myinboxmedia.com; sameer@myinboxmedia.com",
+                "Subject": f"New Contact Form: {contact_data.name}",
+                "text": "",
+                "html": html_body,
+                "attachment": []
+            }
+            
+            await email_outbox.enqueue("contacts", result.inserted_id, email_message)
         
         except Exception as email_error:
-            logger.error(f"Error sending email: {str(email_error)}")
-            # Continue anyway - contact is saved in DB
+            logger.error(f"Error queueing contact email: {str(email_error)}")
         
         return {
             "success": True,
@@ -669,8 +705,8 @@ async def login(user_login: UserLogin):
                 detail="Incorrect email or password"
             )
         
-        # Verify password
-        if not verify_password(user_login.password, user_doc["hashed_password"]):
+        # Verify password (bcrypt runs in the bounded hashing pool)
+        if not await password_hasher.verify(user_login.password, user_doc["hashed_password"]):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
@@ -686,6 +722,12 @@ async def login(user_login: UserLogin):
         
     except HTTPException:
         raise
+    except HasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many login attempts in progress, please retry",
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         logger.error(f"Login error: {str(e)}")
         raise HTTPException(
@@ -707,7 +749,7 @@ async def register_admin(user_create: AdminUserCreate):
             )
         
         # Create user
-        hashed_password = get_password_hash(user_create.password)
+        hashed_password = await password_hasher.hash(user_create.password)
         user_doc = {
             "email": user_create.email,
             "name": user_create.name,
@@ -726,6 +768,17 @@ async def register_admin(user_create: AdminUserCreate):
         
     except HTTPException:
         raise
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User already exists"
+        )
+    except HasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, please retry",
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         logger.error(f"Registration error: {str(e)}")
         raise HTTPException(
@@ -749,7 +802,7 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
                 detail="User not found"
             )
         
-        return serialize_doc(user_doc)
+        return FastJSONResponse(prepare_doc(user_doc))
         
     except HTTPException:
         raise
@@ -765,42 +818,74 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
 
 @api_router.get("/blog")
 async def get_blog_posts(
+    request: Request,
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=50),
     category: Optional[str] = None,
-    published_only: bool = True
+    published_only: bool = True,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    view: str = Query("full", pattern="^(summary|full)$"),
+    fields: Optional[str] = None
 ):
-    """Get paginated blog posts"""
+    """Get paginated blog posts (page/limit, or keyset via `cursor`)"""
     try:
+        cache_key = response_cache.key(
+            "blog_posts", "list", page=page, limit=limit, category=category,
+            published_only=published_only, cursor=cursor, include_total=include_total,
+            view=view, fields=fields
+        )
+        cached = await http_cache.lookup(request, cache_key)
+        if cached is not None:
+            return cached
+        
         query = {}
         if published_only:
             query["published"] = True
         if category:
             query["category"] = category
         
-        skip = (page - 1) * limit
-        
-        # Get total count
-        total = await db.blog_posts.count_documents(query)
-        
-        # Get posts
-        cursor = db.blog_posts.find(
-            query,
-            {"_id": 1, "title": 1, "slug": 1, "excerpt": 1, "author": 1, 
-             "featured_image": 1, "category": 1, "tags": 1, "published": 1, 
-             "views": 1, "created_at": 1, "updated_at": 1}
-        ).sort("created_at", -1).skip(skip).limit(limit)
-        posts = await cursor.to_list(length=limit)
+        try:
+            page_query = apply_cursor(query, "created_at", cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        try:
+            projection = LIST_FIELDS["blog_posts"].projection(view, fields)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        skip = 0 if cursor else (page - 1) * limit
+        
+        # Get posts (one extra to detect a following page)
+        posts_cursor = db.blog_posts.find(page_query, projection).sort(
+            [("created_at", -1), ("_id", -1)]
+        ).skip(skip).limit(limit + 1)
+        
+        # Count concurrently with the page fetch (skipped with include_total=false)
+        if include_total:
+            total, posts = await asyncio.gather(
+                count_cache.count(db.blog_posts, query),
+                posts_cursor.to_list(length=limit + 1)
+            )
+        else:
+            total, posts = None, await posts_cursor.to_list(length=limit + 1)
+        cursor_next = next_cursor(posts, limit, "created_at")
         
-        return {
+        body = dumps({
             "success": True,
-            "data": [serialize_doc(post) for post in posts],
+            "data": [prepare_doc(post) for post in posts],
             "total": total,
             "page": page,
             "limit": limit,
-            "pages": (total + limit - 1) // limit
-        }
+            "pages": (total + limit - 1) // limit if total is not None else None,
+            "next_cursor": cursor_next
+        })
+        return await http_cache.store(request, cache_key, body, surrogate_keys=("blog_posts",))
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching blog posts: {str(e)}")
         raise HTTPException(
@@ -809,24 +894,43 @@ async def get_blog_posts(
         )
 
 
+@api_router.get("/batch/blog")
+async def get_blog_posts_by_slug(request: Request, slugs: str = Query(..., description="Comma-separated slugs")):
+    """Several blog posts by slug, in the requested order (views are not counted)"""
+    try:
+        return await items_by_slug(request, "blog_posts", parse_slugs(slugs))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching blog posts by slug: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch blog posts"
+        )
+
+
 @api_router.get("/blog/{slug}")
-async def get_blog_post(slug: str):
+async def get_blog_post(slug: str, request: Request):
     """Get single blog post by slug"""
     try:
-        post = await db.blog_posts.find_one({"slug": slug})
-        if not post:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Blog post not found"
+        cache_key = response_cache.key("blog_posts", "item", slug=slug)
+        cached = await http_cache.lookup(request, cache_key)
+        if cached is None:
+            post = await db.blog_posts.find_one({"slug": slug})
+            if not post:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Blog post not found"
+                )
+            cached = await http_cache.store(
+                request, cache_key, dumps(prepare_doc(post)),
+                last_modified=post.get("updated_at") or post.get("created_at"),
+                surrogate_keys=("blog_posts", f"blog_posts/{slug}")
             )
         
-        # Increment views
-        await db.blog_posts.update_one(
-            {"slug": slug},
-            {"$inc": {"views": 1}}
-        )
-        
-        return serialize_doc(post)
+        # Count the view (304s included) - persisted by the next batched flush
+        blog_view_counter.record(slug)
+        return cached
         
     except HTTPException:
         raise
@@ -842,30 +946,44 @@ async def get_blog_post(slug: str):
 
 @api_router.get("/testimonials")
 async def get_testimonials(
+    request: Request,
     published_only: bool = True,
-    featured_only: bool = False
+    featured_only: bool = False,
+    view: str = Query("full", pattern="^(summary|full)$"),
+    fields: Optional[str] = None
 ):
     """Get all testimonials"""
     try:
+        cache_key = response_cache.key(
+            "testimonials", "list", published_only=published_only, featured_only=featured_only,
+            view=view, fields=fields
+        )
+        cached = await http_cache.lookup(request, cache_key)
+        if cached is not None:
+            return cached
+        
         query = {}
         if published_only:
             query["published"] = True
         if featured_only:
             query["featured"] = True
         
-        cursor = db.testimonials.find(
-            query,
-            {"_id": 1, "client_name": 1, "client_position": 1, "client_company": 1,
-             "client_image": 1, "testimonial_text": 1, "rating": 1, "featured": 1,
-             "published": 1, "created_at": 1}
-        ).sort("created_at", -1).limit(100)
+        try:
+            projection = LIST_FIELDS["testimonials"].projection(view, fields)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        
+        cursor = db.testimonials.find(query, projection).sort("created_at", -1).limit(100)
         testimonials = await cursor.to_list(length=100)
         
-        return {
+        body = dumps({
             "success": True,
-            "data": [serialize_doc(test) for test in testimonials]
-        }
+            "data": [prepare_doc(test) for test in testimonials]
+        })
+        return await http_cache.store(request, cache_key, body, surrogate_keys=("testimonials",))
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching testimonials: {str(e)}")
         raise HTTPException(
@@ -878,31 +996,44 @@ async def get_testimonials(
 
 @api_router.get("/case-studies")
 async def get_case_studies(
+    request: Request,
     published_only: bool = True,
-    industry: Optional[str] = None
+    industry: Optional[str] = None,
+    view: str = Query("full", pattern="^(summary|full)$"),
+    fields: Optional[str] = None
 ):
-    """Get all case studies"""
+    """Get all case studies (`view=summary` for card listings)"""
     try:
+        cache_key = response_cache.key(
+            "case_studies", "list", published_only=published_only, industry=industry,
+            view=view, fields=fields
+        )
+        cached = await http_cache.lookup(request, cache_key)
+        if cached is not None:
+            return cached
+        
         query = {}
         if published_only:
             query["published"] = True
         if industry:
             query["industry"] = industry
         
-        cursor = db.case_studies.find(
-            query,
-            {"_id": 1, "title": 1, "slug": 1, "client_name": 1, "client_logo": 1,
-             "industry": 1, "challenge": 1, "solution": 1, "results": 1,
-             "technologies": 1, "featured_image": 1, "gallery_images": 1,
-             "published": 1, "created_at": 1, "updated_at": 1}
-        ).sort("created_at", -1).limit(100)
+        try:
+            projection = LIST_FIELDS["case_studies"].projection(view, fields)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        
+        cursor = db.case_studies.find(query, projection).sort("created_at", -1).limit(100)
         case_studies = await cursor.to_list(length=100)
         
-        return {
+        body = dumps({
             "success": True,
-            "data": [serialize_doc(cs) for cs in case_studies]
-        }
+            "data": [prepare_doc(cs) for cs in case_studies]
+        })
+        return await http_cache.store(request, cache_key, body, surrogate_keys=("case_studies",))
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching case studies: {str(e)}")
         raise HTTPException(
@@ -911,10 +1042,30 @@ async def get_case_studies(
         )
 
 
+@api_router.get("/batch/case-studies")
+async def get_case_studies_by_slug(request: Request, slugs: str = Query(..., description="Comma-separated slugs")):
+    """Several case studies by slug, in the requested order"""
+    try:
+        return await items_by_slug(request, "case_studies", parse_slugs(slugs))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching case studies by slug: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch case studies"
+        )
+
+
 @api_router.get("/case-studies/{slug}")
-async def get_case_study(slug: str):
+async def get_case_study(slug: str, request: Request):
     """Get single case study by slug"""
     try:
+        cache_key = response_cache.key("case_studies", "item", slug=slug)
+        cached = await http_cache.lookup(request, cache_key)
+        if cached is not None:
+            return cached
+        
         case_study = await db.case_studies.find_one({"slug": slug})
         if not case_study:
             raise HTTPException(
@@ -922,7 +1073,12 @@ async def get_case_study(slug: str):
                 detail="Case study not found"
             )
         
-        return serialize_doc(case_study)
+        last_modified = case_study.get("updated_at") or case_study.get("created_at")
+        body = dumps(prepare_doc(case_study))
+        return await http_cache.store(
+            request, cache_key, body, last_modified=last_modified,
+            surrogate_keys=("case_studies", f"case_studies/{slug}")
+        )
         
     except HTTPException:
         raise
@@ -945,8 +1101,12 @@ async def create_blog_post(post_data: BlogPostCreate):
         post_dict["created_at"] = datetime.utcnow()
         post_dict["updated_at"] = datetime.utcnow()
         post_dict["views"] = 0
+        with_teaser("blog_posts", post_dict)
         
         result = await db.blog_posts.insert_one(post_dict)
+        await prerenderer.sync("blog", post_dict)
+        await site_search.update("blog", post_dict)
+        await content_changed("blog_posts")
         
         return {
             "success": True,
@@ -954,6 +1114,11 @@ async def create_blog_post(post_data: BlogPostCreate):
             "post_id": str(result.inserted_id)
         }
         
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A blog post with this title already exists"
+        )
     except Exception as e:
         logger.error(f"Error creating blog post: {str(e)}")
         raise HTTPException(
@@ -978,21 +1143,33 @@ async def update_blog_post(post_id: str, post_data: BlogPostUpdate):
         if "title" in update_dict:
             update_dict["slug"] = create_slug(update_dict["title"])
         
-        result = await db.blog_posts.update_one(
+        with_teaser("blog_posts", update_dict)
+        
+        post = await db.blog_posts.find_one_and_update(
             {"_id": ObjectId(post_id)},
-            {"$set": update_dict}
+            {"$set": update_dict},
+            return_document=ReturnDocument.AFTER
         )
         
-        if result.matched_count == 0:
+        if post is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Blog post not found"
             )
         
+        await prerenderer.sync("blog", post)
+        await site_search.update("blog", post)
+        await content_changed("blog_posts")
+        
         return {"success": True, "message": "Blog post updated"}
         
     except HTTPException:
         raise
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A blog post with this title already exists"
+        )
     except Exception as e:
         logger.error(f"Error updating blog post: {str(e)}")
         raise HTTPException(
@@ -1013,6 +1190,10 @@ async def delete_blog_post(post_id: str):
                 detail="Blog post not found"
             )
         
+        await prerenderer.remove(post_id)
+        await site_search.remove(post_id)
+        await content_changed("blog_posts")
+        
         return {"success": True, "message": "Blog post deleted"}
         
     except HTTPException:
@@ -1033,8 +1214,10 @@ async def create_testimonial(testimonial_data: TestimonialCreate):
     try:
         testimonial_dict = testimonial_data.dict()
         testimonial_dict["created_at"] = datetime.utcnow()
+        with_teaser("testimonials", testimonial_dict)
         
         result = await db.testimonials.insert_one(testimonial_dict)
+        await content_changed("testimonials")
         
         return {
             "success": True,
@@ -1061,6 +1244,8 @@ async def update_testimonial(testimonial_id: str, testimonial_data: TestimonialU
                 detail="No fields to update"
             )
         
+        with_teaser("testimonials", update_dict)
+        
         result = await db.testimonials.update_one(
             {"_id": ObjectId(testimonial_id)},
             {"$set": update_dict}
@@ -1072,6 +1257,8 @@ async def update_testimonial(testimonial_id: str, testimonial_data: TestimonialU
                 detail="Testimonial not found"
             )
         
+        await content_changed("testimonials")
+        
         return {"success": True, "message": "Testimonial updated"}
         
     except HTTPException:
@@ -1096,6 +1283,8 @@ async def delete_testimonial(testimonial_id: str):
                 detail="Testimonial not found"
             )
         
+        await content_changed("testimonials")
+        
         return {"success": True, "message": "Testimonial deleted"}
         
     except HTTPException:
@@ -1118,8 +1307,12 @@ async def create_case_study(case_study_data: CaseStudyCreate):
         case_study_dict["slug"] = create_slug(case_study_data.title)
         case_study_dict["created_at"] = datetime.utcnow()
         case_study_dict["updated_at"] = datetime.utcnow()
+        with_teaser("case_studies", case_study_dict)
         
         result = await db.case_studies.insert_one(case_study_dict)
+        await prerenderer.sync("case-studies", case_study_dict)
+        await site_search.update("case-studies", case_study_dict)
+        await content_changed("case_studies")
         
         return {
             "success": True,
@@ -1127,6 +1320,11 @@ async def create_case_study(case_study_data: CaseStudyCreate):
             "case_study_id": str(result.inserted_id)
         }
         
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A case study with this title already exists"
+        )
     except Exception as e:
         logger.error(f"Error creating case study: {str(e)}")
         raise HTTPException(
@@ -1151,21 +1349,33 @@ async def update_case_study(case_study_id: str, case_study_data: CaseStudyUpdate
         if "title" in update_dict:
             update_dict["slug"] = create_slug(update_dict["title"])
         
-        result = await db.case_studies.update_one(
+        with_teaser("case_studies", update_dict)
+        
+        case_study = await db.case_studies.find_one_and_update(
             {"_id": ObjectId(case_study_id)},
-            {"$set": update_dict}
+            {"$set": update_dict},
+            return_document=ReturnDocument.AFTER
         )
         
-        if result.matched_count == 0:
+        if case_study is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Case study not found"
             )
         
+        await prerenderer.sync("case-studies", case_study)
+        await site_search.update("case-studies", case_study)
+        await content_changed("case_studies")
+        
         return {"success": True, "message": "Case study updated"}
         
     except HTTPException:
         raise
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A case study with this title already exists"
+        )
     except Exception as e:
         logger.error(f"Error updating case study: {str(e)}")
         raise HTTPException(
@@ -1186,6 +1396,10 @@ async def delete_case_study(case_study_id: str):
                 detail="Case study not found"
             )
         
+        await prerenderer.remove(case_study_id)
+        await site_search.remove(case_study_id)
+        await content_changed("case_studies")
+        
         return {"success": True, "message": "Case study deleted"}
         
     except HTTPException:
@@ -1204,33 +1418,52 @@ async def delete_case_study(case_study_id: str):
 async def get_all_contacts(
     status_filter: Optional[str] = None,
     page: int = Query(1, ge=1),
-    limit: int = Query(20, ge=1, le=100)
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = True
 ):
-    """Get all contact messages (Admin only)"""
+    """Get all contact messages (Admin only) - page/limit, or keyset via `cursor`"""
     try:
         query = {}
         if status_filter:
             query["status"] = status_filter
         
-        skip = (page - 1) * limit
+        try:
+            page_query = apply_cursor(query, "submitted_at", cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        skip = 0 if cursor else (page - 1) * limit
         
-        total = await db.contacts.count_documents(query)
-        cursor = db.contacts.find(
-            query,
+        contacts_cursor = db.contacts.find(
+            page_query,
             {"_id": 1, "name": 1, "email": 1, "phone": 1, "service": 1, 
              "message": 1, "submitted_at": 1, "status": 1, "email_sent": 1}
-        ).sort("submitted_at", -1).skip(skip).limit(limit)
-        contacts = await cursor.to_list(length=limit)
+        ).sort([("submitted_at", -1), ("_id", -1)]).skip(skip).limit(limit + 1)
         
-        return {
+        if include_total:
+            total, contacts = await asyncio.gather(
+                count_cache.count(db.contacts, query),
+                contacts_cursor.to_list(length=limit + 1)
+            )
+        else:
+            total, contacts = None, await contacts_cursor.to_list(length=limit + 1)
+        cursor_next = next_cursor(contacts, limit, "submitted_at")
+        
+        return FastJSONResponse({
             "success": True,
-            "data": [serialize_doc(contact) for contact in contacts],
+            "data": [prepare_doc(contact) for contact in contacts],
             "total": total,
             "page": page,
             "limit": limit,
-            "pages": (total + limit - 1) // limit
-        }
+            "pages": (total + limit - 1) // limit if total is not None else None,
+            "next_cursor": cursor_next
+        })
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching contacts: {str(e)}")
         raise HTTPException(
@@ -1254,6 +1487,8 @@ async def update_contact_status(contact_id: str, status_value: str):
                 detail="Contact not found"
             )
         
+        await content_changed("contacts")
+        
         return {"success": True, "message": "Contact status updated"}
         
     except HTTPException:
@@ -1266,6 +1501,104 @@ async def update_contact_status(contact_id: str, status_value: str):
         )
 
 
+# ============= ADMIN: RUNTIME STATS =============
+
+@api_router.get("/admin/auth/stats", dependencies=[Depends(get_current_user)])
+async def get_auth_stats():
+    """Password hashing pool and token cache metrics (Admin only)"""
+    return {
+        "success": True,
+        "password_hasher": password_hasher.stats(),
+        "token_cache": token_cache.stats()
+    }
+
+
+@api_router.get("/admin/cache/stats", dependencies=[Depends(get_current_user)])
+async def get_cache_stats():
+    """Response and count cache hit/miss metrics (Admin only)"""
+    return {
+        "success": True,
+        "response_cache": response_cache.stats(),
+        "count_cache": {"hits": count_cache.hits, "misses": count_cache.misses},
+        "http_cache": {"not_modified": http_cache.not_modified, "cdn_purge": cdn_purger.stats()},
+        "compression": compressor.stats(),
+        "catalog": catalog_store.stats(),
+        "external_profile": profile_refresher.stats(),
+        "sitemap": sitemap.stats(),
+        "prerender": prerenderer.stats(),
+        "search": site_search.stats()
+    }
+
+
+@api_router.get("/admin/queries/stats", dependencies=[Depends(get_current_user)])
+async def get_query_stats():
+    """Slow query count and recent query budget violations (Admin only)"""
+    return {
+        "success": True,
+        **query_monitor.stats()
+    }
+
+
+# ============= METRICS =============
+
+request_metrics.registry.callback_gauge(
+    "response_cache_lookups", "Response cache lookups by result",
+    lambda: {("hit",): response_cache.hits, ("miss",): response_cache.misses}, ("result",)
+)
+request_metrics.registry.callback_gauge(
+    "count_cache_lookups", "List total cache lookups by result",
+    lambda: {("hit",): count_cache.hits, ("miss",): count_cache.misses}, ("result",)
+)
+request_metrics.registry.callback_gauge(
+    "password_hash_pending", "Password hashing calls queued or running",
+    lambda: password_hasher.stats()["pending"]
+)
+request_metrics.registry.callback_gauge(
+    "password_hash_rejected", "Password hashing calls rejected as busy",
+    lambda: password_hasher.rejected
+)
+request_metrics.registry.callback_gauge(
+    "compression_bytes", "Response bytes before and after compression",
+    lambda: {("in",): compressor.bytes_in, ("out",): compressor.bytes_out}, ("stage",)
+)
+request_metrics.registry.callback_gauge(
+    "compression_cache_lookups", "Compressed body cache lookups by result",
+    lambda: {("hit",): compressor.cache_hits, ("miss",): compressor.cache_misses}, ("result",)
+)
+request_metrics.registry.callback_gauge(
+    "compression_cpu_seconds", "CPU time spent compressing responses",
+    lambda: compressor.compress_seconds
+)
+request_metrics.registry.callback_gauge(
+    "service_ready", "1 when the readiness probe passes",
+    lambda: int(health_monitor.is_ready())
+)
+request_metrics.registry.callback_gauge(
+    "mongo_ping_seconds", "Latency of the last successful MongoDB ping",
+    lambda: health_monitor.mongo_latency or 0.0
+)
+request_metrics.registry.callback_gauge(
+    "event_loop_lag_seconds", "Worst recent event loop scheduling delay",
+    lambda: health_monitor.loop_lag
+)
+request_metrics.registry.callback_gauge(
+    "mongo_pool_connections", "MongoDB pool connections by state",
+    lambda: {("open",): pool_stats.open, ("checked_out",): pool_stats.checked_out}, ("state",)
+)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request):
+    """Prometheus scrape endpoint; requires `Bearer $METRICS_TOKEN` when that is set"""
+    token = os.environ.get('METRICS_TOKEN')
+    if token and request.headers.get("authorization") != f"Bearer {token}":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token"
+        )
+    return Response(content=request_metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -1278,9 +1611,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(QueryMonitorMiddleware, monitor=query_monitor)
+
+app.add_middleware(CompressionMiddleware, compressor=compressor)
+
+# Outermost, so request timing includes every other middleware
+app.add_middleware(MetricsMiddleware, metrics=request_metrics)
+
+
+@app.on_event("startup")
+async def start_background_workers():
+    # Refuse to serve until MongoDB answers and every index the queries rely on exists
+    await health_monitor.wait_for_mongo()
+    await ensure_indexes(db)
+    await backfill_teasers(db)
+    await prerenderer.backfill()
+    await email_outbox.start()
+    await blog_view_counter.start()
+    await catalog_store.start()
+    await profile_refresher.start()
+    await sitemap.start()
+    await site_search.start()
+    await health_monitor.start()
+
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await health_monitor.stop()
+    await email_outbox.stop()
+    await blog_view_counter.stop()
+    await catalog_store.stop()
+    await profile_refresher.stop()
+    await sitemap.stop()
+    await site_search.stop()
+    await cdn_purger.close()
+    password_hasher.shutdown()
     client.close()
 
 
@@ -0,0 +1,297 @@
+"""
+Sitemap
+sitemap.xml generated from published blog posts and case studies, stored as
+gzip-compressed documents and rebuilt per section after content changes
+"""
+import io
+import os
+import gzip
+import asyncio
+import hashlib
+import logging
+import contextvars
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin
+from xml.sax.saxutils import escape
+
+logger = logging.getLogger(__name__)
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+IMAGE_NS = "http://www.google.com/schemas/sitemap-image/1.1"
+
+# Protocol limits: URLs per sitemap file, images per URL
+MAX_URLS = 50000
+MAX_IMAGES = 1000
+
+DEFAULT_SITE_URL = "https://myinboxmedia.com"
+
+# Frontend routes worth indexing: path, changefreq, priority
+STATIC_PAGES = (
+    ("/", "daily", "1.0"),
+    ("/about", "monthly", "0.9"),
+    ("/services", "weekly", "0.9"),
+    ("/clients", "monthly", "0.8"),
+    ("/blog", "daily", "0.8"),
+    ("/case-studies", "weekly", "0.8"),
+    ("/testimonials", "monthly", "0.7"),
+    ("/careers", "weekly", "0.7"),
+    ("/contact", "monthly", "0.8"),
+)
+
+# Content sections: collection, frontend path prefix, changefreq, priority
+CONTENT_SECTIONS = {
+    "blog": ("blog_posts", "/blog/", "monthly", "0.7"),
+    "case-studies": ("case_studies", "/case-studies/", "monthly", "0.7"),
+}
+PAGES = "pages"
+
+Entry = Tuple[str, Optional[datetime], str, str, List[str]]  # loc, lastmod, changefreq, priority, images
+
+
+def w3c_date(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%S+00:00")
+
+
+def render_url(loc: str, lastmod: Optional[datetime], changefreq: str, priority: str,
+               images: Iterable[str] = ()) -> bytes:
+    parts = [f"<url><loc>{escape(loc)}</loc>"]
+    if lastmod is not None:
+        parts.append(f"<lastmod>{w3c_date(lastmod)}</lastmod>")
+    parts.append(f"<changefreq>{changefreq}</changefreq><priority>{priority}</priority>")
+    for image in list(images)[:MAX_IMAGES]:
+        parts.append(f"<image:image><image:loc>{escape(image)}</image:loc></image:image>")
+    parts.append("</url>\n")
+    return "".join(parts).encode()
+
+
+class SitemapFile:
+    """One gzip-compressed XML document with its validators"""
+
+    __slots__ = ("body", "etag", "last_modified", "urls")
+
+    def __init__(self, body: bytes, urls: int, last_modified: Optional[datetime]):
+        self.body = body
+        self.urls = urls
+        self.last_modified = last_modified
+        self.etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+class _GzipDocument:
+    """Streams XML into a gzip buffer so only the compressed bytes are held"""
+
+    def __init__(self, opening: str, closing: str):
+        self._buffer = io.BytesIO()
+        # mtime=0 keeps the bytes (and so the ETag) identical across workers
+        self._gzip = gzip.GzipFile(fileobj=self._buffer, mode="wb", compresslevel=9, mtime=0)
+        self._gzip.write(f'<?xml version="1.0" encoding="UTF-8"?>\n{opening}\n'.encode())
+        self._closing = closing
+        self.urls = 0
+        self.last_modified: Optional[datetime] = None
+
+    def write(self, chunk: bytes, lastmod: Optional[datetime]):
+        self._gzip.write(chunk)
+        self.urls += 1
+        if lastmod is not None and (self.last_modified is None or lastmod > self.last_modified):
+            self.last_modified = lastmod
+
+    def close(self) -> SitemapFile:
+        self._gzip.write(f"{self._closing}\n".encode())
+        self._gzip.close()
+        return SitemapFile(self._buffer.getvalue(), self.urls, self.last_modified)
+
+
+def _urlset() -> _GzipDocument:
+    return _GzipDocument(f'<urlset xmlns="{SITEMAP_NS}" xmlns:image="{IMAGE_NS}">', "</urlset>")
+
+
+class Sitemap:
+    """
+    sitemap.xml for the public site.
+
+    Up to MAX_URLS URLs it is a single urlset. Beyond that, sitemap.xml
+    becomes a sitemap index over `/api/sitemaps/<section>-<n>.xml` parts, and a
+    content change only re-renders the parts of the affected section. Entries
+    are streamed from MongoDB straight into gzip, so memory stays bounded by
+    the compressed output, and the stored bytes are served as-is.
+    """
+
+    def __init__(self, db, site_url: Optional[str] = None, max_urls: int = None,
+                 page_images: Optional[Callable[[], Dict[str, List[str]]]] = None,
+                 debounce: float = None):
+        self.db = db
+        self.site_url = (site_url or os.getenv("SITE_URL", DEFAULT_SITE_URL)).rstrip("/")
+        self.max_urls = max_urls or int(os.getenv("SITEMAP_MAX_URLS", str(MAX_URLS)))
+        self.page_images = page_images
+        if debounce is None:
+            debounce = float(os.getenv("SITEMAP_REBUILD_DELAY", "2"))
+        self.debounce = debounce
+
+        self.files: Dict[str, SitemapFile] = {}
+        self._parts: Dict[str, List[SitemapFile]] = {}
+        self._section_lastmod: Dict[str, Optional[datetime]] = {}
+        self._dirty = {PAGES, *CONTENT_SECTIONS}
+        self._indexed = False
+        self._pending: Optional[asyncio.Task] = None
+        self.builds = 0
+        self.sections_rendered = 0
+
+    # ---------- sources ----------
+
+    def _absolute(self, url: str) -> str:
+        return urljoin(self.site_url + "/", url)
+
+    async def _section_entries(self, section: str) -> AsyncIterator[Entry]:
+        collection, prefix, changefreq, priority = CONTENT_SECTIONS[section]
+        cursor = self.db[collection].find(
+            {"published": True}, {"_id": 0, "slug": 1, "updated_at": 1, "featured_image": 1}
+        ).sort("created_at", -1)
+        async for doc in cursor:
+            images = [self._absolute(doc["featured_image"])] if doc.get("featured_image") else []
+            yield self._absolute(prefix + doc["slug"]), doc.get("updated_at"), changefreq, priority, images
+
+    async def _page_entries(self) -> AsyncIterator[Entry]:
+        images = self.page_images() if self.page_images else {}
+        listing = {prefix.rstrip("/"): section for section, (_, prefix, _, _) in CONTENT_SECTIONS.items()}
+        for path, changefreq, priority in STATIC_PAGES:
+            lastmod = self._section_lastmod.get(listing[path]) if path in listing else None
+            yield (self._absolute(path), lastmod, changefreq, priority,
+                   [self._absolute(image) for image in images.get(path, ())])
+
+    def _entries(self, section: str) -> AsyncIterator[Entry]:
+        return self._page_entries() if section == PAGES else self._section_entries(section)
+
+    async def _render(self, section: str, documents: List[_GzipDocument]):
+        """Append the section's URLs to `documents`, starting a new one at max_urls"""
+        newest = None
+        async for loc, lastmod, changefreq, priority, images in self._entries(section):
+            if documents[-1].urls >= self.max_urls:
+                documents.append(_urlset())
+            documents[-1].write(render_url(loc, lastmod, changefreq, priority, images), lastmod)
+            if lastmod is not None and (newest is None or lastmod > newest):
+                newest = lastmod
+        if section != PAGES:
+            self._section_lastmod[section] = newest
+        self.sections_rendered += 1
+
+    # ---------- building ----------
+
+    async def _url_count(self) -> int:
+        total = len(STATIC_PAGES)
+        for collection, _, _, _ in CONTENT_SECTIONS.values():
+            total += await self.db[collection].count_documents({"published": True})
+        return total
+
+    async def build(self):
+        """Re-render whatever changed since the last build"""
+        dirty, self._dirty = self._dirty, set()
+        try:
+            indexed = await self._url_count() > self.max_urls
+            if not indexed:
+                # Single urlset: small enough to re-render as a whole
+                documents = [_urlset()]
+                for section in (*CONTENT_SECTIONS, PAGES):
+                    await self._render(section, documents)
+                # Posts published since the count can still tip it over the limit
+                indexed = len(documents) > 1
+                if not indexed:
+                    self._parts = {}
+                    self.files = {"sitemap": documents[0].close()}
+            if indexed:
+                if not self._indexed:
+                    dirty = {PAGES, *CONTENT_SECTIONS}
+                # Listing pages carry their section's newest lastmod
+                if dirty & set(CONTENT_SECTIONS):
+                    dirty.add(PAGES)
+                for section in (*CONTENT_SECTIONS, PAGES):
+                    if section in dirty:
+                        documents = [_urlset()]
+                        await self._render(section, documents)
+                        self._parts[section] = [document.close() for document in documents]
+                self.files = self._index_files()
+            self._indexed = indexed
+            self.builds += 1
+        except Exception:
+            self._dirty |= dirty
+            raise
+
+    def _index_files(self) -> Dict[str, SitemapFile]:
+        files = {}
+        index = _GzipDocument(f'<sitemapindex xmlns="{SITEMAP_NS}">', "</sitemapindex>")
+        for section in (PAGES, *CONTENT_SECTIONS):
+            for number, part in enumerate(self._parts.get(section, ()), start=1):
+                if not part.urls:
+                    continue
+                name = f"{section}-{number}"
+                files[name] = part
+                entry = f"<sitemap><loc>{escape(self._absolute(f'/api/sitemaps/{name}.xml'))}</loc>"
+                if part.last_modified is not None:
+                    entry += f"<lastmod>{w3c_date(part.last_modified)}</lastmod>"
+                index.write(f"{entry}</sitemap>\n".encode(), part.last_modified)
+        files["sitemap"] = index.close()
+        return files
+
+    async def get(self, name: str = "sitemap") -> Optional[SitemapFile]:
+        """The named document; between a change and its rebuild the previous version is served"""
+        if not self.files or (self._dirty and self._pending is None):
+            task = self._schedule(0)
+            if not self.files:
+                await asyncio.shield(task)
+        return self.files.get(name)
+
+    # ---------- invalidation ----------
+
+    def invalidate(self, collection_name: Optional[str] = None):
+        """Mark the section backed by `collection_name` (all if None) for a debounced rebuild"""
+        if collection_name is None:
+            self._dirty |= {PAGES, *CONTENT_SECTIONS}
+        else:
+            sections = {s for s, (collection, *_) in CONTENT_SECTIONS.items() if collection == collection_name}
+            if not sections:
+                return
+            self._dirty |= sections
+        self._schedule(self.debounce)
+
+    def _schedule(self, delay: float) -> asyncio.Task:
+        if self._pending is None:
+            # Fresh context: the rebuild's queries don't count against the request that triggered it
+            self._pending = contextvars.Context().run(asyncio.create_task, self._rebuild(delay))
+        return self._pending
+
+    async def _rebuild(self, delay: float):
+        ok = False
+        try:
+            await asyncio.sleep(delay)
+            await self.build()
+            ok = True
+        except Exception as e:
+            logger.error(f"Sitemap rebuild failed: {str(e)}")
+        finally:
+            self._pending = None
+        # Changes that arrived mid-build; after a failure the next request retries
+        if ok and self._dirty:
+            self._schedule(self.debounce)
+
+    async def start(self):
+        """Build in the background so the first crawler hit doesn't pay for it"""
+        self._schedule(0)
+
+    async def stop(self):
+        if self._pending is not None:
+            self._pending.cancel()
+            try:
+                await self._pending
+            except asyncio.CancelledError:
+                pass
+            self._pending = None
+
+    def stats(self) -> dict:
+        return {
+            "mode": "index" if self._indexed else "urlset",
+            "files": len(self.files),
+            "urls": sum(f.urls for name, f in self.files.items() if name != "sitemap" or not self._indexed),
+            "bytes": sum(len(f.body) for f in self.files.values()),
+            "builds": self.builds,
+            "sections_rendered": self.sections_rendered,
+            "dirty": sorted(self._dirty),
+        }
@@ -0,0 +1,97 @@
+"""
+Blog View Counter
+Buffers per-slug view increments in memory and flushes them in batches
+"""
+import os
+import asyncio
+import logging
+from collections import Counter
+from typing import Optional
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """
+    In-process aggregator for blog post views.
+
+    `record` only bumps an in-memory counter, so GET /api/blog/{slug} stays
+    read-only. Pending counts are written with a single unordered `bulk_write`
+    of `$inc` operations every `flush_interval` seconds, as soon as
+    `flush_threshold` views are buffered, and once more on shutdown.
+    """
+
+    def __init__(self, collection, key_field: str = "slug", counter_field: str = "views"):
+        self.collection = collection
+        self.key_field = key_field
+        self.counter_field = counter_field
+        self.flush_interval = float(os.getenv("BLOG_VIEWS_FLUSH_INTERVAL", "10"))
+        self.flush_threshold = int(os.getenv("BLOG_VIEWS_FLUSH_THRESHOLD", "1000"))
+
+        self._pending = Counter()
+        self._buffered = 0
+        self._flush_lock = asyncio.Lock()
+        self._threshold_reached = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def record(self, key: str, count: int = 1):
+        """Buffer `count` views for `key`"""
+        self._pending[key] += count
+        self._buffered += count
+        if self._buffered >= self.flush_threshold:
+            self._threshold_reached.set()
+
+    async def flush(self) -> int:
+        """Write buffered increments to MongoDB; returns the number of documents touched"""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            # Swap the buffer first so views recorded during the write go to the next batch
+            batch, self._pending = self._pending, Counter()
+            self._buffered = 0
+            self._threshold_reached.clear()
+
+            operations = [
+                UpdateOne({self.key_field: key}, {"$inc": {self.counter_field: count}})
+                for key, count in batch.items()
+            ]
+            try:
+                await self.collection.bulk_write(operations, ordered=False)
+            except Exception as e:
+                # Put the counts back so they are retried with the next flush
+                self._pending.update(batch)
+                self._buffered += sum(batch.values())
+                logger.error(f"Error flushing view counts: {str(e)}")
+                return 0
+
+            return len(operations)
+
+    async def start(self):
+        """Start the periodic flush loop"""
+        if self._runner is not None:
+            return
+        self._stopping = False
+        self._runner = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush loop and write out anything still buffered"""
+        if self._runner is not None:
+            self._stopping = True
+            self._threshold_reached.set()
+            await self._runner
+            self._runner = None
+        await self.flush()
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._threshold_reached.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._stopping:
+                return
+            await self.flush()
@@ -14,7 +14,7 @@ const CaseStudiesPage = () => {
 
   const fetchCaseStudies = async () => {
     try {
-      const response = await apiService.getCaseStudies({ published_only: true });
+      const response = await apiService.getCaseStudies({ published_only: true, view: 'summary' });
       setCaseStudies(response.data.data);
     } catch (error) {
       console.error('Error fetching case studies:', error);
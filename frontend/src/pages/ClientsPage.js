@@ -104,16 +104,29 @@ const ClientsPage = () => {
                   whileHover={{ scale: 1.05 }}
                 >
                   <div className="client-logo-card" data-testid={`client-${index}`}>
-                    <img
-                      src={client.logo_url}
-                      alt={client.name || 'Client logo'}
-                      className="client-logo-img"
-                      loading="lazy"
-                      onError={(e) => {
-                        console.log('Failed to load:', client.logo_url);
-                        e.target.style.display = 'none';
-                      }}
-                    />
+                    <picture>
+                      {(client.sources || []).map((source) => (
+                        <source
+                          key={source.type}
+                          type={source.type}
+                          srcSet={source.srcset}
+                          sizes="160px"
+                        />
+                      ))}
+                      <img
+                        src={client.logo_url}
+                        width={client.width}
+                        height={client.height}
+                        alt={client.name || 'Client logo'}
+                        className="client-logo-img"
+                        loading="lazy"
+                        decoding="async"
+                        onError={(e) => {
+                          console.log('Failed to load:', client.logo_url);
+                          e.target.style.display = 'none';
+                        }}
+                      />
+                    </picture>
                   </div>
                 </motion.div>
               ))}
@@ -3,26 +3,35 @@ import { Link } from 'react-router-dom';
 import { motion } from 'framer-motion';
 import CountUp from 'react-countup';
 import Tilt from 'react-parallax-tilt';
-import { ArrowRight, Globe, Users, Building2, TrendingUp, MessageCircle, Mail, Send, Sparkles } from 'lucide-react';
+import { ArrowRight, Globe, Users, Building2, TrendingUp, MessageCircle, Mail, Send, Sparkles, Quote, Star, Calendar } from 'lucide-react';
+import { format } from 'date-fns';
 import { apiService } from '../utils/api';
 import BookMeetingPopup from '../components/BookMeetingPopup';
 
 const HomePage = () => {
   const [services, setServices] = useState([]);
+  const [clients, setClients] = useState([]);
+  const [testimonials, setTestimonials] = useState([]);
+  const [posts, setPosts] = useState([]);
   const [loading, setLoading] = useState(true);
   const [expandedMobile, setExpandedMobile] = useState(null);
   const [showMeetingPopup, setShowMeetingPopup] = useState(false);
 
   useEffect(() => {
-    fetchServices();
+    fetchHomePage();
   }, []);
 
-  const fetchServices = async () => {
+  // Everything below the hero comes from the one /api/pages/home response
+  const fetchHomePage = async () => {
     try {
-      const response = await apiService.getServices();
-      setServices(response.data.data); // Show ALL services on homepage
+      const response = await apiService.getHomePage();
+      const data = response.data.data;
+      setServices(data.services); // Show ALL services on homepage
+      setClients(data.clients || []);
+      setTestimonials(data.testimonials || []);
+      setPosts(data.posts || []);
     } catch (error) {
-      console.error('Error fetching services:', error);
+      console.error('Error fetching home page:', error);
     } finally {
       setLoading(false);
     }
@@ -203,6 +212,124 @@ const HomePage = () => {
         </div>
       </section>
 
+      {/* Clients Strip */}
+      {clients.length > 0 && (
+        <section className="content-section home-clients-section">
+          <div className="container">
+            <div className="section-header">
+              <h2 className="section-title">Trusted By</h2>
+            </div>
+            <div className="clients-grid">
+              {clients.slice(0, 12).map((client, index) => (
+                <div className="client-logo-card" key={index} data-testid={`home-client-${index}`}>
+                  <picture>
+                    {(client.sources || []).map((source) => (
+                      <source key={source.type} type={source.type} srcSet={source.srcset} sizes="160px" />
+                    ))}
+                    <img
+                      src={client.logo_url}
+                      width={client.width}
+                      height={client.height}
+                      alt={client.name || 'Client logo'}
+                      className="client-logo-img"
+                      loading="lazy"
+                      decoding="async"
+                    />
+                  </picture>
+                </div>
+              ))}
+            </div>
+            <div className="section-cta">
+              <Link to="/clients" className="btn btn-secondary">
+                View All Clients
+                <ArrowRight size={20} />
+              </Link>
+            </div>
+          </div>
+        </section>
+      )}
+
+      {/* Featured Testimonials */}
+      {testimonials.length > 0 && (
+        <section className="content-section home-testimonials-section">
+          <div className="container">
+            <div className="section-header">
+              <h2 className="section-title">What Our Clients Say</h2>
+            </div>
+            <div className="testimonials-grid">
+              {testimonials.map((testimonial, index) => (
+                <motion.div
+                  key={testimonial.id}
+                  initial={{ opacity: 0, y: 20 }}
+                  whileInView={{ opacity: 1, y: 0 }}
+                  transition={{ delay: index * 0.05 }}
+                  viewport={{ once: true }}
+                >
+                  <div className="testimonial-card" data-testid={`home-testimonial-${index}`}>
+                    <Quote className="testimonial-quote-icon" size={40} />
+                    <div className="testimonial-rating">
+                      {Array.from({ length: 5 }, (_, i) => (
+                        <Star
+                          key={i}
+                          size={18}
+                          fill={i < testimonial.rating ? '#E55227' : 'none'}
+                          stroke={i < testimonial.rating ? '#E55227' : '#D1D5DB'}
+                        />
+                      ))}
+                    </div>
+                    <p className="testimonial-text">{testimonial.teaser}</p>
+                    <div className="testimonial-author">
+                      {testimonial.client_image && (
+                        <img src={testimonial.client_image} alt={testimonial.client_name} className="testimonial-avatar" />
+                      )}
+                      <div>
+                        <h4>{testimonial.client_name}</h4>
+                        <p>{testimonial.client_position}</p>
+                        <p className="testimonial-company">{testimonial.client_company}</p>
+                      </div>
+                    </div>
+                  </div>
+                </motion.div>
+              ))}
+            </div>
+          </div>
+        </section>
+      )}
+
+      {/* Latest Posts */}
+      {posts.length > 0 && (
+        <section className="content-section home-posts-section">
+          <div className="container">
+            <div className="section-header">
+              <h2 className="section-title">Latest from the Blog</h2>
+            </div>
+            <div className="blog-grid">
+              {posts.map((post, index) => (
+                <Link key={post.id} to={`/blog/${post.slug}`} className="blog-card" data-testid={`home-post-${index}`}>
+                  {post.featured_image && (
+                    <img src={post.featured_image} alt={post.title} className="blog-card-image" loading="lazy" />
+                  )}
+                  <div className="blog-card-content">
+                    <div className="blog-card-meta">
+                      <span>
+                        <Calendar size={16} />
+                        {format(new Date(post.created_at), 'MMM dd, yyyy')}
+                      </span>
+                    </div>
+                    <h3 className="blog-card-title">{post.title}</h3>
+                    <p className="blog-card-excerpt">{post.teaser}</p>
+                    <span className="blog-card-link">
+                      Read More
+                      <ArrowRight size={16} />
+                    </span>
+                  </div>
+                </Link>
+              ))}
+            </div>
+          </div>
+        </section>
+      )}
+
       {/* CTA Section */}
       <section className="cta-section">
         <div className="container">
@@ -23,6 +23,9 @@ api.interceptors.request.use(
 
 // API functions
 export const apiService = {
+  // Pages
+  getHomePage: () => api.get('/api/pages/home'),
+  
   // External data
   getServices: () => api.get('/api/external/services'),
   getClients: () => api.get('/api/external/clients'),
@@ -42,6 +45,7 @@ export const apiService = {
   // Blog
   getBlogPosts: (params) => api.get('/api/blog', { params }),
   getBlogPost: (slug) => api.get(`/api/blog/${slug}`),
+  getBlogPostsBySlug: (slugs) => api.get('/api/batch/blog', { params: { slugs: slugs.join(',') } }),
   
   // Testimonials
   getTestimonials: (params) => api.get('/api/testimonials', { params }),
@@ -49,6 +53,10 @@ export const apiService = {
   // Case Studies
   getCaseStudies: (params) => api.get('/api/case-studies', { params }),
   getCaseStudy: (slug) => api.get(`/api/case-studies/${slug}`),
+  getCaseStudiesBySlug: (slugs) => api.get('/api/batch/case-studies', { params: { slugs: slugs.join(',') } }),
+  
+  // Search
+  search: (params) => api.get('/api/search', { params }),
   
   // Auth
   login: (credentials) => api.post('/api/auth/login', credentials),
@@ -0,0 +1,23 @@
+"""
+Shared pytest configuration
+Makes the flat backend modules importable the same way server.py imports them
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# auth.py refuses to import without a signing key
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+
+
+@pytest.fixture(scope="session")
+def server():
+    """server.py imported against mongomock-motor, the way benchmark.py runs it"""
+    pytest.importorskip("mongomock_motor")
+    from benchmark import load_app
+    return load_app()
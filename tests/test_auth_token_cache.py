@@ -0,0 +1,79 @@
+"""
+Unit tests for the verified JWT cache in auth.get_current_user
+"""
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+import auth
+
+
+def current_user(token):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return asyncio.run(auth.get_current_user(credentials))
+
+
+def test_repeated_token_is_served_from_cache(monkeypatch):
+    monkeypatch.setattr(auth, "token_cache", auth.TokenCache(max_entries=8))
+    token = auth.create_access_token({"sub": "admin@example.com"})
+
+    assert current_user(token) == {"email": "admin@example.com"}
+
+    def fail_decode(*args, **kwargs):
+        raise AssertionError("cached token must not be decoded again")
+
+    monkeypatch.setattr(auth.jwt, "decode", fail_decode)
+    assert current_user(token) == {"email": "admin@example.com"}
+    assert auth.token_cache.stats()["hits"] == 1
+
+
+def test_expired_entry_is_not_served():
+    cache = auth.TokenCache(max_entries=8)
+    cache.put("token", "admin@example.com", time.time() - 1)
+
+    assert cache.get("token") is None
+
+
+def test_cache_is_bounded():
+    cache = auth.TokenCache(max_entries=2)
+    for i in range(3):
+        cache.put(f"token-{i}", "admin@example.com", time.time() + 60)
+
+    assert cache.get("token-0") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalid_token_is_rejected_and_not_cached(monkeypatch):
+    monkeypatch.setattr(auth, "token_cache", auth.TokenCache(max_entries=8))
+    expired = auth.create_access_token({"sub": "admin@example.com"}, timedelta(seconds=-5))
+
+    with pytest.raises(HTTPException):
+        current_user(expired)
+    assert auth.token_cache.stats()["entries"] == 0
+
+
+def test_cached_token_expires_with_its_exp_claim(monkeypatch):
+    monkeypatch.setattr(auth, "token_cache", auth.TokenCache(max_entries=8))
+    token = auth.create_access_token({"sub": "admin@example.com"}, timedelta(seconds=30))
+    assert current_user(token) == {"email": "admin@example.com"}
+
+    entry_expiry = next(iter(auth.token_cache._entries.values()))[0]
+    assert abs(entry_expiry - (time.time() + 30)) < 5
+
+    # Past exp the cache misses, and jwt.decode then rejects the token
+    now = time.time()
+    monkeypatch.setattr(auth.time, "time", lambda: now + 60)
+    assert auth.token_cache.get(token) is None
+    assert auth.token_cache.stats()["entries"] == 0
+
+
+def test_token_without_exp_is_not_cached(monkeypatch):
+    monkeypatch.setattr(auth, "token_cache", auth.TokenCache(max_entries=8))
+    token = auth.jwt.encode({"sub": "admin@example.com"}, auth.SECRET_KEY, algorithm=auth.ALGORITHM)
+
+    assert current_user(token) == {"email": "admin@example.com"}
+    assert auth.token_cache.stats()["entries"] == 0
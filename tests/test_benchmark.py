@@ -0,0 +1,61 @@
+"""
+Tests for the benchmark harness's baseline comparison and the committed baseline
+"""
+import json
+from itertools import count
+
+from benchmark import DEFAULT_BASELINE, build_scenarios, compare, machine_factor
+
+
+def stats(p50, p95, rps, alloc=50.0):
+    return {"p50_ms": p50, "p95_ms": p95, "p99_ms": p95, "throughput_rps": rps, "alloc_peak_kib": alloc, "errors": 0}
+
+
+BASELINE = {
+    "fast": stats(0.5, 0.6, 2000),
+    "list": stats(5.0, 8.0, 400),
+    "write": stats(80.0, 120.0, 150),
+}
+
+
+def test_unchanged_results_pass():
+    assert compare(BASELINE, BASELINE, 0.25) == []
+
+
+def test_regressions_are_flagged_per_metric():
+    results = dict(BASELINE, list=stats(5.0, 14.0, 400), write=stats(80.0, 120.0, 90, alloc=90.0))
+    assert compare(results, BASELINE, 0.25) == [
+        "list: p95 8.00 -> 14.00 ms",
+        "write: throughput 150.0 -> 90.0 req/s",
+        "write: allocations 50.0 -> 90.0 KiB",
+    ]
+
+
+def test_uniformly_slower_run_and_sub_millisecond_jitter_are_not_regressions():
+    # The whole run is twice as slow (another machine or a busy one)
+    slower = {name: stats(s["p50_ms"] * 2, s["p95_ms"] * 2, s["throughput_rps"] / 2) for name, s in BASELINE.items()}
+    assert machine_factor(slower, BASELINE) == 2.0
+    assert compare(slower, BASELINE, 0.25) == []
+
+    jitter = dict(BASELINE, fast=stats(0.5, 1.1, 2000))
+    assert compare(jitter, BASELINE, 0.25) == []
+    # New endpoints have nothing to compare against
+    assert compare(dict(BASELINE, new=stats(1, 1, 1)), BASELINE, 0.25) == []
+
+
+def test_faster_run_does_not_tighten_the_baseline():
+    # Fast routes sped up, the write route did not: not a regression
+    faster = dict(BASELINE, fast=stats(0.25, 0.3, 4000), list=stats(2.5, 4.0, 800))
+    assert machine_factor(faster, BASELINE) == 0.5
+    assert compare(faster, BASELINE, 0.25) == []
+    assert compare(dict(faster, write=stats(80.0, 160.0, 150)), BASELINE, 0.25) == ["write: p95 120.00 -> 160.00 ms"]
+
+
+def test_committed_baseline_covers_every_scenario():
+    ids = {"post": "p", "case_study": "c", "contact": "x", "testimonial": "t",
+           "spare_posts": count(), "spare_case_studies": count(), "spare_testimonials": count()}
+    names = {scenario[0] for scenario in build_scenarios(ids)}
+    baseline = json.loads(DEFAULT_BASELINE.read_text())
+
+    assert set(baseline) == names
+    assert all(result["errors"] == 0 for result in baseline.values())
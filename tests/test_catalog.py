@@ -0,0 +1,128 @@
+"""
+Unit tests for the hot-reloaded service & client catalog
+"""
+import asyncio
+import json
+import os
+
+import pytest
+
+from catalog import CatalogError, CatalogStore, parse_catalog
+
+
+def write_catalog(path, version, title="SMS Solutions"):
+    path.write_text(json.dumps({
+        "version": version,
+        "services": [{"title": title, "features": []}],
+        "clients": [{"name": "Acme", "logo_url": "/client-logos/acme.png"}],
+    }))
+    # Make the change visible to mtime-based polling even within one tick
+    os.utime(path, ns=(version * 10 ** 9, version * 10 ** 9))
+
+
+def test_parse_catalog_rejects_invalid_documents():
+    with pytest.raises(CatalogError, match="version"):
+        parse_catalog(b'{"services": [], "clients": []}')
+    with pytest.raises(CatalogError, match=r"clients\[0\]"):
+        parse_catalog(b'{"version": 1, "services": [], "clients": [{"name": "x"}]}')
+    with pytest.raises(CatalogError, match="invalid JSON"):
+        parse_catalog(b'{"version": 1,')
+
+
+def test_reload_swaps_snapshot_and_etag(tmp_path):
+    path = tmp_path / "catalog.json"
+    write_catalog(path, 1)
+    store = CatalogStore(path, poll_interval=0)
+    first = store.snapshot
+
+    assert store.reload() is False  # unchanged
+    write_catalog(path, 2, title="WhatsApp Solutions")
+    assert store.reload() is True
+
+    assert first.version == 1 and b"SMS Solutions" in first.services.body
+    assert store.snapshot.version == 2 and b"WhatsApp Solutions" in store.snapshot.services.body
+    assert store.snapshot.services.etag.startswith('"services-v2-')
+    assert store.snapshot.services.etag != first.services.etag
+
+
+def test_invalid_edit_keeps_previous_snapshot(tmp_path):
+    path = tmp_path / "catalog.json"
+    write_catalog(path, 1)
+    store = CatalogStore(path, poll_interval=0)
+
+    path.write_text('{"version": 2, "services": ')
+    assert store.reload() is False
+
+    assert store.snapshot.version == 1
+    assert store.errors == 1
+
+
+def test_clients_are_decorated_per_snapshot(tmp_path):
+    path = tmp_path / "catalog.json"
+    write_catalog(path, 1)
+
+    def decorate(clients):
+        return [dict(client, width=200) for client in clients]
+
+    store = CatalogStore(path, decorate_clients=decorate, poll_interval=0)
+
+    assert json.loads(store.snapshot.clients.body)["data"][0]["width"] == 200
+
+
+def test_dependency_change_rebuilds_the_snapshot(tmp_path):
+    path, manifest = tmp_path / "catalog.json", tmp_path / "manifest.json"
+    write_catalog(path, 1)
+
+    def decorate(clients):
+        width = json.loads(manifest.read_text())["width"] if manifest.exists() else None
+        return [dict(client, width=width) for client in clients]
+
+    store = CatalogStore(path, decorate_clients=decorate, poll_interval=0, depends_on=(manifest,))
+    etag = store.snapshot.clients.etag
+    assert json.loads(store.snapshot.clients.body)["data"][0]["width"] is None
+
+    # The logo pipeline writes its manifest; the catalog itself is unchanged
+    manifest.write_text('{"width": 160}')
+    assert store._stat() != store._signature
+    assert store.reload()
+    assert json.loads(store.snapshot.clients.body)["data"][0]["width"] == 160
+    assert store.snapshot.version == 1 and store.snapshot.clients.etag != etag
+    assert not store.reload()
+
+
+def test_watcher_picks_up_file_changes(tmp_path):
+    path = tmp_path / "catalog.json"
+    write_catalog(path, 1)
+
+    async def scenario():
+        store = CatalogStore(path, poll_interval=0.01)
+        await store.start()
+        write_catalog(path, 3)
+        for _ in range(100):
+            if store.snapshot.version == 3:
+                break
+            await asyncio.sleep(0.01)
+        await store.stop()
+        return store
+
+    store = asyncio.run(scenario())
+
+    assert store.snapshot.version == 3
+    assert store.reloads == 1
+
+
+def test_home_page_carries_everything_the_homepage_renders(server):
+    from fastapi.testclient import TestClient
+
+    async def seed():
+        await server.response_cache.invalidate("pages")
+        await server.db.testimonials.insert_one({"client_name": "Home Co", "testimonial_text": "Great",
+                                                 "rating": 5, "published": True, "featured": True})
+
+    asyncio.run(seed())
+    data = TestClient(server.app).get("/api/pages/home").json()["data"]
+
+    assert data["services"] == server.catalog_store.snapshot.service_list
+    assert data["clients"] == server.catalog_store.snapshot.client_list and data["clients"]
+    assert any(t["client_name"] == "Home Co" for t in data["testimonials"])
+    assert "posts" in data
@@ -0,0 +1,111 @@
+"""
+Unit tests for Content-Encoding negotiation and the compressed body cache
+"""
+import gzip
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from starlette.responses import Response
+
+from compression import Compressor, CompressionMiddleware, encoded_etag, identity_etag, parse_accept_encoding
+from precomputed import etag_matches
+
+PAYLOAD = b'{"data": "' + b"omni channel messaging " * 200 + b'"}'
+
+
+def make_client(compressor):
+    app = FastAPI()
+
+    @app.get("/payload")
+    async def payload():
+        return Response(PAYLOAD, media_type="application/json", headers={"ETag": '"v1"'})
+
+    @app.get("/conditional")
+    async def conditional(request: Request):
+        headers = {"ETag": '"v1"', "Cache-Control": "public, max-age=60"}
+        if etag_matches(request.headers.get("if-none-match"), '"v1"'):
+            return Response(status_code=304, headers=headers)
+        return Response(PAYLOAD, media_type="application/json", headers=headers)
+
+    @app.get("/small")
+    async def small():
+        return Response(b'{"ok": true}', media_type="application/json")
+
+    @app.get("/precompressed")
+    async def precompressed():
+        return Response(gzip.compress(PAYLOAD), media_type="application/xml",
+                        headers={"Content-Encoding": "gzip"})
+
+    app.add_middleware(CompressionMiddleware, compressor=compressor)
+    return TestClient(app)
+
+
+def test_accept_encoding_parsing_and_negotiation():
+    assert parse_accept_encoding("gzip, br;q=0.5, identity;q=0") == {"gzip": 1.0, "br": 0.5, "identity": 0.0}
+    compressor = Compressor()
+
+    assert compressor.negotiate("gzip, deflate") == "gzip"
+    assert compressor.negotiate("*") == compressor.encodings[0]
+    assert compressor.negotiate("gzip;q=0") is None
+    assert compressor.negotiate("") is None
+
+
+def test_large_body_is_compressed_once_per_etag():
+    compressor = Compressor(minimum_size=512)
+    client = make_client(compressor)
+
+    first = client.get("/payload", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/payload", headers={"Accept-Encoding": "gzip"})
+
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["etag"] == '"v1-gzip"'
+    assert first.headers["vary"] == "Accept-Encoding"
+    assert second.content == PAYLOAD
+    assert compressor.cache_misses == 1 and compressor.cache_hits == 1
+    assert compressor.bytes_out < compressor.bytes_in / 10
+
+
+def test_primed_body_is_served_without_compressing_on_request():
+    compressor = Compressor(minimum_size=512)
+    compressor.prime(PAYLOAD, '"v1"')
+    compressor.prime(b"{}", '"tiny"')
+    assert compressor.cache_misses == len(compressor.encodings)
+
+    response = make_client(compressor).get("/payload", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert compressor.cache_hits == 1 and compressor.cache_misses == len(compressor.encodings)
+
+
+def test_identity_small_and_precompressed_bodies_pass_through():
+    compressor = Compressor(minimum_size=512)
+    client = make_client(compressor)
+
+    identity = client.get("/payload", headers={"Accept-Encoding": "identity"})
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    precompressed = client.get("/precompressed", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["vary"] == "Accept-Encoding"
+    assert identity.headers["etag"] == '"v1"'
+    assert "content-encoding" not in small.headers
+    assert small.headers["vary"] == "Accept-Encoding"
+    assert precompressed.content == PAYLOAD
+    assert compressor.compressed == 0
+
+
+def test_each_representation_has_a_stable_etag_that_revalidates():
+    assert encoded_etag('"v1"', "br") == '"v1-br"'
+    assert identity_etag('"v1-br"') == identity_etag('"v1-gzip"') == identity_etag('"v1"') == '"v1"'
+
+    client = make_client(Compressor(minimum_size=512))
+    for accept, expected in (("gzip", '"v1-gzip"'), ("identity", '"v1"')):
+        first = client.get("/conditional", headers={"Accept-Encoding": accept})
+        assert first.headers["etag"] == expected
+        # Same tag on every request for this representation
+        assert client.get("/conditional", headers={"Accept-Encoding": accept}).headers["etag"] == expected
+
+        revalidated = client.get("/conditional", headers={"Accept-Encoding": accept, "If-None-Match": expected})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == expected
+        assert revalidated.headers["vary"] == "Accept-Encoding"
@@ -0,0 +1,102 @@
+"""
+Tests for the cached list totals behind paginated endpoints
+"""
+import asyncio
+
+import pytest
+
+import counts
+from counts import CountCache
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+PUBLISHED = {"published": True}
+
+
+class CountingCollection:
+    """Wraps a collection, counting count_documents calls; `gate` holds a count open"""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.name = collection.name
+        self.calls = 0
+        self.gate = None
+
+    async def count_documents(self, query):
+        self.calls += 1
+        total = await self.collection.count_documents(query)
+        if self.gate is not None:
+            await self.gate.wait()
+        return total
+
+    async def estimated_document_count(self):
+        return await self.collection.estimated_document_count()
+
+
+async def seed(published: int = 2):
+    collection = mongomock_motor.AsyncMongoMockClient()["counts_test"].blog_posts
+    await collection.insert_many([{"published": True} for _ in range(published)] + [{"published": False}])
+    return CountingCollection(collection)
+
+
+def test_totals_are_cached_until_the_ttl_expires(monkeypatch):
+    async def scenario():
+        now = [1000.0]
+        monkeypatch.setattr(counts.time, "monotonic", lambda: now[0])
+        collection = await seed()
+        cache = CountCache(ttl=60)
+
+        assert await cache.count(collection, PUBLISHED) == 2
+        await collection.collection.insert_one({"published": True})
+        now[0] += 59
+        assert await cache.count(collection, PUBLISHED) == 2
+        assert (cache.hits, cache.misses, collection.calls) == (1, 1, 1)
+
+        now[0] += 2
+        assert await cache.count(collection, PUBLISHED) == 3
+        assert collection.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_invalidate_drops_totals_and_bumps_the_generation():
+    async def scenario():
+        collection = await seed()
+        cache = CountCache(ttl=60)
+        assert await cache.count(collection, PUBLISHED) == 2
+
+        await collection.collection.insert_one({"published": True})
+        cache.invalidate("blog_posts")
+        assert cache._generations["blog_posts"] == 1
+        assert await cache.count(collection, PUBLISHED) == 3
+        # Other collections are untouched
+        cache.invalidate("testimonials")
+        assert await cache.count(collection, PUBLISHED) == 3
+        assert collection.calls == 2
+        # Unfiltered totals come from collection metadata and are never cached
+        assert await cache.count(collection, {}) == 4 and collection.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_count_racing_an_invalidation_is_not_cached():
+    async def scenario():
+        collection = await seed()
+        cache = CountCache(ttl=60)
+        collection.gate = asyncio.Event()
+
+        # The count reads the old total, then a write invalidates before it returns
+        pending = asyncio.create_task(cache.count(collection, PUBLISHED))
+        await asyncio.sleep(0.01)
+        await collection.collection.insert_one({"published": True})
+        cache.invalidate("blog_posts")
+        collection.gate.set()
+        assert await pending == 2
+
+        # The stale total was not stored
+        assert await cache.count(collection, PUBLISHED) == 3
+        assert collection.calls == 2
+        assert await cache.count(collection, PUBLISHED) == 3
+        assert collection.calls == 2
+
+    asyncio.run(scenario())
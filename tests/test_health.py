@@ -0,0 +1,96 @@
+"""
+Tests for the cached readiness state behind /api/live, /api/ready and /api/health
+"""
+import asyncio
+
+import pytest
+
+from health import HealthMonitor
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+class FlakyDB:
+    """Database stand-in whose ping fails until `up` is set"""
+
+    def __init__(self):
+        self.up = False
+        self.pings = 0
+
+    async def command(self, name):
+        self.pings += 1
+        if not self.up:
+            raise ConnectionError("connection refused")
+        return {"ok": 1}
+
+
+def test_not_ready_until_started_and_pinged():
+    async def scenario():
+        monitor = HealthMonitor(mongomock_motor.AsyncMongoMockClient()["health_test"])
+        assert not monitor.is_ready()
+        assert await monitor.ping()
+        assert not monitor.is_ready()          # startup not finished yet
+        await monitor.start()
+        try:
+            assert monitor.is_ready()
+            report = monitor.report()
+            assert report["status"] == "ready"
+            assert report["database"]["connected"] is True
+        finally:
+            await monitor.stop()
+        assert not monitor.is_ready()
+
+    asyncio.run(scenario())
+
+
+def test_failed_ping_marks_unready_and_recovers():
+    async def scenario():
+        db = FlakyDB()
+        monitor = HealthMonitor(db)
+        monitor.started = True
+        assert not await monitor.ping()
+        assert not await monitor.ping()
+        report = monitor.report()
+        assert report["status"] == "not_ready"
+        assert report["database"]["consecutive_failures"] == 2
+        assert "connection refused" in report["database"]["error"]
+
+        db.up = True
+        assert await monitor.ping()
+        assert monitor.is_ready()
+        assert monitor.consecutive_failures == 0
+
+    asyncio.run(scenario())
+
+
+def test_wait_for_mongo_retries_then_gives_up():
+    async def scenario():
+        db = FlakyDB()
+        monitor = HealthMonitor(db)
+        monitor.startup_timeout = 0.2
+        with pytest.raises(RuntimeError, match="not reachable"):
+            await monitor.wait_for_mongo()
+        assert db.pings >= 1
+
+        db.up = True
+        await monitor.wait_for_mongo()
+        assert monitor.mongo_ok
+
+    asyncio.run(scenario())
+
+
+def test_stale_ping_or_loop_lag_fails_readiness():
+    async def scenario():
+        monitor = HealthMonitor(mongomock_motor.AsyncMongoMockClient()["health_test"])
+        monitor.started = True
+        await monitor.ping()
+        assert monitor.is_ready()
+
+        monitor._lag_samples.append(monitor.max_loop_lag + 0.5)
+        assert not monitor.is_ready()
+        monitor._lag_samples.clear()
+
+        monitor.last_ping_at -= monitor.ping_interval * 10
+        assert not monitor.is_ready()
+
+    asyncio.run(scenario())
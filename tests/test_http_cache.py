@@ -0,0 +1,194 @@
+"""
+Unit tests for HTTP caching policies, conditional requests and surrogate-key
+purging, checked against a minimal caching proxy standing in for the CDN
+"""
+import asyncio
+import re
+
+import httpx
+from fastapi import FastAPI, Request
+from starlette.responses import Response
+
+from http_cache import CachePolicy, HttpCache, SurrogatePurger
+from response_cache import MemoryBackend, ResponseCache
+from serialization import dumps
+
+
+class CachingProxy:
+    """Caches GET responses that allow `s-maxage` and purges them by surrogate key"""
+
+    def __init__(self, origin):
+        self.origin = httpx.AsyncClient(transport=httpx.ASGITransport(app=origin), base_url="http://origin")
+        self.objects = {}
+        self.by_key = {}
+
+    async def __call__(self, scope, receive, send):
+        request = Request(scope, receive)
+        if request.method == "POST" and request.url.path == "/purge":
+            for key in request.headers["surrogate-key"].split():
+                for path in self.by_key.pop(key, set()):
+                    self.objects.pop(path, None)
+            response = Response(status_code=200)
+        elif request.url.path in self.objects:
+            response = self.objects[request.url.path]
+        else:
+            upstream = await self.origin.get(request.url.path)
+            response = Response(upstream.content, upstream.status_code, headers=dict(upstream.headers))
+            if re.search(r"s-maxage=[1-9]", upstream.headers.get("cache-control", "")):
+                self.objects[request.url.path] = response
+                for key in upstream.headers.get("surrogate-key", "").split():
+                    self.by_key.setdefault(key, set()).add(request.url.path)
+        await response(scope, receive, send)
+
+
+def make_origin():
+    app = FastAPI()
+    app.state.hits = 0
+    app.state.title = "First"
+    http_cache = HttpCache(
+        ResponseCache(MemoryBackend(), ttl=60),
+        {"/posts": CachePolicy(max_age=60, s_maxage=300, stale_while_revalidate=600)},
+    )
+
+    @app.get("/posts")
+    async def posts(request: Request):
+        cached = await http_cache.lookup(request, "blog_posts:list?")
+        if cached is not None:
+            return cached
+        app.state.hits += 1
+        body = dumps({"data": [{"title": app.state.title}]})
+        return await http_cache.store(request, "blog_posts:list?", body, surrogate_keys=("blog_posts",))
+
+    app.state.http_cache = http_cache
+    return app
+
+
+def test_policy_renders_cache_control():
+    assert CachePolicy(max_age=60, s_maxage=300, stale_while_revalidate=600).cache_control == (
+        "public, max-age=60, s-maxage=300, stale-while-revalidate=600"
+    )
+    assert CachePolicy(revalidate=True).cache_control == "public, no-cache"
+
+
+def test_conditional_requests_get_304_from_the_cache():
+    origin = make_origin()
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=origin), base_url="http://o") as http:
+            first = await http.get("/posts")
+            revalidated = await http.get("/posts", headers={"If-None-Match": first.headers["etag"]})
+            changed = await http.get("/posts", headers={"If-None-Match": '"stale"'})
+            return first, revalidated, changed
+
+    first, revalidated, changed = asyncio.run(scenario())
+
+    assert first.headers["surrogate-key"] == "blog_posts"
+    assert "stale-while-revalidate=600" in first.headers["cache-control"]
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    assert revalidated.headers["etag"] == first.headers["etag"]
+    assert changed.status_code == 200
+    assert origin.state.hits == 1
+
+
+def test_purge_by_surrogate_key_refreshes_the_edge():
+    origin = make_origin()
+    proxy = CachingProxy(origin)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=proxy), base_url="http://edge") as edge:
+            purger = SurrogatePurger(url="http://edge/purge", token="", client=edge)
+            await edge.get("/posts")
+            await edge.get("/posts")
+
+            # Admin mutation: origin cache invalidated, then the edge is purged
+            origin.state.title = "Second"
+            await origin.state.http_cache.response_cache.invalidate("blog_posts")
+            await purger.purge("blog_posts")
+            return (await edge.get("/posts")).json(), purger
+
+    body, purger = asyncio.run(scenario())
+
+    assert body["data"][0]["title"] == "Second"
+    assert origin.state.hits == 2
+    assert purger.purges == 1
+
+
+def test_purger_is_disabled_without_url():
+    purger = SurrogatePurger(url="")
+    asyncio.run(purger.purge("blog_posts"))
+
+    assert purger.stats() == {"enabled": False, "purges": 0, "errors": 0, "pending": 0}
+
+
+def test_put_and_get_round_trip_media_type_and_legacy_entries():
+    async def scenario():
+        cache = ResponseCache(MemoryBackend(), ttl=60)
+        http_cache = HttpCache(cache, {})
+
+        stored = await http_cache.put("pages:item?slug=a", b"<p>a</p>", surrogate_keys=("pages",),
+                                      media_type="text/html; charset=utf-8")
+        entry = await http_cache.get("pages:item?slug=a")
+        assert (entry.body, entry.etag, entry.media_type) == (b"<p>a</p>", stored.etag, "text/html; charset=utf-8")
+
+        # Entries cached before media types were recorded decode as JSON
+        await cache.set("legacy", b'["\\"v1\\"", null, []]\n{}')
+        assert (await http_cache.get("legacy")).media_type == "application/json"
+        assert await http_cache.get("missing") is None
+
+    asyncio.run(scenario())
+
+
+def test_writes_purge_only_edge_cached_keys_in_the_background(server, monkeypatch):
+    release = asyncio.Event()
+    purged = []
+
+    async def slow_cdn(request):
+        await release.wait()
+        purged.append(request.headers["surrogate-key"])
+        return httpx.Response(200)
+
+    async def scenario():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(slow_cdn))
+        purger = SurrogatePurger(url="http://cdn/purge", token="", client=client)
+        monkeypatch.setattr(server, "cdn_purger", purger)
+        monkeypatch.setattr(server.sitemap, "invalidate", lambda collection_name=None: None)
+
+        # Form submissions touch nothing cached at the edge
+        await server.content_changed("contacts")
+        assert purger.stats()["pending"] == 0
+
+        # The write returns while the CDN is still answering
+        await asyncio.wait_for(server.content_changed("blog_posts"), timeout=1)
+        assert purger.stats()["pending"] == 1 and purged == []
+
+        release.set()
+        await purger.close()
+        return purger
+
+    purger = asyncio.run(scenario())
+    assert purged == ["blog_posts"]
+    assert purger.stats() == {"enabled": True, "purges": 1, "errors": 0, "pending": 0}
+
+
+def test_batch_route_leaves_every_slug_reachable(server):
+    from fastapi.testclient import TestClient
+
+    async def seed():
+        await server.db.blog_posts.delete_many({"slug": {"$in": ["batch", "other"]}})
+        await server.db.blog_posts.insert_many([
+            {"slug": slug, "title": slug.title(), "published": True, "views": 0} for slug in ("batch", "other")
+        ])
+
+    asyncio.run(seed())
+    client = TestClient(server.app)
+
+    # A post titled "Batch" is served by the single-item route
+    single = client.get("/api/blog/batch")
+    assert single.status_code == 200 and single.json()["slug"] == "batch"
+
+    batch = client.get("/api/batch/blog", params={"slugs": "other,missing,batch"})
+    assert batch.status_code == 200
+    assert [(item["slug"], item["found"]) for item in batch.json()["data"]] == [
+        ("other", True), ("missing", False), ("batch", True)
+    ]
+    assert "s-maxage=300" in batch.headers["cache-control"]
@@ -0,0 +1,62 @@
+"""
+Tests for declarative index provisioning against mongomock-motor
+"""
+import asyncio
+import logging
+
+import pytest
+from pymongo.errors import OperationFailure
+
+from indexes import INDEXES, ensure_indexes, missing_indexes
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+def make_db(name: str):
+    return mongomock_motor.AsyncMongoMockClient()[name]
+
+
+def test_ensure_indexes_creates_every_declared_index():
+    async def scenario():
+        db = make_db("indexes_test")
+        assert set(await missing_indexes(db)) == set(INDEXES)
+
+        built = await ensure_indexes(db)
+        assert built == sum(len(models) for models in INDEXES.values())
+        for collection_name, models in INDEXES.items():
+            existing = await db[collection_name].index_information()
+            assert {m.document["name"] for m in models} <= set(existing)
+        assert await missing_indexes(db) == {}
+        # Nothing left to build on the next startup
+        assert await ensure_indexes(db) == 0
+
+    asyncio.run(scenario())
+
+
+def test_check_reports_a_dropped_index():
+    async def scenario():
+        db = make_db("indexes_check_test")
+        await ensure_indexes(db)
+        await db.blog_posts.drop_index("slug_unique")
+
+        missing = await missing_indexes(db)
+        assert {name: [m.document["name"] for m in models] for name, models in missing.items()} == {
+            "blog_posts": ["slug_unique"]
+        }
+        assert await ensure_indexes(db) == 1
+
+    asyncio.run(scenario())
+
+
+def test_duplicate_slugs_abort_startup(caplog):
+    async def scenario():
+        db = make_db("indexes_duplicates_test")
+        await db.blog_posts.insert_many([{"slug": "launch"}, {"slug": "launch"}])
+        with pytest.raises(OperationFailure):
+            await ensure_indexes(db)
+        return await missing_indexes(db)
+
+    with caplog.at_level(logging.ERROR, logger="indexes"):
+        missing = asyncio.run(scenario())
+    assert "Index build failed on blog_posts" in caplog.text
+    assert "slug_unique" in [m.document["name"] for m in missing["blog_posts"]]
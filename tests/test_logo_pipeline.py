@@ -0,0 +1,82 @@
+"""
+Unit tests for the client logo pipeline's blurhash and payload enrichment
+"""
+import pytest
+
+from logo_pipeline import blurhash, build_manifest, enrich_clients
+
+
+def test_blurhash_matches_reference_encoder():
+    pixels = [(255, 255, 255)] * (8 * 6)
+
+    # Same output as the reference implementation (blurha.sh) for a white 8x6 image;
+    # 4x3 components: size flag, max AC, 4-char DC, 11 two-char ACs
+    assert blurhash(pixels, 8, 6) == "LsTSUA_3fQ_3~qt7fQt7fQfQfQfQ"
+
+
+def test_enrich_clients_adds_responsive_fields():
+    manifest = {
+        "logos": {"/client-logos/acme.png": {
+            "width": 400, "height": 200, "blurhash": "LKO2?U%2Tw=w]~RBVZRi};RPxuwH",
+            "sources": {
+                "image/webp": [{"url": "/o/acme.80w.aa.webp", "width": 80},
+                               {"url": "/o/acme.160w.bb.webp", "width": 160}],
+                "image/avif": [{"url": "/o/acme.80w.cc.avif", "width": 80}],
+            },
+            "sprite": {"x": 0, "y": 64, "width": 128, "height": 64},
+        }},
+        "sprite": {"url": "/o/sprite.dd.webp", "width": 2048, "height": 128},
+    }
+    clients = [{"name": "Acme", "logo_url": "/client-logos/acme.png"},
+               {"name": "Other", "logo_url": "/client-logos/other.png"}]
+
+    acme, other = enrich_clients(clients, manifest)
+
+    assert acme["srcset"] == "/o/acme.80w.aa.webp 80w, /o/acme.160w.bb.webp 160w"
+    assert [s["type"] for s in acme["sources"]] == ["image/avif", "image/webp"]
+    assert (acme["width"], acme["height"]) == (400, 200)
+    assert acme["sprite"]["url"] == "/o/sprite.dd.webp"
+    assert other == {"name": "Other", "logo_url": "/client-logos/other.png"}
+
+
+def test_build_manifest_skips_upscaling_and_reuses_unchanged_logos(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    source_dir, output_dir = tmp_path / "logos", tmp_path / "optimized"
+    source_dir.mkdir()
+    Image.new("RGB", (120, 60), (200, 30, 30)).save(source_dir / "Acme Corp.png")
+
+    manifest = build_manifest(source_dir, output_dir, widths=(80, 160), formats=("webp",))
+    entry = manifest["logos"]["/client-logos/Acme Corp.png"]
+
+    assert [v["width"] for v in entry["sources"]["image/webp"]] == [80, 120]
+    assert entry["sources"]["image/webp"][0]["url"].startswith("/client-logos/optimized/acme-corp.80w.")
+    rebuilt = build_manifest(source_dir, output_dir, widths=(80, 160), formats=("webp",))
+    assert rebuilt["logos"] == manifest["logos"]
+
+
+def test_rebuild_prunes_only_superseded_derivatives(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    source_dir, output_dir = tmp_path / "logos", tmp_path / "static"
+    source_dir.mkdir()
+    output_dir.mkdir()
+    (output_dir / "app.0123456789.js").write_text("unrelated asset")
+    (output_dir / "banner.webp").write_bytes(b"unrelated image")
+    logo = source_dir / "acme.png"
+
+    def names(manifest):
+        variants = manifest["logos"]["/client-logos/acme.png"]["sources"]["image/webp"]
+        return {v["url"].rsplit("/", 1)[1] for v in variants}
+
+    def on_disk():
+        return {path.name for path in output_dir.iterdir()}
+
+    Image.new("RGB", (120, 60), (200, 30, 30)).save(logo)
+    first = build_manifest(source_dir, output_dir, widths=(80,), formats=("webp",))
+    Image.new("RGB", (120, 60), (30, 200, 30)).save(logo)
+    second = build_manifest(source_dir, output_dir, widths=(80,), formats=("webp",))
+    Image.new("RGB", (120, 60), (30, 30, 200)).save(logo)
+    build_manifest(source_dir, output_dir, widths=(80,), formats=("webp",))
+    # The previous run's files survive one rebuild, for servers still on the old manifest
+    assert names(second) <= on_disk()
+    assert not names(first) & on_disk()
+    assert {"app.0123456789.js", "banner.webp", "manifest.json"} <= on_disk()
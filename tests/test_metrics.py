@@ -0,0 +1,61 @@
+"""
+Unit tests for request metrics, the Prometheus exporter and Server-Timing
+"""
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from metrics import MetricsMiddleware, MetricsRegistry, RequestMetrics
+
+
+def make_app(metrics):
+    app = FastAPI()
+
+    @app.get("/items/{slug}")
+    async def get_item(slug: str):
+        # Stand-in for a Motor call reporting a 3 ms command
+        metrics.mongo_listener.succeeded(SimpleNamespace(command_name="find", duration_micros=3000))
+        return {"slug": slug}
+
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+    return app
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    latency.observe(0.05, "/a")
+    latency.observe(0.5, "/a")
+    latency.observe(5.0, "/a")
+
+    text = registry.render().decode()
+
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+
+
+def test_requests_are_labelled_by_route_template_with_mongo_time():
+    metrics = RequestMetrics()
+    client = TestClient(make_app(metrics))
+
+    response = client.get("/items/first")
+    client.get("/items/second")
+    client.get("/missing")
+
+    assert response.headers["Server-Timing"].startswith('db;dur=3.00;desc="1 commands"')
+    assert "total;dur=" in response.headers["Server-Timing"]
+    assert metrics.requests.value("GET", "/items/{slug}", "200") == 2
+    assert metrics.requests.value("GET", "unmatched", "404") == 1
+    assert metrics.mongo_time.count("GET", "/items/{slug}") == 2
+    assert metrics.in_flight.value("GET") == 0
+
+
+def test_mongo_commands_outside_a_request_are_not_attributed():
+    metrics = RequestMetrics()
+    metrics.mongo_listener.failed(SimpleNamespace(command_name="ping", duration_micros=1000))
+
+    assert metrics.mongo_listener.durations.count("ping", "error") == 1
+    assert metrics.mongo_time.count("GET", "unmatched") == 0
@@ -0,0 +1,144 @@
+"""
+Tests for the Mongo-backed email outbox, with the email API replaced by an
+httpx.MockTransport
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from outbox import FAILED, PENDING, SENDING, SENT, EmailOutbox
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    monkeypatch.setenv("EMAIL_API_URL", "https://email.test/send")
+    monkeypatch.setenv("EMAIL_PROFILE_ID", "profile")
+    monkeypatch.setenv("EMAIL_API_KEY", "key")
+
+
+def make_outbox(responses):
+    """Outbox whose email API answers with `responses` in turn; sent payloads are collected"""
+    db = mongomock_motor.AsyncMongoMockClient()["outbox_test"]
+    outbox = EmailOutbox(db)
+    outbox.sent = []
+    statuses = iter(responses)
+
+    def handler(request):
+        outbox.sent.append(request)
+        return httpx.Response(next(statuses), text="error")
+
+    outbox._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return db, outbox
+
+
+async def enqueue_contact(db, outbox):
+    contact = await db.contacts.insert_one({"name": "Asha", "email_sent": False})
+    await outbox.enqueue("contacts", contact.inserted_id, {"Subject": "New contact"})
+    return contact.inserted_id
+
+
+async def claim_and_deliver(outbox):
+    await outbox._semaphore.acquire()
+    record = await outbox._claim()
+    if record is None:
+        outbox._semaphore.release()
+        return None
+    await outbox._deliver(record)
+    return record
+
+
+async def make_due(outbox):
+    await outbox.collection.update_many({}, {"$set": {"next_attempt_at": datetime.utcnow() - timedelta(seconds=1)}})
+
+
+def test_successful_send_flags_the_source_document():
+    async def scenario():
+        db, outbox = make_outbox([200])
+        contact_id = await enqueue_contact(db, outbox)
+
+        await claim_and_deliver(outbox)
+
+        record = await outbox.collection.find_one({})
+        assert record["status"] == SENT and record["attempts"] == 1 and record["last_error"] is None
+        assert (await db.contacts.find_one({"_id": contact_id}))["email_sent"] is True
+        # Credentials are added at send time, never stored with the record
+        assert b'"APIKey":"key"' in outbox.sent[0].content.replace(b" ", b"")
+        assert "APIKey" not in record["message"]
+        # Nothing left to claim
+        assert await claim_and_deliver(outbox) is None
+
+    asyncio.run(scenario())
+
+
+def test_failure_backs_off_exponentially_then_gives_up():
+    async def scenario():
+        db, outbox = make_outbox([500, 503, 500])
+        outbox.backoff_base, outbox.max_attempts = 10, 3
+        contact_id = await enqueue_contact(db, outbox)
+
+        before = datetime.utcnow()
+        await claim_and_deliver(outbox)
+        record = await outbox.collection.find_one({})
+        assert record["status"] == PENDING and record["attempts"] == 1
+        assert record["last_error"].startswith("HTTP 500")
+        assert timedelta(seconds=9) < record["next_attempt_at"] - before < timedelta(seconds=11)
+        # Not due yet
+        assert await claim_and_deliver(outbox) is None
+
+        await make_due(outbox)
+        before = datetime.utcnow()
+        await claim_and_deliver(outbox)
+        record = await outbox.collection.find_one({})
+        assert record["status"] == PENDING and record["attempts"] == 2
+        assert timedelta(seconds=19) < record["next_attempt_at"] - before < timedelta(seconds=21)
+
+        await make_due(outbox)
+        await claim_and_deliver(outbox)
+        record = await outbox.collection.find_one({})
+        assert record["status"] == FAILED and record["attempts"] == 3
+        await make_due(outbox)
+        assert await claim_and_deliver(outbox) is None
+        assert len(outbox.sent) == 3
+        assert (await db.contacts.find_one({"_id": contact_id}))["email_sent"] is False
+
+    asyncio.run(scenario())
+
+
+def test_failure_then_retry_succeeds():
+    async def scenario():
+        db, outbox = make_outbox([502, 200])
+        contact_id = await enqueue_contact(db, outbox)
+
+        await claim_and_deliver(outbox)
+        await make_due(outbox)
+        await claim_and_deliver(outbox)
+
+        record = await outbox.collection.find_one({})
+        assert record["status"] == SENT and record["attempts"] == 2
+        assert (await db.contacts.find_one({"_id": contact_id}))["email_sent"] is True
+
+    asyncio.run(scenario())
+
+
+def test_stale_lease_is_taken_over():
+    async def scenario():
+        db, outbox = make_outbox([200])
+        await enqueue_contact(db, outbox)
+
+        # A worker claims the record and dies before delivering it
+        claimed = await outbox._claim()
+        assert claimed["status"] == SENDING and claimed["attempts"] == 1
+        assert claimed["next_attempt_at"] > datetime.utcnow() + timedelta(seconds=outbox.lease_seconds - 1)
+        # While the lease holds, nobody else can claim it
+        assert await outbox._claim() is None
+
+        await make_due(outbox)
+        record = await claim_and_deliver(outbox)
+        assert record["_id"] == claimed["_id"] and record["attempts"] == 2
+        assert (await outbox.collection.find_one({}))["status"] == SENT
+
+    asyncio.run(scenario())
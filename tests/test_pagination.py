@@ -0,0 +1,85 @@
+"""
+Unit tests for keyset pagination cursors
+"""
+import asyncio
+import base64
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from pagination import apply_cursor, decode_cursor, encode_cursor, next_cursor
+
+
+def test_cursor_round_trip_preserves_datetime_and_id():
+    value = datetime(2025, 3, 4, 5, 6, 7, 890000)
+    doc_id = ObjectId()
+
+    decoded_value, decoded_id = decode_cursor(encode_cursor(value, doc_id))
+
+    assert decoded_value == value
+    assert decoded_id == doc_id
+
+
+def test_malformed_cursor_raises_value_error():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.parametrize("value", [{"$gt": ""}, {"$date": "2025-01-01", "$ne": 1}, ["a", "b"], {"$ne": None}])
+def test_cursor_with_operator_value_is_rejected(value):
+    raw = json.dumps({"v": value, "id": str(ObjectId())}).encode()
+    with pytest.raises(ValueError):
+        decode_cursor(base64.urlsafe_b64encode(raw).decode())
+
+
+def test_apply_cursor_combines_with_existing_filter():
+    doc_id = ObjectId()
+    value = datetime(2025, 1, 1)
+    query = apply_cursor({"published": True}, "created_at", encode_cursor(value, doc_id))
+
+    assert query == {
+        "$and": [
+            {"published": True},
+            {"$or": [
+                {"created_at": {"$lt": value}},
+                {"created_at": value, "_id": {"$lt": doc_id}},
+                {"created_at": None},
+            ]},
+        ]
+    }
+
+
+def test_next_cursor_trims_lookahead_document():
+    docs = [{"_id": ObjectId(), "created_at": datetime(2025, 1, day)} for day in (3, 2, 1)]
+    last_kept = docs[1]
+
+    cursor = next_cursor(docs, 2, "created_at")
+
+    assert len(docs) == 2
+    assert decode_cursor(cursor) == (last_kept["created_at"], last_kept["_id"])
+    assert next_cursor(docs, 2, "created_at") is None
+
+
+def test_pages_reach_documents_without_the_sort_field():
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+
+    async def scenario():
+        collection = mongomock_motor.AsyncMongoMockClient()["pagination_test"].contacts
+        start = datetime(2025, 1, 1)
+        await collection.insert_many(
+            [{"submitted_at": start + timedelta(days=n)} for n in range(5)] + [{} for _ in range(3)]
+        )
+        seen, cursor = [], None
+        while True:
+            query = apply_cursor({}, "submitted_at", cursor)
+            docs = await collection.find(query).sort([("submitted_at", -1), ("_id", -1)]).to_list(length=3)
+            cursor = next_cursor(docs, 2, "submitted_at")
+            seen.extend(doc["_id"] for doc in docs)
+            if cursor is None:
+                break
+        return seen, await collection.count_documents({})
+
+    seen, total = asyncio.run(scenario())
+    assert len(seen) == len(set(seen)) == total
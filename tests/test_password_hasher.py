@@ -0,0 +1,70 @@
+"""
+Tests for the bounded bcrypt pool and its 503 on saturation
+"""
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import auth
+from auth import HasherBusy, PasswordHasher
+
+
+def test_calls_beyond_max_pending_fail_fast():
+    async def scenario():
+        release = threading.Event()
+        hasher = PasswordHasher(workers=1, max_pending=2)
+
+        def slow(value):
+            release.wait(5)
+            return value
+
+        running = [asyncio.create_task(hasher._run(slow, n)) for n in range(2)]
+        await asyncio.sleep(0.01)
+        with pytest.raises(HasherBusy):
+            await hasher._run(slow, 3)
+        assert hasher.stats()["pending"] == 2 and hasher.rejected == 1
+
+        release.set()
+        assert await asyncio.gather(*running) == [0, 1]
+        # Capacity is back once the queue drains
+        assert await hasher._run(slow, 4) == 4
+        assert hasher.stats()["calls"] == 3 and hasher.stats()["pending"] == 0
+        hasher.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_verify_and_hash_run_bcrypt_in_the_pool():
+    async def scenario():
+        hasher = PasswordHasher(workers=1, max_pending=4)
+        hashed = await hasher.hash("correct horse")
+        assert await hasher.verify("correct horse", hashed)
+        assert not await hasher.verify("wrong", hashed)
+        assert hasher.stats()["calls"] == 3
+        hasher.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_login_answers_503_with_retry_after_when_saturated(server, monkeypatch):
+    hasher = PasswordHasher(workers=1, max_pending=1)
+    hasher._pending = 1
+    monkeypatch.setattr(server, "password_hasher", hasher)
+    asyncio.run(server.db.admin_users.delete_many({}))
+    asyncio.run(server.db.admin_users.insert_one({
+        "email": "admin@example.com", "name": "Admin", "role": "admin",
+        "hashed_password": auth.get_password_hash("secret-password"),
+    }))
+
+    client = TestClient(server.app)
+    response = client.post("/api/auth/login", json={"email": "admin@example.com", "password": "secret-password"})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert hasher.rejected == 1
+
+    hasher._pending = 0
+    response = client.post("/api/auth/login", json={"email": "admin@example.com", "password": "secret-password"})
+    assert response.status_code == 200 and response.json()["token_type"] == "bearer"
+    hasher.shutdown()
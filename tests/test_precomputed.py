@@ -0,0 +1,63 @@
+"""
+Unit tests for precomputed JSON responses and If-None-Match matching
+"""
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from compression import Compressor, CompressionMiddleware
+from precomputed import PrecomputedJSON, etag_matches
+
+ETAG = '"services-v3-abc123"'
+
+
+def test_etag_matches_weak_lists_and_wildcard():
+    assert etag_matches(ETAG, ETAG)
+    assert etag_matches("W/" + ETAG, ETAG)
+    assert etag_matches(ETAG, "W/" + ETAG)
+    assert etag_matches(f'"stale", W/"older",  {ETAG}', ETAG)
+    assert etag_matches("*", ETAG)
+    # The tag of a compressed representation revalidates the same payload
+    assert etag_matches('"services-v3-abc123-gzip"', ETAG)
+
+    assert not etag_matches(None, ETAG)
+    assert not etag_matches("", ETAG)
+    assert not etag_matches('"stale", W/"older"', ETAG)
+    assert not etag_matches('"services-v3-abc12"', ETAG)
+
+
+def make_client(precomputed: PrecomputedJSON) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/services")
+    async def services(request: Request):
+        return precomputed.response(request)
+
+    app.add_middleware(CompressionMiddleware, compressor=Compressor())
+    return TestClient(app)
+
+
+def test_precomputed_response_and_304_headers():
+    precomputed = PrecomputedJSON({"success": True, "data": ["sms"] * 400}, max_age=600, etag=ETAG)
+    client = make_client(precomputed)
+
+    response = client.get("/services", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200 and response.content == precomputed.body
+    assert response.headers["etag"] == ETAG
+    assert response.headers["cache-control"] == "public, max-age=600"
+    assert response.headers["vary"] == "Accept-Encoding"
+
+    for if_none_match in (ETAG, "W/" + ETAG, f'"stale", {ETAG}', "*"):
+        revalidated = client.get("/services", headers={"If-None-Match": if_none_match, "Accept-Encoding": "identity"})
+        assert revalidated.status_code == 304 and revalidated.content == b""
+        assert revalidated.headers["etag"] == ETAG
+        assert revalidated.headers["cache-control"] == "public, max-age=600"
+        assert revalidated.headers["vary"] == "Accept-Encoding"
+
+    stale = client.get("/services", headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+
+
+def test_default_etag_is_derived_from_the_body():
+    first = PrecomputedJSON({"data": [1, 2]})
+    assert first.etag == PrecomputedJSON({"data": [1, 2]}).etag != PrecomputedJSON({"data": [2, 1]}).etag
+    assert first.etag.startswith('"') and first.etag.endswith('"')
@@ -0,0 +1,79 @@
+"""
+Tests for prerendered HTML snapshots of blog posts and case studies
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from prerender import Prerenderer, render_blog_post, render_case_study, snapshot_version
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+POST = {
+    "title": "Launching </script> RCS",
+    "slug": "launching-rcs",
+    "excerpt": "Rich messaging & more",
+    "content": "<p>RCS is here.</p>",
+    "author": "Asha",
+    "category": "Product",
+    "tags": ["rcs"],
+    "featured_image": "/images/rcs.png",
+    "published": True,
+    "created_at": datetime(2025, 1, 1),
+    "updated_at": datetime(2025, 1, 2, 3, 4, 5),
+}
+
+
+def test_blog_snapshot_has_meta_open_graph_and_content():
+    html = render_blog_post(POST, "https://example.com")
+
+    assert "<title>Launching &lt;/script&gt; RCS | My Inbox Media®</title>" in html
+    assert '<link rel="canonical" href="https://example.com/blog/launching-rcs">' in html
+    assert '<meta property="og:image" content="https://example.com/images/rcs.png">' in html
+    assert '<meta name="description" content="Rich messaging &amp; more">' in html
+    assert "<p>RCS is here.</p>" in html
+    # JSON-LD can't end its own script element
+    assert html.count("</script>") == 1
+    assert '"@type": "BlogPosting"' in html
+
+
+def test_case_study_snapshot_escapes_text_fields():
+    study = {"title": "Scaling OTPs", "slug": "scaling-otps", "client_name": "Acme <Bank>",
+             "industry": "BFSI", "challenge": "Delivery <b>lag</b>", "solution": "s", "results": "r",
+             "created_at": datetime(2025, 1, 1), "updated_at": datetime(2025, 1, 1)}
+    html = render_case_study(study, "https://example.com")
+
+    assert "Acme &lt;Bank&gt;" in html
+    assert "Delivery &lt;b&gt;lag&lt;/b&gt;" in html
+    assert "https://example.com/case-studies/scaling-otps" in html
+
+
+def test_sync_follows_slug_changes_publishing_and_backfill():
+    async def scenario():
+        db = mongomock_motor.AsyncMongoMockClient()["prerender_test"]
+        prerenderer = Prerenderer(db, site_url="https://example.com")
+        post = dict(POST)
+        await db.blog_posts.insert_one(post)
+
+        await prerenderer.sync("blog", post)
+        snapshot = await prerenderer.get("blog", "launching-rcs")
+        assert snapshot["version"] == snapshot_version(POST["updated_at"]) == "20250102030405000000"
+
+        post.update(slug="rcs-launch", updated_at=datetime(2025, 2, 1))
+        await prerenderer.sync("blog", post)
+        assert await prerenderer.get("blog", "launching-rcs") is None
+        assert await prerenderer.get("blog", "rcs-launch") is not None
+
+        post["published"] = False
+        await prerenderer.sync("blog", post)
+        assert await prerenderer.get("blog", "rcs-launch") is None
+
+        # Startup backfill renders published documents and drops orphans
+        await db.blog_posts.update_one({"_id": post["_id"]}, {"$set": {"published": True, "slug": "rcs-launch"}})
+        await db.prerendered_pages.insert_one({"_id": "gone", "kind": "blog", "slug": "old", "version": "1"})
+        await prerenderer.backfill()
+        assert await prerenderer.get("blog", "rcs-launch") is not None
+        assert await db.prerendered_pages.count_documents({}) == 1
+
+    asyncio.run(scenario())
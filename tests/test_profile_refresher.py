@@ -0,0 +1,127 @@
+"""
+Tests for the scheduled external profile refresher, run against a local
+fixture server standing in for mimprofile.e-mim.in
+"""
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from profile_refresher import NOT_MODIFIED, UNCHANGED, UPDATED, FAILED, ProfileRefresher, parse_profile
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+FIXTURE = (Path(__file__).parent / "fixtures" / "mimprofile.html").read_bytes()
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves the fixture page with an ETag, honouring If-None-Match"""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        if server.use_validators and self.headers.get("If-None-Match") == server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(server.body)))
+        if server.use_validators:
+            self.send_header("ETag", server.etag)
+            self.send_header("Last-Modified", "Wed, 01 Jan 2025 00:00:00 GMT")
+        self.end_headers()
+        self.wfile.write(server.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fixture_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    server.body, server.etag, server.use_validators, server.requests = FIXTURE, '"v1"', True, []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_refresher(url, changes):
+    db = mongomock_motor.AsyncMongoMockClient()["profile_test"]
+
+    async def on_change():
+        changes.append(True)
+
+    return ProfileRefresher(db, url=url, interval=0, on_change=on_change)
+
+
+def test_parse_profile_extracts_headings_and_client_logos():
+    profile = parse_profile(FIXTURE.decode(), "https://mimprofile.e-mim.in/about/")
+
+    assert profile["title"] == "My Inbox Media | Company Profile"
+    assert "WhatsApp Business API" in profile["headings"]
+    assert profile["logo_urls"] == [
+        "https://mimprofile.e-mim.in/assets/clients/bmw.png",
+        "https://mimprofile.e-mim.in/about/assets/clients/tata.jpg",
+    ]
+
+
+def test_conditional_refresh_against_fixture_server(fixture_server):
+    url = f"http://127.0.0.1:{fixture_server.server_port}/"
+    changes = []
+
+    async def scenario():
+        refresher = make_refresher(url, changes)
+        first = await refresher.refresh()
+        second = await refresher.refresh()
+        profile = await refresher.load()
+        await refresher.stop()
+        return first, second, profile
+
+    first, second, profile = asyncio.run(scenario())
+
+    assert (first, second) == (UPDATED, NOT_MODIFIED)
+    assert fixture_server.requests[1]["If-None-Match"] == '"v1"'
+    assert fixture_server.requests[1]["If-Modified-Since"] == "Wed, 01 Jan 2025 00:00:00 GMT"
+    assert profile["description"].startswith("Omni channel")
+    assert "etag" not in profile and "content_hash" not in profile
+    assert changes == [True]
+
+
+def test_identical_body_without_validators_is_unchanged(fixture_server):
+    fixture_server.use_validators = False
+    url = f"http://127.0.0.1:{fixture_server.server_port}/"
+    changes = []
+
+    async def scenario():
+        refresher = make_refresher(url, changes)
+        statuses = [await refresher.refresh(), await refresher.refresh()]
+        await refresher.stop()
+        return statuses
+
+    assert asyncio.run(scenario()) == [UPDATED, UNCHANGED]
+    assert len(changes) == 1
+
+
+def test_unreachable_origin_keeps_stored_profile(fixture_server):
+    url = f"http://127.0.0.1:{fixture_server.server_port}/"
+
+    async def scenario():
+        refresher = make_refresher(url, [])
+        await refresher.refresh()
+        fixture_server.shutdown()
+        fixture_server.server_close()
+        status = await refresher.refresh()
+        profile = await refresher.load()
+        await refresher.stop()
+        return status, profile, refresher
+
+    status, profile, refresher = asyncio.run(scenario())
+
+    assert status == FAILED
+    assert profile["title"] == "My Inbox Media | Company Profile"
+    assert refresher.stats()["refreshes"][FAILED] == 1
@@ -0,0 +1,37 @@
+"""
+Unit tests for list sparse fieldsets and teasers
+"""
+import pytest
+
+from projections import LIST_FIELDS, make_teaser, with_teaser
+
+
+def test_summary_view_drops_long_fields():
+    projection = LIST_FIELDS["case_studies"].projection("summary")
+
+    assert projection["teaser"] == 1
+    for heavy in ("challenge", "solution", "results", "gallery_images"):
+        assert heavy not in projection
+
+
+def test_fields_override_view_and_keep_required_sort_key():
+    projection = LIST_FIELDS["blog_posts"].projection("full", "title, slug")
+
+    assert projection == {"_id": 1, "title": 1, "slug": 1, "created_at": 1}
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(ValueError, match="hashed_password"):
+        LIST_FIELDS["testimonials"].projection(fields="client_name,hashed_password")
+
+
+def test_teaser_cuts_at_word_boundary():
+    teaser = make_teaser("word " * 100, length=20)
+
+    assert teaser == "word word word word…"
+    assert make_teaser("  short\n text ") == "short text"
+
+
+def test_with_teaser_only_touches_documents_with_source_field():
+    assert "teaser" not in with_teaser("blog_posts", {"title": "No excerpt in this update"})
+    assert with_teaser("blog_posts", {"excerpt": "Fresh excerpt"})["teaser"] == "Fresh excerpt"
@@ -0,0 +1,93 @@
+"""
+Unit tests for the slow query log and per-route query budgets
+"""
+import logging
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from query_monitor import QueryBudgetExceeded, QueryMonitor, QueryMonitorMiddleware, command_shape
+
+
+def run_command(monitor, name, command, duration_ms=1.0, request_id=1):
+    event = SimpleNamespace(command_name=name, command=command, connection_id=("db", 27017),
+                            request_id=request_id, duration_micros=int(duration_ms * 1000))
+    monitor.started(event)
+    monitor.succeeded(event)
+
+
+def make_app(monitor, commands_per_request):
+    app = FastAPI()
+
+    @app.get("/posts/{slug}")
+    async def get_post(slug: str):
+        for request_id in range(commands_per_request):
+            run_command(monitor, "find", {"find": "blog_posts", "filter": {"slug": slug}}, request_id=request_id)
+        return {"slug": slug}
+
+    app.add_middleware(QueryMonitorMiddleware, monitor=monitor)
+    return app
+
+
+def test_command_shape_redacts_values_but_keeps_structure():
+    shape = command_shape("find", {
+        "find": "blog_posts",
+        "filter": {"published": True, "slug": {"$in": ["a", "b"]}, "$or": [{"category": "SMS"}]},
+        "sort": {"created_at": -1},
+        "limit": 10,
+    })
+
+    assert shape == {
+        "collection": "blog_posts",
+        "filter": {"published": "?", "slug": {"$in": ["?"]}, "$or": [{"category": "?"}]},
+        "sort": {"created_at": -1},
+    }
+
+
+def test_slow_command_is_logged_with_route(caplog):
+    monitor = QueryMonitor(slow_ms=50, strict=False)
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow():
+        run_command(monitor, "find", {"find": "contacts", "filter": {"email": "a@b.c"}}, duration_ms=120)
+        run_command(monitor, "find", {"find": "contacts", "filter": {}}, duration_ms=5, request_id=2)
+        return {}
+
+    app.add_middleware(QueryMonitorMiddleware, monitor=monitor)
+    with caplog.at_level(logging.WARNING, logger="query_monitor"):
+        TestClient(app).get("/slow")
+
+    assert monitor.slow_queries == 1
+    assert "GET /slow" in caplog.text
+    assert "a@b.c" not in caplog.text
+
+
+def test_request_within_budget_passes():
+    monitor = QueryMonitor(budgets={"GET /posts/{slug}": 1}, strict=True)
+
+    assert TestClient(make_app(monitor, 1)).get("/posts/one").status_code == 200
+    assert not monitor.violations
+
+
+def test_extra_round_trip_fails_in_strict_mode():
+    monitor = QueryMonitor(budgets={"GET /posts/{slug}": 1}, strict=True)
+
+    with pytest.raises(QueryBudgetExceeded, match="2 MongoDB commands"):
+        TestClient(make_app(monitor, 2)).get("/posts/one")
+    assert monitor.violations[0]["route"] == "GET /posts/{slug}"
+
+
+def test_housekeeping_commands_do_not_count():
+    monitor = QueryMonitor(budgets={"GET /ping": 0}, strict=True)
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        run_command(monitor, "ping", {"ping": 1})
+        return {}
+
+    app.add_middleware(QueryMonitorMiddleware, monitor=monitor)
+    assert TestClient(app).get("/ping").status_code == 200
@@ -0,0 +1,81 @@
+"""
+Unit tests for the response cache backends
+"""
+import asyncio
+import fnmatch
+
+from response_cache import MemoryBackend, RedisBackend, ResponseCache
+
+
+class FakeRedis:
+    """Local stand-in for redis.asyncio.Redis (only the commands the cache uses)"""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    async def scan_iter(self, match="*"):
+        for key in list(self.store):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+
+def exercise_invalidation(backend):
+    async def scenario():
+        cache = ResponseCache(backend, ttl=60)
+        blog_key = cache.key("blog_posts", "list", page=1, limit=10)
+        case_key = cache.key("case_studies", "item", slug="acme")
+
+        assert await cache.get(blog_key) is None
+        await cache.set(blog_key, b"blog")
+        await cache.set(case_key, b"case")
+        assert await cache.get(blog_key) == b"blog"
+
+        await cache.invalidate("blog_posts")
+        assert await cache.get(blog_key) is None
+        assert await cache.get(case_key) == b"case"
+        return cache.stats()
+
+    return asyncio.run(scenario())
+
+
+def test_memory_backend_invalidates_by_namespace():
+    stats = exercise_invalidation(MemoryBackend())
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+
+
+def test_redis_backend_invalidates_by_namespace():
+    redis = FakeRedis()
+    stats = exercise_invalidation(RedisBackend(redis))
+    assert stats["hits"] == 2
+    assert all(key.startswith("mim:cache:case_studies:") for key in redis.store)
+
+
+def test_memory_backend_evicts_least_recently_used():
+    async def scenario():
+        backend = MemoryBackend(max_entries=2)
+        await backend.set("a", b"1", 60)
+        await backend.set("b", b"2", 60)
+        await backend.get("a")
+        await backend.set("c", b"3", 60)
+        return backend
+
+    backend = asyncio.run(scenario())
+    assert asyncio.run(backend.get("b")) is None
+    assert asyncio.run(backend.get("a")) == b"1"
+    assert backend.evictions == 1
+
+
+def test_key_ignores_parameter_order_and_unset_values():
+    assert ResponseCache.key("blog_posts", "list", page=1, category=None, limit=10) == \
+        ResponseCache.key("blog_posts", "list", limit=10, page=1)
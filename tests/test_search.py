@@ -0,0 +1,196 @@
+"""
+Tests for the in-process full-text search index
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from search import SearchIndex, SiteSearch, tokenize
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+def post(doc_id, title, content="", **extra):
+    return {"_id": doc_id, "title": title, "slug": f"post-{doc_id}", "excerpt": "", "content": content,
+            "tags": [], "published": True, "created_at": datetime(2025, 1, 1), **extra}
+
+
+def test_tokenize_strips_markup_stopwords_and_plurals():
+    assert tokenize("<p>The <b>Campaigns</b> of WhatsApp's business</p>") == ["campaign", "whatsapp", "business"]
+
+
+def test_title_match_outranks_body_match_and_kind_filters():
+    index = SearchIndex()
+    index.add("blog", post(1, "Scaling SMS delivery", "Notes on throughput"))
+    index.add("blog", post(2, "Quarterly update", "We also touched SMS routing"))
+    index.add("case-studies", {"_id": 3, "title": "Bank OTPs", "slug": "bank", "challenge": "SMS latency",
+                               "technologies": ["SMS"], "published": True})
+
+    total, hits = index.search("sms")
+    assert total == 3
+    assert hits[0][1]["slug"] in ("post-1", "bank")
+    assert hits[-1][1]["slug"] == "post-2"
+
+    total, hits = index.search("SMS", kind="case-studies")
+    assert total == 1 and hits[0][1] == {"title": "Bank OTPs", "slug": "bank", "teaser": None, "client_name": None,
+                                         "industry": None, "featured_image": None, "created_at": None,
+                                         "id": "3", "kind": "case-studies"}
+
+
+def test_pagination_updates_and_compaction():
+    index = SearchIndex()
+    for n in range(30):
+        index.add("blog", post(n, f"RCS guide {n}", "rcs " * (n + 1)))
+
+    total, first = index.search("rcs", offset=0, limit=10)
+    _, second = index.search("rcs", offset=10, limit=10)
+    assert total == 30 and len(first) == len(second) == 10
+    assert not {hit["slug"] for _, hit in first} & {hit["slug"] for _, hit in second}
+
+    index.add("blog", post(0, "Voice bots", "ivr"))
+    index.add("blog", dict(post(1, "RCS guide 1"), published=False))
+    index.remove("2")
+    assert index.search("rcs")[0] == 27
+    assert index.search("voice")[1][0][1]["slug"] == "post-0"
+    assert index.tombstones == 3
+
+    before = [hit["slug"] for _, hit in index.search("rcs", limit=30)[1]]
+    assert all(score > 0 for score, _ in index.search("rcs", limit=30)[1])
+    postings = index.postings
+    # Compaction runs a few terms at a time; searches in between see the same results
+    slices = 1
+    while not index.compact(budget=20):
+        slices += 1
+        assert [hit["slug"] for _, hit in index.search("rcs", limit=30)[1]] == before
+    assert slices > 1
+    assert index.tombstones == 0 and len(index) == 28 and index.postings < postings
+    assert [hit["slug"] for _, hit in index.search("rcs", limit=30)[1]] == before
+
+
+def test_repeated_edits_do_not_grow_the_index():
+    async def scenario():
+        db = mongomock_motor.AsyncMongoMockClient()["search_growth_test"]
+        search = SiteSearch(db, sync_interval=0)
+        await search.load()
+        fresh = SearchIndex()
+        for n in range(10):
+            fresh.add("blog", post(n, f"WhatsApp campaign {n}", "Template messaging"))
+
+        # Every admin edit re-indexes the post under a new slot
+        for edit in range(300):
+            for n in range(10):
+                await search.update("blog", post(n, f"WhatsApp campaign {n}", "Template messaging"))
+            if search._compacting is not None:
+                await search._compacting
+        assert search.compactions >= 2
+        assert len(search.index._docs) < 1100
+
+        await search._call(search.index.compact)
+        index = search.index
+        assert len(index._docs) == len(index._lengths) == len(index._ordinals) == 10
+        assert index.stats() == fresh.stats()
+        assert (await search.search("whatsapp"))[0] == 10
+        assert sorted(index.ids("blog")) == sorted(str(n) for n in range(10))
+        await search.stop()
+
+    asyncio.run(scenario())
+
+
+def test_searches_and_updates_during_compaction_see_renumbered_postings():
+    index = SearchIndex()
+    for n in range(20):
+        index.add("blog", post(n, f"Voice {n}", "ivr routing"))
+    for n in range(10):
+        index.remove(str(n))
+    expected = [hit["slug"] for _, hit in index.search("ivr", limit=20)[1]]
+
+    assert not index.compact(budget=1)
+    # Terms touched before the sweep reaches them are rewritten on the spot
+    assert [hit["slug"] for _, hit in index.search("ivr", limit=20)[1]] == expected
+    index.add("blog", post(20, "Voice 20", "ivr routing"))
+    index.remove("11")
+    while not index.compact(budget=1):
+        pass
+    total, hits = index.search("ivr", limit=20)
+    slugs = [hit["slug"] for _, hit in hits]
+    assert total == 10 and "post-20" in slugs and "post-11" not in slugs
+    assert len(index._docs) == 11 and index.tombstones == 1
+
+
+def test_site_search_loads_and_syncs_other_workers_writes():
+    async def scenario():
+        db = mongomock_motor.AsyncMongoMockClient()["search_test"]
+        now = datetime.utcnow()
+        await db.blog_posts.insert_many([
+            post("a", "Omnichannel messaging", updated_at=now),
+            dict(post("b", "Draft messaging"), published=False, updated_at=now),
+        ])
+        syncs = []
+
+        async def on_sync():
+            syncs.append(True)
+
+        search = SiteSearch(db, sync_interval=0, on_sync=on_sync)
+        other = SiteSearch(db, sync_interval=0)
+        await search.load()
+        await other.load()
+        assert search.ready and (await search.search("messaging"))[0] == 1
+
+        # Writes made through the other worker
+        await db.blog_posts.update_one({"_id": "b"}, {"$set": {"published": True,
+                                                               "updated_at": now + timedelta(seconds=1)}})
+        await db.blog_posts.delete_one({"_id": "a"})
+        await other.remove("a")
+        await search.sync()
+        total, hits = await search.search("messaging")
+        assert total == 1 and hits[0][1]["id"] == "b"
+        assert syncs == [True]
+
+        # Nothing new: the documents at the watermark are not re-indexed
+        generation = search.generation
+        await search.sync()
+        assert search.generation == generation and search.index.tombstones == 1
+        assert syncs == [True]
+        await search.stop()
+        await other.stop()
+
+    asyncio.run(scenario())
+
+
+def test_compaction_runs_in_the_background_once_tombstones_pile_up():
+    async def scenario():
+        db = mongomock_motor.AsyncMongoMockClient()["search_compaction_test"]
+        search = SiteSearch(db, sync_interval=0)
+        await search.load()
+        for n in range(1200):
+            await search.update("blog", post(n, f"Bulk SMS {n}"))
+        for n in range(1001):
+            await search.remove(n)
+
+        assert search._compacting is not None
+        await search._compacting
+        assert search.compactions == 1 and search.index.tombstones == 0
+        assert (await search.search("sms", limit=1))[0] == 199
+        await search.stop()
+
+    asyncio.run(scenario())
+
+
+def test_search_route_is_http_cached_and_invalidated_by_writes(server):
+    asyncio.run(server.db.blog_posts.delete_many({}))
+    asyncio.run(server.site_search.update("blog", post("cached-1", "Cached SMS search")))
+    server.site_search.ready = True
+    client = TestClient(server.app)
+
+    response = client.get("/api/search", params={"q": "sms"})
+    assert response.status_code == 200 and response.json()["total"] == 1
+    assert response.headers["cache-control"] == server.HTTP_CACHE_POLICIES["/api/search"].cache_control
+    etag = response.headers["etag"]
+    assert client.get("/api/search", params={"q": "sms"}, headers={"If-None-Match": etag}).status_code == 304
+
+    asyncio.run(server.site_search.update("blog", post("cached-2", "Fresh SMS search")))
+    asyncio.run(server.content_changed("blog_posts"))
+    response = client.get("/api/search", params={"q": "sms"})
+    assert response.json()["total"] == 2 and response.headers["etag"] != etag
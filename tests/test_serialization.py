@@ -0,0 +1,67 @@
+"""
+Tests that the orjson path encodes documents exactly like the serialize_doc +
+jsonable_encoder + json.dumps path it replaced
+"""
+import copy
+import json
+from datetime import datetime, timezone
+
+import orjson
+import pytest
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+from models import serialize_doc
+from serialization import FastJSONResponse, dumps, prepare_doc
+
+CREATED = datetime(2025, 3, 4, 5, 6, 7, 890123)
+
+DOCS = {
+    "flat": {"_id": ObjectId(), "title": "Launch", "created_at": CREATED, "views": 3, "published": True},
+    "whole_seconds_and_aware": {"_id": ObjectId(), "created_at": datetime(2025, 1, 1),
+                                "updated_at": datetime(2025, 1, 1, 12, tzinfo=timezone.utc)},
+    "object_id_fields": {"_id": ObjectId(), "author_id": ObjectId(), "rating": 4.5},
+    "nested": {
+        "_id": ObjectId(),
+        "tags": ["sms", "rcs"],
+        "gallery_images": [{"url": "/a.png", "uploaded_at": CREATED}, {"url": "/b.png", "uploaded_at": None}],
+        "meta": {"source": {"imported_at": CREATED, "by": ObjectId()}, "history": [[CREATED, 1]]},
+        "technologies": [],
+    },
+    "missing_fields": {"_id": ObjectId(), "title": "Only a title", "excerpt": None, "unicode": "Café ✓"},
+    "no_id": {"title": "Derived row", "created_at": CREATED},
+}
+
+
+def legacy(payload):
+    """
+    What routes did before: serialize_doc, FastAPI's encoder, then json.dumps.
+
+    serialize_doc only converted top-level ObjectIds and the encoder raises on
+    nested ones; the new path writes those as strings too, so the reference
+    gets the same `str` encoder.
+    """
+    return json.loads(json.dumps(jsonable_encoder(payload, custom_encoder={ObjectId: str}), ensure_ascii=False))
+
+
+@pytest.mark.parametrize("name", sorted(DOCS))
+def test_single_document_matches_the_legacy_path(name):
+    doc = DOCS[name]
+    expected = legacy(serialize_doc(copy.deepcopy(doc)))
+    assert orjson.loads(dumps(prepare_doc(copy.deepcopy(doc)))) == expected
+
+
+def test_list_payload_matches_the_legacy_path():
+    docs = [copy.deepcopy(doc) for doc in DOCS.values()]
+    expected = legacy({"success": True, "data": [serialize_doc(copy.deepcopy(doc)) for doc in docs], "total": 6})
+    payload = {"success": True, "data": [prepare_doc(doc) for doc in docs], "total": 6}
+
+    assert orjson.loads(dumps(payload)) == expected
+    assert orjson.loads(FastJSONResponse(payload).body) == expected
+
+
+def test_datetimes_keep_the_isoformat_text():
+    body = dumps(prepare_doc(copy.deepcopy(DOCS["whole_seconds_and_aware"])))
+    assert b'"created_at":"2025-01-01T00:00:00"' in body
+    assert b'"updated_at":"2025-01-01T12:00:00+00:00"' in body
+    assert prepare_doc(None) is None
@@ -0,0 +1,97 @@
+"""
+Tests for sitemap generation: single urlset, sitemap index past the URL
+limit, and per-section rebuilds after content changes
+"""
+import asyncio
+import gzip
+from datetime import datetime
+
+import pytest
+
+from sitemap import Sitemap
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+async def seed(db, posts=3, studies=1):
+    await db.blog_posts.insert_many([
+        {"slug": f"post-{i}", "published": True, "featured_image": f"/img/post-{i}.png",
+         "created_at": datetime(2025, 1, i + 1), "updated_at": datetime(2025, 2, i + 1)}
+        for i in range(posts)
+    ] + [{"slug": "draft", "published": False, "created_at": datetime(2025, 1, 1)}])
+    await db.case_studies.insert_many([
+        {"slug": f"study-{i}", "published": True, "created_at": datetime(2025, 1, i + 1),
+         "updated_at": datetime(2025, 3, i + 1)}
+        for i in range(studies)
+    ])
+
+
+def xml(document) -> str:
+    return gzip.decompress(document.body).decode()
+
+
+def test_single_urlset_lists_published_content():
+    async def scenario():
+        db = mongomock_motor.AsyncMongoMockClient()["sitemap_test"]
+        await seed(db)
+        sitemap = Sitemap(db, site_url="https://example.com/", page_images=lambda: {"/clients": ["/logos/a&b.png"]})
+        await sitemap.build()
+        text = xml(sitemap.files["sitemap"])
+
+        assert "<urlset" in text
+        assert "https://example.com/blog/post-2</loc><lastmod>2025-02-03T00:00:00+00:00" in text
+        assert "https://example.com/case-studies/study-0" in text
+        assert "draft" not in text
+        assert "<image:loc>https://example.com/img/post-0.png</image:loc>" in text
+        assert "https://example.com/logos/a&amp;b.png" in text
+        # Listing pages carry their newest entry's lastmod
+        assert "https://example.com/blog</loc><lastmod>2025-02-03T00:00:00+00:00" in text
+        assert list(sitemap.files) == ["sitemap"]
+
+    asyncio.run(scenario())
+
+
+def test_index_past_url_limit_rebuilds_only_changed_section():
+    async def scenario():
+        db = mongomock_motor.AsyncMongoMockClient()["sitemap_test"]
+        await seed(db, posts=5, studies=2)
+        sitemap = Sitemap(db, site_url="https://example.com", max_urls=4, debounce=0)
+        await sitemap.build()
+
+        index = xml(sitemap.files["sitemap"])
+        assert "<sitemapindex" in index
+        assert sorted(sitemap.files) == ["blog-1", "blog-2", "case-studies-1", "pages-1", "pages-2", "pages-3", "sitemap"]
+        assert "https://example.com/api/sitemaps/blog-2.xml" in index
+        assert xml(sitemap.files["blog-2"]).count("<url>") == 1
+
+        studies = sitemap.files["case-studies-1"]
+        await db.blog_posts.insert_one({"slug": "post-new", "published": True,
+                                        "created_at": datetime(2025, 6, 1), "updated_at": datetime(2025, 6, 1)})
+        sitemap.invalidate("blog_posts")
+        await sitemap._pending
+
+        assert sitemap.files["case-studies-1"] is studies
+        assert "post-new" in xml(sitemap.files["blog-1"])
+        assert xml(sitemap.files["blog-2"]).count("<url>") == 2
+
+    asyncio.run(scenario())
+
+
+def test_get_serves_previous_version_until_rebuilt():
+    async def scenario():
+        db = mongomock_motor.AsyncMongoMockClient()["sitemap_test"]
+        await seed(db)
+        sitemap = Sitemap(db, debounce=0.05)
+        first = await sitemap.get()
+        assert first is not None
+
+        await db.blog_posts.insert_one({"slug": "fresh", "published": True,
+                                        "created_at": datetime(2025, 6, 1), "updated_at": datetime(2025, 6, 1)})
+        sitemap.invalidate("blog_posts")
+        sitemap.invalidate("contacts")            # not in the sitemap
+        assert await sitemap.get() is first
+        await asyncio.sleep(0.2)
+        assert "fresh" in xml(await sitemap.get())
+        assert sitemap.builds == 2
+
+    asyncio.run(scenario())
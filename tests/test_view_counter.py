@@ -0,0 +1,95 @@
+"""
+Tests for the batched blog view counter
+"""
+import asyncio
+
+import pytest
+
+from view_counter import ViewCounter
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+class RecordingCollection:
+    """Wraps a collection, recording bulk_write calls and failing the first `failures` of them"""
+
+    def __init__(self, collection, failures: int = 0):
+        self.collection = collection
+        self.failures = failures
+        self.calls = []
+
+    async def bulk_write(self, operations, ordered=True):
+        self.calls.append(operations)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("primary stepped down")
+        return await self.collection.bulk_write(operations, ordered=ordered)
+
+
+async def seed():
+    collection = mongomock_motor.AsyncMongoMockClient()["views_test"].blog_posts
+    await collection.insert_many([{"slug": "a", "views": 0}, {"slug": "b", "views": 5}])
+    return collection
+
+
+async def views(collection):
+    return {doc["slug"]: doc["views"] async for doc in collection.find({})}
+
+
+def test_records_collapse_into_one_inc_per_document():
+    async def scenario():
+        collection = await seed()
+        recording = RecordingCollection(collection)
+        counter = ViewCounter(recording)
+        for slug in ("a", "b", "a", "a", "b"):
+            counter.record(slug)
+
+        assert await counter.flush() == 2
+        assert len(recording.calls) == 1
+        assert sorted((op._filter["slug"], op._doc["$inc"]["views"]) for op in recording.calls[0]) == [("a", 3), ("b", 2)]
+        assert await views(collection) == {"a": 3, "b": 7}
+        # Nothing buffered: no write at all
+        assert await counter.flush() == 0 and len(recording.calls) == 1
+
+    asyncio.run(scenario())
+
+
+def test_failed_flush_requeues_counts_exactly_once():
+    async def scenario():
+        collection = await seed()
+        recording = RecordingCollection(collection, failures=1)
+        counter = ViewCounter(recording)
+        counter.record("a", 2)
+        counter.record("b")
+
+        assert await counter.flush() == 0
+        assert await views(collection) == {"a": 0, "b": 5}
+        # Views recorded after the failure join the requeued ones
+        counter.record("a")
+        assert await counter.flush() == 2
+        assert await views(collection) == {"a": 3, "b": 6}
+        assert await counter.flush() == 0
+        assert len(recording.calls) == 2
+
+    asyncio.run(scenario())
+
+
+def test_threshold_triggers_flush_and_stop_drains():
+    async def scenario():
+        collection = await seed()
+        counter = ViewCounter(collection)
+        counter.flush_interval, counter.flush_threshold = 60, 3
+        await counter.start()
+        for _ in range(3):
+            counter.record("a")
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+            if (await views(collection))["a"] == 3:
+                break
+        assert (await views(collection))["a"] == 3
+
+        counter.record("b")
+        await counter.stop()
+        assert (await views(collection))["b"] == 6
+
+    asyncio.run(scenario())